@@ -2,14 +2,49 @@ from .Player import Player
 from .Dice import Dice
 from .Board import Board
 
+TURN_ID_BYTES = 2
+
+
+def _build_turn_tables():
+    """
+    Tablas del turn ID (10 bits): bit 0 = quién mueve (0 'B', 1 'N'),
+    bits 1-3 y 4-6 = dados (0 sin tirar), bits 7-9 = dados usados
+    (dobles: cuántos; si no, máscara de dado 1 y dado 2).
+    """
+    encode, decode = {}, {}
+    rolls = [((), 0, 0)]
+    rolls += [((d1, d2), d1, d2) for d1 in range(1, 7) for d2 in range(1, 7) if d1 != d2]
+    rolls += [((d,) * 4, d, d) for d in range(1, 7)]
+    for turn_bit, turno in enumerate(("B", "N")):
+        for dice, d1, d2 in rolls:
+            if not dice:
+                used_options = [((), 0)]
+            elif d1 == d2:
+                used_options = [((d1,) * n, n) for n in range(5)]
+            else:
+                used_options = [((), 0), ((d1,), 1), ((d2,), 2), ((d1, d2), 3)]
+            for used, field in used_options:
+                code = turn_bit | (d1 << 1) | (d2 << 4) | (field << 7)
+                encode[(turno, dice, tuple(sorted(used)))] = code
+                decode[code] = (turno, list(dice), list(used))
+    return encode, decode
+
+
+_TURN_ENCODE, _TURN_DECODE = _build_turn_tables()
+
 class BackgammonGame:
-    def __init__(self, player1="Blancas", player2="Negras"):
+    def __init__(self, player1="Blancas", player2="Negras", verbose=True, dice=None):
+        self.__verbose__ = verbose  # False = no anunciar por consola (partidas automáticas)
         self.__players__ = {"B": Player("blanco", player1), "N": Player("negro", player2)}
         self.__turno__ = "B"
-        self.__dice__ = Dice()
+        self.__dice__ = dice or Dice()  # Inyectable: Dice(seed=...) o Dice(script=...) para reproducir
         self.__board__ = Board()
-        self.__dice_cache__ = []
-        self.__used_dice__ = []
+        self.__roll__ = ()  # Tirada actual tal como salió
+        self.__remaining__ = [0] * 6  # Dados que quedan por cara (índice = dado - 1)
+        self.__left__ = 0  # Total de dados que quedan
+        self.__turn_moves__ = []  # (token, dado, plan previo) de los movimientos del turno
+        self.__plan__ = {}  # Árbol de sub-movimientos legales que quedan en el turno
+        self.__plan_key__ = None  # (hash, turno, dados) para el que vale el plan
 
     # =========================
     # Helpers de bearing off
@@ -43,126 +78,208 @@ class BackgammonGame:
     def board(self):
         return self.__board__
 
+    def position_hash(self):
+        """
+        Hash Zobrist de 64 bits de la posición incluyendo quién mueve.
+        Sirve como clave para caches y tablas de transposición.
+        """
+        return self.__board__.zobrist_hash(self.__turno__)
+
+    def position_id(self):
+        """ID binario de 10 bytes del tablero desde la perspectiva de quien mueve."""
+        return self.__board__.encode_position(self.__turno__)
+
+    def turn_id(self):
+        """
+        ID binario de 2 bytes del turno: quién mueve, dados y dados usados.
+
+        Recibe: Nada
+        Hace: Busca el estado del turno en una tabla precalculada
+        Devuelve: bytes de largo 2
+        """
+        used = list(self.__roll__)
+        for die in self.available_dice():
+            used.remove(die)
+        key = (self.__turno__, self.__roll__, tuple(sorted(used)))
+        return _TURN_ENCODE[key].to_bytes(TURN_ID_BYTES, "little")
+
+    def restore(self, position_id, turn_id):
+        """
+        Restaura tablero y turno desde position_id() y turn_id().
+
+        Recibe: position_id (10 bytes) y turn_id (2 bytes)
+        Hace: Reemplaza el tablero, el turno y los dados
+        Devuelve: Nada
+        Excepción: ValueError si algún ID no es válido
+        """
+        code = int.from_bytes(turn_id, "little")
+        if len(turn_id) != TURN_ID_BYTES or code not in _TURN_DECODE:
+            raise ValueError("turn ID inválido")
+        turno, dice, used = _TURN_DECODE[code]
+        self.__board__ = Board.decode_position(position_id, turno)
+        self.__turno__ = turno
+        self._set_roll(dice)
+        for die in used:
+            self.consume(die)
+
+    def _set_roll(self, dice):
+        """Carga una tirada en el contador de dados y reinicia el turno."""
+        self.__roll__ = tuple(dice)
+        self.__remaining__ = [0] * 6
+        for die in dice:
+            self.__remaining__[die - 1] += 1
+        self.__left__ = len(dice)
+        self.__turn_moves__ = []
+        self.__plan_key__ = None
+
+    def _plan_key(self):
+        return (self.__board__.zobrist_hash(), self.__turno__, tuple(self.__remaining__))
+
+    def _plan(self):
+        """
+        Árbol de sub-movimientos legales del turno en curso.
+
+        Se calcula una vez por tirada (Board.turn_tree) y se avanza con cada
+        movimiento. Si el tablero cambió por fuera del juego (el hash Zobrist
+        no coincide) se vuelve a calcular para la posición actual.
+        """
+        key = self._plan_key()
+        if key != self.__plan_key__:
+            if self.__left__:
+                self.__plan__ = self.__board__.turn_tree(self.__turno__, self.available_dice())
+            else:
+                self.__plan__ = {}
+            self.__plan_key__ = key
+        return self.__plan__
+
     def roll(self):
-        self.__dice_cache__ = self.__dice__.roll()
-        self.__used_dice__ = []
-        return list(self.__dice_cache__)
+        self._set_roll(self.__dice__.roll())
+        self._plan()
+        return list(self.__roll__)
+
+    def consume(self, die_value):
+        """
+        Consume un dado de la tirada en O(1).
+
+        Recibe: die_value (1-6)
+        Hace: Descuenta una unidad del contador de esa cara
+        Devuelve: True si el dado estaba disponible, False si no
+        """
+        if not (1 <= die_value <= 6) or not self.__remaining__[die_value - 1]:
+            return False
+        self.__remaining__[die_value - 1] -= 1
+        self.__left__ -= 1
+        return True
+
+    def _refund(self, die_value):
+        """Devuelve un dado consumido al contador (para deshacer)."""
+        self.__remaining__[die_value - 1] += 1
+        self.__left__ += 1
+
+    def remaining(self, die_value=None):
+        """
+        Dados que quedan en O(1).
+
+        Recibe: die_value opcional (1-6)
+        Devuelve: cuántos quedan de esa cara, o el total si no se indica
+        """
+        if die_value is None:
+            return self.__left__
+        if not (1 <= die_value <= 6):
+            return 0
+        return self.__remaining__[die_value - 1]
+
+    def is_exhausted(self):
+        """True si no queda ningún dado por usar (o no se tiró)."""
+        return self.__left__ == 0
 
     def dice(self):
         """Retorna todos los dados de la tirada actual"""
-        return list(self.__dice_cache__)
+        return list(self.__roll__)
     
     def available_dice(self):
-        """Retorna los dados disponibles (no usados)"""
-        available = []
-        used_copy = list(self.__used_dice__)
-        
-        for die in self.__dice_cache__:
-            if die in used_copy:
-                used_copy.remove(die)
-            else:
-                available.append(die)
-        
-        return available
+        """Retorna los dados disponibles (no usados), en el orden de la tirada"""
+        roll = self.__roll__
+        if len(roll) == 4:
+            return [roll[0]] * self.__remaining__[roll[0] - 1]
+        return [die for die in roll if self.__remaining__[die - 1]]
     
     def move(self, from_point, die_value):
         """Intenta mover una ficha"""
-        # El dado debe estar disponible
-        if die_value not in self.available_dice():
-            return False
-
-        # Verifica si es un movimiento válido, incluyendo la lógica de Bearing Off exacto
-        if not self.can_move(from_point, die_value):
+        # El movimiento debe estar en el plan del turno (dado disponible,
+        # movimiento legal y compatible con usar la mayor cantidad de dados)
+        plan = self._plan()
+        subplan = plan.get((from_point, die_value))
+        if subplan is None:
             return False
         
-        # El 'move' del Board ya maneja la lógica de captura y Bearing Off
-        if self.__board__.move(from_point, die_value, self.__turno__):
-            self.__used_dice__.append(die_value)
+        # El 'apply' del Board ya maneja la lógica de captura y Bearing Off
+        token = self.__board__.apply((from_point, die_value, self.__turno__), validate=False)
+        self.consume(die_value)
+        self.__turn_moves__.append((token, die_value, plan))
+        self.__plan__ = subplan
+        self.__plan_key__ = self._plan_key()
             
-            # ¿Terminó el juego?
-            if self.is_game_over():
-                print(f"¡El jugador {self.current_player().nombre()} ha ganado!")
+        # ¿Terminó el juego?
+        if self.is_game_over() and self.__verbose__:
+            print(f"¡El jugador {self.current_player().nombre()} ha ganado!")
             
-            # Si no quedan dados, termina el turno
-            if not self.available_dice():
-                self.end_turn() 
+        # Si no quedan dados, termina el turno
+        if self.is_exhausted():
+            self.end_turn() 
             
-            return True
-        return False
+        return True
     
-    def can_move(self, from_point, die_value):
+    def undo_last_move(self):
         """
-        Verifica si un movimiento es válido.
-        REGLA NUEVA: para retirar (bear off) se exige dado EXACTO.
+        Deshace el último movimiento del turno en curso y devuelve su dado.
+
+        Recibe: Nada
+        Hace: Revierte el delta en el Board (sin copiarlo), libera el dado y
+              vuelve al plan anterior
+        Devuelve: True si se deshizo algo, False si no hay movimientos en el turno
         """
-        # Dado debe estar disponible
-        if die_value not in self.available_dice():
+        if not self.__turn_moves__:
             return False
+        token, die_value, plan = self.__turn_moves__.pop()
+        self.__board__.undo(token)
+        self._refund(die_value)
+        self.__plan__ = plan
+        self.__plan_key__ = self._plan_key()
+        return True
 
-        color = self.__turno__
-
-        # Si el origen es un punto del tablero, aplicamos la restricción de "off exacto"
-        if isinstance(from_point, int) and 0 <= from_point <= 23:
-            # Si está en el home del color, podría ser un intento de retirar
-            if self._is_in_home_range(from_point, color):
-                pips = self._pips_to_bear_off(from_point, color)
-                # Si el dado es MAYOR que la distancia para salir, NO permitimos (regla estricta)
-                if die_value > pips:
-                    return False
-                # Si el dado es EXACTO, lo dejamos pasar a evaluación del Board (que además valida que todas estén en casa)
-                # Si el dado es menor, es movimiento interno normal dentro del home; lo decide el Board.
-        
-        # Para cualquier otro caso (incluye barra y movimientos normales), delegamos al Board
-        return self.__board__.can_move(from_point, die_value, color)
+    def can_move(self, from_point, die_value):
+        """
+        Verifica si un movimiento es válido.
+        Es una búsqueda en el plan del turno, que ya aplica la regla de 'off'
+        exacto, la prioridad de la barra y el uso obligatorio de los dados.
+        """
+        return (from_point, die_value) in self._plan()
     
     def get_valid_moves(self):
-        """Obtiene todos los movimientos válidos (según Board)."""
-        return self.__board__.get_valid_moves(self.__turno__, self.available_dice())
+        """Obtiene todos los movimientos válidos (primeros pasos del plan del turno)."""
+        return sorted(self._plan(), key=lambda m: (-1 if m[0] is None else m[0], m[1]))
     
     def has_valid_moves(self):
         """
         Verifica si hay movimientos válidos con la REGLA ESTRICTA de 'off' exacto.
-        Probamos todos los orígenes razonables con cada dado disponible usando nuestro can_move().
+        Es una consulta al plan del turno en lugar de probar origen por origen.
         """
-        dice = self.available_dice()
-        if not dice:
-            return False
-
-        # Probar entrada desde barra si el Board lo soporta con from_point=None
-        for d in set(dice):
-            try:
-                if self.can_move(None, d):  # muchos Boards aceptan None para la barra
-                    return True
-            except Exception:
-                # Si el Board no soporta None, ignoramos y seguimos
-                pass
-
-        # Probar todos los puntos del tablero (0..23)
-        for i in range(24):
-            for d in set(dice):
-                try:
-                    if self.can_move(i, d):
-                        return True
-                except Exception:
-                    # Si el Board lanza algo por un índice inválido en cierto estado, seguimos
-                    continue
-        return False
+        return bool(self._plan())
     
     def can_end_turn(self):
         """Verifica si se puede terminar el turno"""
-        if not self.__dice_cache__:  # Si no se ha tirado
+        if not self.__roll__:  # Si no se ha tirado
             return False 
-        if not self.available_dice():
-            return True
-        # Si no hay ningún movimiento válido (con regla estricta), se puede finalizar
-        return not self.has_valid_moves()
+        # Sin dados o sin ningún movimiento válido en el plan, se puede finalizar
+        return not self._plan()
 
     def end_turn(self):
         """Termina el turno y cambia al siguiente jugador"""
         self.__turno__ = "N" if self.__turno__ == "B" else "B"
-        # Limpia la tirada de dados
-        self.__dice_cache__ = []
-        self.__used_dice__ = []
+        # Limpia la tirada de dados y los movimientos del turno (ya no se deshacen)
+        self._set_roll(())
+        self.__board__.clear_undo()
         
     def is_game_over(self):  # Condición de victoria
         """Verifica si el juego ha terminado (un jugador retiró 15 fichas)."""
@@ -0,0 +1,134 @@
+import numpy as np
+
+from .Board import Board, NUM_SLOTS, BAR_SLOT
+
+
+class BatchBoard:
+    """
+    Lote de N tableros compactos como un arreglo (N, 28) int8.
+
+    Usa la misma representacion que Board (positivo = 'B', negativo = 'N';
+    0-23 puntos, 24-25 barras, 26-27 retiradas) y calcula las reglas de
+    movimiento de todos los tableros a la vez con operaciones de NumPy.
+    Internamente cada tablero se mira desde la perspectiva del color que
+    mueve, asi ambos colores avanzan del punto 0 al 23.
+    """
+
+    def __init__(self, cells):
+        """
+        Recibe: arreglo (N, 28) con los casilleros de cada tablero
+        Hace: Lo guarda como int8 (sin copiar si ya lo es)
+        Devuelve: Nada
+        Excepción: ValueError si la forma no es (N, 28)
+        """
+        cells = np.asarray(cells, dtype=np.int8)
+        if cells.ndim != 2 or cells.shape[1] != NUM_SLOTS:
+            raise ValueError(f"se esperaba un arreglo (N, {NUM_SLOTS})")
+        self.__cells__ = cells
+
+    @classmethod
+    def from_boards(cls, boards):
+        """Arma el lote copiando el arreglo compacto de cada Board."""
+        cells = np.empty((len(boards), NUM_SLOTS), dtype=np.int8)
+        for i, board in enumerate(boards):
+            cells[i] = board.cells()
+        return cls(cells)
+
+    def cells(self):
+        return self.__cells__
+
+    def __len__(self):
+        return self.__cells__.shape[0]
+
+    def board(self, i):
+        """Board escalar equivalente al tablero i del lote."""
+        return Board.from_cells(self.__cells__[i].tobytes())
+
+    # =========================
+    # Helpers de perspectiva
+    # =========================
+    def _signs(self, colors):
+        """Convierte colores ('B'/'N' o +1/-1) en un vector (N,) de signos."""
+        colors = np.asarray(colors)
+        if colors.ndim == 0:
+            colors = np.full(len(self), colors)
+        if colors.dtype.kind in "UOS":
+            return np.where(colors == "B", 1, -1).astype(np.int8)
+        return np.where(colors > 0, 1, -1).astype(np.int8)
+
+    def _perspective(self, signs):
+        """Puntos (N, 24) desde quien mueve: >0 propias, <0 rivales."""
+        own = self.__cells__[:, :24] * signs[:, None]
+        black = signs < 0
+        return np.where(black[:, None], own[:, ::-1], own), black
+
+    def _bar_counts(self, signs):
+        cells = self.__cells__
+        return np.where(signs > 0, cells[:, BAR_SLOT["B"]], -cells[:, BAR_SLOT["N"]])
+
+    # =========================
+    # Reglas por lote
+    # =========================
+    def blocked_points(self, colors):
+        """(N, 24) bool: puntos con 2 o mas fichas rivales para el color dado."""
+        signs = self._signs(colors)
+        return self.__cells__[:, :24] * signs[:, None] <= -2
+
+    def can_bear_off(self, colors):
+        """(N,) bool: igual que Board.can_bear_off para cada tablero."""
+        signs = self._signs(colors)
+        persp, _ = self._perspective(signs)
+        on_bar = self._bar_counts(signs) > 0
+        return ~on_bar & ~np.any(persp[:, :18] > 0, axis=1)
+
+    def bar_entry(self, colors):
+        """(N, 6) bool: si se puede reingresar desde la barra con cada dado 1..6."""
+        signs = self._signs(colors)
+        persp, _ = self._perspective(signs)
+        on_bar = self._bar_counts(signs) > 0
+        return on_bar[:, None] & (persp[:, :6] > -2)
+
+    def move_table(self, colors):
+        """
+        Tabla completa de movimientos simples para cada dado 1..6.
+
+        Recibe: colors, el color que mueve en cada tablero
+        Hace: Replica Board.can_move para todos los origenes y dados a la vez
+        Devuelve: arreglo (N, 25, 6) bool; [:, p, d-1] es el origen p (0-23)
+                  y [:, 24, d-1] el reingreso desde la barra
+        """
+        signs = self._signs(colors)
+        persp, black = self._perspective(signs)
+        n = len(self)
+        on_bar = self._bar_counts(signs) > 0
+        own = persp > 0
+        open_dest = np.concatenate([persp > -2, np.zeros((n, 6), dtype=bool)], axis=1)
+        bear = ~on_bar & ~np.any(persp[:, :18] > 0, axis=1)
+
+        table = np.zeros((n, 25, 6), dtype=bool)
+        movable = own & ~on_bar[:, None]
+        for die in range(1, 7):
+            # Movimiento normal: destino p + die dentro del tablero
+            table[:, :24, die - 1] = movable & open_dest[:, die:die + 24]
+            # Bearing off: solo con dado exacto desde el punto 24 - die
+            p = 24 - die
+            table[:, p, die - 1] = movable[:, p] & bear
+        table[:, 24, :] = on_bar[:, None] & (persp[:, :6] > -2)
+
+        # Volver a indices reales para las negras
+        table[black, :24, :] = table[black, 23::-1, :]
+        return table
+
+    def legal_moves(self, colors, dice):
+        """
+        Movimientos simples legales con los dados de cada tablero.
+
+        Recibe: colors y dice, arreglo (N, k) con los dados (0 = sin dado)
+        Hace: Filtra move_table con los valores presentes en cada tirada
+        Devuelve: arreglo (N, 25, 6) bool con el mismo formato que move_table
+        """
+        dice = np.asarray(dice)
+        if dice.ndim == 1:
+            dice = dice[:, None]
+        present = np.any(dice[:, :, None] == np.arange(1, 7), axis=1)
+        return self.move_table(colors) & present[:, None, :]
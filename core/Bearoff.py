@@ -0,0 +1,390 @@
+import argparse
+import mmap
+import struct
+from math import comb
+
+import numpy as np
+
+from .SearchEngine import DICE_OUTCOMES
+
+HOME_POINTS = 6
+MAX_CHECKERS = 15
+MAX_ROLLS = 64  # El ultimo casillero acumula la cola (MAX_ROLLS - 1 tiradas o mas)
+
+TWO_SIDED_CHECKERS = 6  # Por lado: 924 posiciones, 853776 pares
+
+# Cabecera: magia, fichas maximas, largo de la distribucion, cantidad de posiciones
+_HEADER = struct.Struct("<4sHHI")
+_MAGIC = b"BGOS"
+_MAGIC_TWO = b"BGTS"  # En la base de dos lados el largo de la distribucion va en 0
+_EQUITY_SCALE = 65535  # equity en [-1, 1] -> uint16
+
+
+def num_positions(max_checkers=MAX_CHECKERS):
+    """Posiciones de casa con hasta max_checkers fichas en 6 puntos."""
+    return comb(max_checkers + HOME_POINTS, HOME_POINTS)
+
+
+def position_index(counts):
+    """
+    Indice combinatorio de una posicion de casa.
+
+    Recibe: counts, 6 cantidades; counts[k] son las fichas a k + 1 pips de salir
+    Hace: Ve la posicion como separadores entre fichas y la ordena en el
+          sistema combinatorio; las posiciones con menos fichas quedan primero,
+          asi una base chica es prefijo de una grande
+    Devuelve: entero en [0, num_positions(sum(counts)))
+    """
+    index = 0
+    separator = -1
+    for k, count in enumerate(counts):
+        separator += count + 1
+        index += comb(separator, k + 1)
+    return index
+
+
+def home_counts(board, color):
+    """
+    Posicion de casa de un color.
+
+    Recibe: board y color
+    Devuelve: tupla de 6 cantidades (a 1..6 pips de salir) con solo las
+              fichas propias (las rivales en esa casa no cuentan), o None si
+              el color tiene fichas fuera de casa o en la barra
+    """
+    if not board.can_bear_off(color):
+        return None
+    cells = board.cells()
+    if color == 'B':
+        return tuple(max(0, cells[23 - k]) for k in range(HOME_POINTS))
+    return tuple(max(0, -cells[k]) for k in range(HOME_POINTS))
+
+
+def _positions(max_checkers, points=HOME_POINTS):
+    """Todas las posiciones de casa con hasta max_checkers fichas."""
+    if points == 0:
+        yield ()
+        return
+    for count in range(max_checkers + 1):
+        for rest in _positions(max_checkers - count, points - 1):
+            yield (count,) + rest
+
+
+def _step(pos, die):
+    """Posiciones tras mover una ficha con un dado (retiro solo exacto)."""
+    out = []
+    for k in range(die - 1, HOME_POINTS):
+        if pos[k]:
+            nxt = list(pos)
+            nxt[k] -= 1
+            if k + 1 > die:
+                nxt[k - die] += 1
+            out.append(tuple(nxt))
+    return out
+
+
+def _turn_finals(pos, dice):
+    """
+    Posiciones finales de un turno con las reglas de Board.legal_sequences:
+    usar la mayor cantidad de dados y, si entra uno solo de dos distintos,
+    el mayor. Devuelve un set vacio si no hay movimiento.
+    """
+    if len(dice) == 4:
+        level = {pos}
+        for _ in range(4):
+            nxt = set()
+            for q in level:
+                nxt.update(_step(q, dice[0]))
+            if not nxt:
+                break
+            level = nxt
+        return set() if level == {pos} else level
+    a, b = dice
+    after_a = _step(pos, a)
+    after_b = _step(pos, b)
+    both = {r for q in after_a for r in _step(q, b)}
+    both.update(r for q in after_b for r in _step(q, a))
+    if both:
+        return both
+    high, low = (after_a, after_b) if a > b else (after_b, after_a)
+    return set(high or low)
+
+
+def build_one_sided(path, max_checkers=MAX_CHECKERS, max_rolls=MAX_ROLLS):
+    """
+    Genera la base de retiro de un lado.
+
+    Recibe: ruta del archivo, fichas maximas y largo de la distribucion
+    Hace: Recorre las posiciones de menos a mas pips; para cada tirada elige
+          el final que minimiza las tiradas esperadas y arma la distribucion
+          de tiradas hasta retirar todo. Las tiradas sin movimiento dejan la
+          posicion igual (con retiro exacto pasa seguido)
+    Devuelve: cantidad de posiciones escritas
+    """
+    count = num_positions(max_checkers)
+    positions = list(_positions(max_checkers))
+    positions.sort(key=lambda pos: sum((k + 1) * c for k, c in enumerate(pos)))
+    means = np.zeros(count, dtype=np.float64)
+    dist = np.zeros((count, max_rolls), dtype=np.float64)
+
+    for pos in positions:
+        idx = position_index(pos)
+        if not any(pos):
+            dist[idx, 0] = 1.0
+            continue
+        stuck = 0.0
+        expected = 1.0
+        shifted = np.zeros(max_rolls)
+        for dice, prob in DICE_OUTCOMES:
+            finals = _turn_finals(pos, dice)
+            if not finals:
+                stuck += prob
+                continue
+            child = min((position_index(q) for q in finals), key=means.__getitem__)
+            expected += prob * means[child]
+            shifted[1:] += prob * dist[child, :-1]
+        means[idx] = expected / (1.0 - stuck)
+        row = dist[idx]
+        for n in range(1, max_rolls - 1):
+            row[n] = shifted[n] + stuck * row[n - 1]
+        row[max_rolls - 1] = max(1.0 - row[:max_rolls - 1].sum(), 0.0)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, max_checkers, max_rolls, count))
+        f.write(means.astype("<f4").tobytes())
+        f.write(dist.astype("<f4").tobytes())
+    return count
+
+
+class OneSidedBearoff:
+    """
+    Base de retiro de un lado leida con mmap.
+
+    Varios procesos que abren el mismo archivo comparten una sola copia en el
+    cache de paginas. Cada consulta es O(1): indice combinatorio y lectura en
+    un desplazamiento fijo.
+    """
+
+    def __init__(self, path):
+        """
+        Recibe: ruta de un archivo de build_one_sided
+        Excepción: ValueError si el archivo no es una base de retiro
+        """
+        with open(path, "rb") as f:
+            self.__mm__ = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.__mm__) < _HEADER.size:
+            raise ValueError("archivo de retiro invalido")
+        magic, checkers, rolls, count = _HEADER.unpack_from(self.__mm__, 0)
+        if magic != _MAGIC or len(self.__mm__) != _HEADER.size + 4 * count * (1 + rolls):
+            raise ValueError("archivo de retiro invalido")
+        self.__checkers__ = checkers
+        self.__rolls__ = rolls
+        self.__count__ = count
+        self.__means__ = np.frombuffer(self.__mm__, dtype="<f4", count=count, offset=_HEADER.size)
+        self.__dist__ = np.frombuffer(
+            self.__mm__, dtype="<f4", count=count * rolls, offset=_HEADER.size + 4 * count
+        ).reshape(count, rolls)
+
+    def __len__(self):
+        return self.__count__
+
+    def max_checkers(self):
+        return self.__checkers__
+
+    def _index(self, counts):
+        if len(counts) != HOME_POINTS or sum(counts) > self.__checkers__:
+            raise ValueError("posicion fuera de la base")
+        return position_index(counts)
+
+    def expected_rolls(self, counts):
+        """Tiradas esperadas hasta retirar todo, jugando para minimizarlas."""
+        return float(self.__means__[self._index(counts)])
+
+    def distribution(self, counts):
+        """Probabilidad de terminar en exactamente n tiradas (vista de solo lectura)."""
+        return self.__dist__[self._index(counts)]
+
+    def expected_rolls_for(self, board, color):
+        """Como expected_rolls pero desde un Board; None si color no esta en carrera de retiro."""
+        counts = home_counts(board, color)
+        if counts is None or sum(counts) > self.__checkers__:
+            return None
+        return self.expected_rolls(counts)
+
+    def close(self):
+        # Soltar las vistas antes de cerrar el mmap
+        self.__means__ = self.__dist__ = None
+        self.__mm__.close()
+
+
+def _children_by_roll(positions):
+    """
+    Hijos de cada posicion para cada una de las 21 tiradas, en formato CSR.
+
+    Devuelve: lista de (ptr, kids) alineada con DICE_OUTCOMES; los hijos de la
+              posicion de indice i son kids[ptr[i]:ptr[i + 1]] (vacio = no mueve)
+    """
+    n = len(positions)
+    tables = []
+    for dice, _ in DICE_OUTCOMES:
+        ptr = np.zeros(n + 1, dtype=np.int64)
+        kids = []
+        for pos in positions:  # positions esta ordenado por indice
+            finals = _turn_finals(pos, dice)
+            kids.extend(position_index(q) for q in finals)
+            ptr[position_index(pos) + 1] = len(finals)
+        tables.append((np.cumsum(ptr), np.asarray(kids, dtype=np.int64)))
+    return tables
+
+
+def solve_two_sided(max_checkers=TWO_SIDED_CHECKERS):
+    """
+    Equity exacta sin cubo de todas las carreras de retiro de dos lados.
+
+    Recibe: fichas maximas por lado
+    Hace: Analisis retrogrado por nivel de pips totales. Los hijos de un par
+          (a, b) tienen menos pips, salvo las tiradas en que a no mueve, que
+          llevan a (b, a) del mismo nivel: cada par se resuelve junto con su
+          espejo con un sistema de 2x2, todo el nivel a la vez con NumPy
+    Devuelve: matriz (n, n) con la equity de quien mueve; fila = indice de
+              quien mueve, columna = indice del rival
+    """
+    positions = sorted(_positions(max_checkers), key=position_index)
+    n = len(positions)
+    pips = np.array([sum((k + 1) * c for k, c in enumerate(pos)) for pos in positions])
+    tables = _children_by_roll(positions)
+    probs = [prob for _, prob in DICE_OUTCOMES]
+    stuck = np.zeros(n)
+    for (ptr, _), prob in zip(tables, probs):
+        stuck += prob * (np.diff(ptr) == 0)
+
+    equity = np.zeros((n, n))
+    equity[1:, 0] = -1.0  # El rival ya retiro todo: quien mueve perdio
+    equity[0, 1:] = 1.0
+
+    a_all, b_all = np.nonzero((pips[:, None] > 0) & (pips[None, :] > 0))
+    level = pips[a_all] + pips[b_all]
+    order = np.argsort(level, kind="stable")
+    a_all, b_all, level = a_all[order], b_all[order], level[order]
+    bounds = np.flatnonzero(np.diff(level)) + 1
+
+    mirror = np.empty(n * n, dtype=np.int64)  # par (a, b) -> posicion dentro de su nivel
+    for a, b in zip(np.split(a_all, bounds), np.split(b_all, bounds)):
+        # x[i]: aporte de las tiradas en que a mueve; elige el hijo que deja
+        # al rival (que pasa a mover) con la menor equity
+        x = np.zeros(len(a))
+        for (ptr, kids), prob in zip(tables, probs):
+            sizes = ptr[a + 1] - ptr[a]
+            moves = np.flatnonzero(sizes)
+            if not len(moves):
+                continue
+            starts = ptr[a[moves]]
+            reps = sizes[moves]
+            offsets = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps)
+            cols = kids[np.repeat(starts, reps) + offsets]
+            values = equity[np.repeat(b[moves], reps), cols]
+            heads = np.concatenate(([0], np.cumsum(reps)[:-1]))
+            x[moves] -= prob * np.minimum.reduceat(values, heads)
+        # E(a,b) = x_ab - s_a E(b,a) y E(b,a) = x_ba - s_b E(a,b); el espejo
+        # de cada par esta en el mismo nivel
+        mirror[a * n + b] = np.arange(len(a))
+        x_ba = x[mirror[b * n + a]]
+        s_a, s_b = stuck[a], stuck[b]
+        equity[a, b] = (x - s_a * x_ba) / (1.0 - s_a * s_b)
+    return equity
+
+
+def build_two_sided(path, max_checkers=TWO_SIDED_CHECKERS):
+    """
+    Genera la base de retiro de dos lados.
+
+    Recibe: ruta del archivo y fichas maximas por lado
+    Hace: Resuelve con solve_two_sided y guarda la equity cuantizada a
+          uint16 (error maximo 1.5e-5), una cuarta parte de float64
+    Devuelve: cantidad de pares escritos
+    """
+    equity = solve_two_sided(max_checkers)
+    n = len(equity)
+    quantized = np.rint((equity + 1.0) / 2.0 * _EQUITY_SCALE).astype("<u2")
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC_TWO, max_checkers, 0, n))
+        f.write(quantized.tobytes())
+    return n * n
+
+
+class TwoSidedBearoff:
+    """
+    Base de retiro de dos lados leida con mmap.
+
+    Da la equity exacta (sin cubo) de quien mueve cuando los dos colores
+    estan en carrera de retiro con hasta max_checkers fichas. Cada consulta
+    es O(1): dos indices combinatorios y una lectura de 2 bytes.
+    """
+
+    def __init__(self, path):
+        """
+        Recibe: ruta de un archivo de build_two_sided
+        Excepción: ValueError si el archivo no es una base de dos lados
+        """
+        with open(path, "rb") as f:
+            self.__mm__ = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.__mm__) < _HEADER.size:
+            raise ValueError("archivo de retiro invalido")
+        magic, checkers, _, count = _HEADER.unpack_from(self.__mm__, 0)
+        if magic != _MAGIC_TWO or len(self.__mm__) != _HEADER.size + 2 * count * count:
+            raise ValueError("archivo de retiro invalido")
+        self.__checkers__ = checkers
+        self.__count__ = count
+        self.__table__ = np.frombuffer(
+            self.__mm__, dtype="<u2", count=count * count, offset=_HEADER.size
+        )
+
+    def max_checkers(self):
+        return self.__checkers__
+
+    def probe(self, mover, opponent):
+        """
+        Equity de quien mueve.
+
+        Recibe: posiciones de casa (6 cantidades) de quien mueve y del rival
+        Devuelve: equity en [-1, 1]
+        Excepción: ValueError si alguna posicion excede la base
+        """
+        if (len(mover) != HOME_POINTS or len(opponent) != HOME_POINTS
+                or sum(mover) > self.__checkers__ or sum(opponent) > self.__checkers__):
+            raise ValueError("posicion fuera de la base")
+        raw = self.__table__[position_index(mover) * self.__count__ + position_index(opponent)]
+        return int(raw) * 2.0 / _EQUITY_SCALE - 1.0
+
+    def probe_board(self, board, color):
+        """Equity de color (que mueve) desde un Board, o None si la posicion no esta en la base."""
+        mover = home_counts(board, color)
+        opponent = home_counts(board, 'N' if color == 'B' else 'B')
+        if mover is None or opponent is None:
+            return None
+        if sum(mover) > self.__checkers__ or sum(opponent) > self.__checkers__:
+            return None
+        return self.probe(mover, opponent)
+
+    def close(self):
+        self.__table__ = None
+        self.__mm__.close()
+
+
+def main(argv=None):
+    """Punto de entrada: python -m core.Bearoff bearoff1.bin --checkers 15 [--two-sided]"""
+    parser = argparse.ArgumentParser(description="Genera las bases de retiro")
+    parser.add_argument("path")
+    parser.add_argument("--checkers", type=int, default=None)
+    parser.add_argument("--rolls", type=int, default=MAX_ROLLS)
+    parser.add_argument("--two-sided", action="store_true")
+    args = parser.parse_args(argv)
+    if args.two_sided:
+        count = build_two_sided(args.path, args.checkers or TWO_SIDED_CHECKERS)
+    else:
+        count = build_one_sided(args.path, args.checkers or MAX_CHECKERS, args.rolls)
+    print(f"{count} posiciones escritas en {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,267 @@
+import base64
+import random
+import sys
+from array import array
+from operator import mul, sub
+
 from .Checker import Checker
 
+# Representacion compacta: 28 casilleros con enteros con signo.
+# 0-23 son los puntos, 24-25 las barras y 26-27 las fichas retiradas.
+# Positivo = fichas blancas ('B'), negativo = fichas negras ('N').
+NUM_SLOTS = 28
+BAR_SLOT = {"B": 24, "N": 25}
+OFF_SLOT = {"B": 26, "N": 27}
+SIGN = {"B": 1, "N": -1}
+
+# Claves Zobrist de 64 bits por (casillero, valor con signo): el signo es el
+# color y el valor absoluto la cantidad. El casillero vacio no aporta nada.
+_ZOBRIST_RNG = random.Random(0x5EED_BAC6)
+ZOBRIST = [[0] + [_ZOBRIST_RNG.getrandbits(64) for _ in range(255)] for _ in range(NUM_SLOTS)]
+ZOBRIST_SIDE = _ZOBRIST_RNG.getrandbits(64)  # Se aplica cuando mueven las negras
+
+# Position ID estilo estandar: para cada jugador (primero el que mueve) se
+# recorren sus 24 puntos desde su punto 1 y luego su barra; cada casillero
+# aporta tantos bits 1 como fichas y un bit 0. 30 fichas + 50 separadores
+# = 80 bits = 10 bytes, empaquetados desde el bit menos significativo.
+POSITION_ID_BYTES = 10
+# encode_position lee las celdas de a dos (un entero de 16 bits en orden
+# nativo por punto par); las claves 0..11 son los puntos y cada color las
+# recorre desde su punto 1. Blancas leen cada par al reves (23 antes que 22).
+_PID_KEYS = {"B": slice(11, None, -1), "N": slice(0, 12)}
+
+
+def _pid_run(cell, sign):
+    """Corrida de un casillero: n fichas propias son n bits 1 y un 0, como (patron, ancho)."""
+    count = max(cell * sign, 0)
+    return (1 << count) - 1, count + 1
+
+
+def _pid_pair(key, color):
+    """
+    Corrida de los dos puntos de una clave de 16 bits, en el orden de color.
+
+    Devuelve: (patron, ancho) de ambos casilleros seguidos
+    """
+    low, high = array("b", key.to_bytes(2, sys.byteorder))
+    first, second = (high, low) if color == "B" else (low, high)
+    first_pattern, first_width = _pid_run(first, SIGN[color])
+    pattern, width = _pid_run(second, SIGN[color])
+    return first_pattern | pattern << first_width, first_width + width
+
+
+def _pid_pairs(color):
+    """
+    Tabla de _pid_pair para los valores validos, -15..15; las claves de
+    tableros invalidos se calculan al encontrarlas.
+    """
+    valid = range(-15, 16)
+    keys = (int.from_bytes(bytes((low & 0xFF, high & 0xFF)), sys.byteorder)
+            for low in valid for high in valid)
+    return {key: _pid_pair(key, color) for key in keys}
+
+
+def _pid_byte(byte):
+    """
+    Corridas de un byte del ID leido desde el bit menos significativo.
+
+    Devuelve: (unos antes del primer 0 o None si no hay ceros, corridas
+              completas siguientes, unos sueltos al final)
+    """
+    runs, ones = [], 0
+    for bit in range(8):
+        if byte >> bit & 1:
+            ones += 1
+        else:
+            runs.append(ones)
+            ones = 0
+    if not runs:
+        return None, (), ones
+    return runs[0], tuple(runs[1:]), ones
+
+
+_PID_PAIRS = {color: _pid_pairs(color) for color in SIGN}
+_PID_BARS = {color: {cell: _pid_run(cell, sign) for cell in range(-128, 128)}
+             for color, sign in SIGN.items()}
+_PID_BYTES = [_pid_byte(byte) for byte in range(256)]
+
+# Una sola instancia de Checker por color alcanza para la vista de compatibilidad
+_CHECKERS = {"B": Checker("B"), "N": Checker("N")}
+
+
+class _StackView:
+    """
+    Vista tipo lista sobre un casillero del arreglo compacto.
+
+    Permite seguir usando points()[i], bar()['B'], etc. como listas de
+    Checker (len, indexado, append, pop, clear, extend) sin guardar objetos.
+    """
+
+    def __init__(self, board, slot, color=None):
+        self.__board__ = board
+        self.__cells__ = board.cells()
+        self.__slot__ = slot
+        self.__color__ = color  # Fijo para barras; None para puntos
+
+    def _color(self):
+        value = self.__cells__[self.__slot__]
+        if value > 0:
+            return "B"
+        if value < 0:
+            return "N"
+        return self.__color__
+
+    def __len__(self):
+        return abs(self.__cells__[self.__slot__])
+
+    def __getitem__(self, i):
+        n = len(self)
+        if isinstance(i, slice):
+            return [_CHECKERS[self._color()] for _ in range(n)[i]]
+        if i < 0:
+            i += n
+        if not (0 <= i < n):
+            raise IndexError("indice fuera de rango")
+        return _CHECKERS[self._color()]
+
+    def __iter__(self):
+        color = self._color()
+        for _ in range(len(self)):
+            yield _CHECKERS[color]
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"{list(self)!r}"
+
+    def append(self, checker):
+        color = checker.color()
+        current = self._color()
+        if len(self) and current != color:
+            raise ValueError("no se pueden mezclar colores en un mismo punto")
+        if self.__color__ is not None and color != self.__color__:
+            raise ValueError(f"solo se admiten fichas '{self.__color__}'")
+        self.__board__._bump(self.__slot__, SIGN[color])
+
+    def extend(self, checkers):
+        for checker in checkers:
+            self.append(checker)
+
+    def pop(self, i=-1):
+        if not len(self):
+            raise IndexError("pop de un punto vacio")
+        color = self._color()
+        self.__board__._bump(self.__slot__, -SIGN[color])
+        return _CHECKERS[color]
+
+    def clear(self):
+        self.__board__._assign(self.__slot__, 0)
+
+
+class _OffView:
+    """Vista tipo dict {'B': n, 'N': n} sobre los casilleros de retiradas."""
+
+    def __init__(self, board):
+        self.__board__ = board
+        self.__cells__ = board.cells()
+
+    def __getitem__(self, color):
+        return abs(self.__cells__[OFF_SLOT[color]])
+
+    def __setitem__(self, color, value):
+        self.__board__._assign(OFF_SLOT[color], SIGN[color] * value)
+
+    def __contains__(self, color):
+        return color in OFF_SLOT
+
+    def __iter__(self):
+        return iter(OFF_SLOT)
+
+    def __len__(self):
+        return len(OFF_SLOT)
+
+    def keys(self):
+        return OFF_SLOT.keys()
+
+    def values(self):
+        return [self[c] for c in OFF_SLOT]
+
+    def items(self):
+        return [(c, self[c]) for c in OFF_SLOT]
+
+    def get(self, color, default=None):
+        return self[color] if color in OFF_SLOT else default
+
+    def __eq__(self, other):
+        try:
+            return dict(self.items()) == dict(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __repr__(self):
+        return f"{dict(self.items())!r}"
+
+
 class Board:
     def __init__(self):
-        self.__points__ = [[] for _ in range(24)]
-        self.__bar__ = {"B": [], "N": []} 
-        self.__off__ = {"B": 0, "N": 0}
+        self._bind(array("b", bytes(NUM_SLOTS)))
         self._setup()
 
+    def _bind(self, cells):
+        """Asocia el arreglo compacto y crea las vistas de compatibilidad."""
+        self.__cells__ = cells
+        self.__zobrist__ = 0
+        self.__undo_stack__ = []
+        self.__views__ = None  # Vistas de compatibilidad, se crean al pedirlas
+        self._rehash()
+
+    def _views(self):
+        if self.__views__ is None:
+            self.__views__ = (
+                [_StackView(self, i) for i in range(24)],
+                {c: _StackView(self, BAR_SLOT[c], c) for c in BAR_SLOT},
+                _OffView(self),
+            )
+        return self.__views__
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Crea un tablero a partir de 28 casilleros (no ejecuta el setup)."""
+        if len(cells) != NUM_SLOTS:
+            raise ValueError(f"se esperaban {NUM_SLOTS} casilleros")
+        board = cls.__new__(cls)
+        board._bind(array("b", cells))
+        return board
+
+    def copy(self):
+        """Copia independiente del tablero."""
+        return Board.from_cells(self.__cells__)
+
     def _put(self, idx, color, n):
-        for _ in range(n):
-            self.__points__[idx].append(Checker(color))
+        self._bump(idx, SIGN[color] * n)
+
+    def _bump(self, slot, delta):
+        """Suma delta a un casillero y actualiza el hash Zobrist en O(1)."""
+        old = self.__cells__[slot]
+        new = old + delta
+        self.__cells__[slot] = new
+        keys = ZOBRIST[slot]
+        self.__zobrist__ ^= keys[old & 0xFF] ^ keys[new & 0xFF]
+
+    def _assign(self, slot, value):
+        """Fija el valor de un casillero y actualiza el hash Zobrist en O(1)."""
+        self._bump(slot, value - self.__cells__[slot])
+
+    def _rehash(self):
+        """Recalcula el hash Zobrist completo desde el arreglo."""
+        h = 0
+        for slot, value in enumerate(self.__cells__):
+            h ^= ZOBRIST[slot][value & 0xFF]
+        self.__zobrist__ = h
 
     def _setup(self):
         """Setup estÃƒÂ¡ndar de backgammon.
@@ -28,23 +280,44 @@ class Board:
         self._put(5, 'N', 5)    # punto 6
 
     def points(self):
-        return self.__points__
+        return self._views()[0]
 
     def bar(self):
-        return self.__bar__
+        return self._views()[1]
 
     def off(self):
-        return self.__off__
+        return self._views()[2]
+
+    def cells(self):
+        """
+        Arreglo compacto de 28 casilleros (vivo, no es copia).
+        Es de solo lectura: para modificarlo usar move/apply o las vistas,
+        que mantienen el hash Zobrist al dia.
+        """
+        return self.__cells__
+
+    def zobrist_hash(self, side_to_move=None):
+        """
+        Hash Zobrist de 64 bits de la posicion (puntos, barras y retiradas).
+
+        Recibe: side_to_move opcional ('B' o 'N') para incluir quién mueve
+        Hace: Combina el hash incremental con la clave de turno
+        Devuelve: entero de 64 bits
+        """
+        if side_to_move == 'N':
+            return self.__zobrist__ ^ ZOBRIST_SIDE
+        return self.__zobrist__
 
     def point_owner_count(self, idx):
-        if not self.__points__[idx]:
-            return None, 0
-        color = self.__points__[idx][0].color()
-        count = len(self.__points__[idx])
-        return color, count
+        value = self.__cells__[idx]
+        if value > 0:
+            return 'B', value
+        if value < 0:
+            return 'N', -value
+        return None, 0
 
     def has_checkers_on_bar(self, color):
-        return len(self.__bar__[color]) > 0
+        return self.__cells__[BAR_SLOT[color]] != 0
 
     def _get_home_range(self, color):
         """Casa: BLANCAS 19-24 (idx 18-23), NEGRAS 1-6 (idx 0-5)"""
@@ -54,39 +327,28 @@ class Board:
         """Verifica si todas las fichas estÃƒÂ¡n en casa o fuera."""
         if self.has_checkers_on_bar(color):
             return False
-            
-        home_range = self._get_home_range(color)
-        
-        for idx in range(24):
-            if idx not in home_range:
-                if any(c.color() == color for c in self.__points__[idx]):
-                    return False
-        return True
+
+        cells = self.__cells__
+        if color == 'B':
+            return not any(cells[idx] > 0 for idx in range(0, 18))
+        return not any(cells[idx] < 0 for idx in range(6, 24))
 
     def _can_land_on(self, to_point, player_color):
         """Verifica si se puede aterrizar en un punto."""
         if not (0 <= to_point <= 23):
             return False
-        
-        owner, count = self.point_owner_count(to_point)
-        if owner is None or owner == player_color:
-            return True
-        return count == 1  # Puede capturar si hay solo 1 ficha rival
+
+        # Bloqueado si hay 2 o mas fichas rivales (signo opuesto)
+        return self.__cells__[to_point] * SIGN[player_color] > -2
 
     def _is_furthest_checker(self, from_point, color):
         """Verifica si la ficha es la mÃ¡s lejana en casa."""
+        cells = self.__cells__
         if color == 'B':
             # Blancas casa 18-23. La mÃ¡s lejana es idx 18
-            for idx in range(18, from_point):
-                if any(c.color() == color for c in self.__points__[idx]):
-                    return False
-            return True
-        else:
-            # Negras casa 0-5. La mÃ¡s lejana es idx 5
-            for idx in range(from_point + 1, 6):
-                if any(c.color() == color for c in self.__points__[idx]):
-                    return False
-            return True
+            return not any(cells[idx] > 0 for idx in range(18, from_point))
+        # Negras casa 0-5. La mÃ¡s lejana es idx 5
+        return not any(cells[idx] < 0 for idx in range(from_point + 1, 6))
 
     def can_move(self, from_point, die_value, player_color):
         """Verifica si un movimiento es legal."""
@@ -142,36 +404,294 @@ class Board:
     def _handle_capture(self, to_point, player_color):
         """Maneja la captura de fichas."""
         opponent_color = 'N' if player_color == 'B' else 'B'
-        owner, count = self.point_owner_count(to_point)
-        
-        if owner == opponent_color and count == 1:
-            captured = self.__points__[to_point].pop()
-            self.__bar__[opponent_color].append(captured)
+        if self.__cells__[to_point] == SIGN[opponent_color]:
+            self._assign(to_point, 0)
+            self._bump(BAR_SLOT[opponent_color], SIGN[opponent_color])
 
     def move(self, from_point, die_value, player_color):
         """Ejecuta un movimiento."""
         if not self.can_move(from_point, die_value, player_color):
             return False
-        
-        # 1. Desde la barra
+        self._play(from_point, die_value, player_color)
+        return True
+
+    def _play(self, from_point, die_value, player_color):
+        """
+        Ejecuta un movimiento ya validado sobre el arreglo compacto.
+        Devuelve el token (color, origen, destino, golpe, retirada) con el
+        delta necesario para deshacerlo.
+        """
+        cells = self.__cells__
+        sign = SIGN[player_color]
+
+        # 1. Origen: barra o punto; destino: punto o casillero de retiradas
         if from_point is None:
-            to_point = die_value - 1 if player_color == 'B' else 24 - die_value
-            checker = self.__bar__[player_color].pop()
-            self._handle_capture(to_point, player_color)
-            self.__points__[to_point].append(checker)
-            return True
-        
-        # 2. Calcular destino
-        to_point = from_point + die_value if player_color == 'B' else from_point - die_value
-        
-        # 3. Bearing off
-        if (player_color == 'B' and to_point > 23) or (player_color == 'N' and to_point < 0):
-            checker = self.__points__[from_point].pop()
-            self.__off__[player_color] += 1
-            return True
-        
-        # 4. Movimiento normal
-        checker = self.__points__[from_point].pop()
-        self._handle_capture(to_point, player_color)
-        self.__points__[to_point].append(checker)
-        return True
\ No newline at end of file
+            origin = BAR_SLOT[player_color]
+            dest = die_value - 1 if player_color == 'B' else 24 - die_value
+        else:
+            origin = from_point
+            dest = from_point + die_value if player_color == 'B' else from_point - die_value
+
+        # 2. Bearing off
+        borne_off = not (0 <= dest <= 23)
+        if borne_off:
+            dest = OFF_SLOT[player_color]
+
+        # 3. Movimiento (con captura si hay una sola rival)
+        self._bump(origin, -sign)
+        hit = not borne_off and cells[dest] == -sign
+        if hit:
+            self._handle_capture(dest, player_color)
+        self._bump(dest, sign)
+        return (player_color, origin, dest, hit, borne_off)
+
+    def _unplay(self, token):
+        """Revierte el delta registrado en un token de _play."""
+        player_color, origin, dest, hit, _ = token
+        sign = SIGN[player_color]
+        self._bump(dest, -sign)
+        self._bump(origin, sign)
+        if hit:
+            opponent_color = 'N' if player_color == 'B' else 'B'
+            self._bump(BAR_SLOT[opponent_color], sign)
+            self._assign(dest, -sign)
+
+    def apply(self, move, validate=True, record=True):
+        """
+        Aplica un movimiento (from_point, die_value, player_color) y lo apila.
+
+        Recibe: tupla con el movimiento; validate=False si ya se sabe legal;
+                record=False para jugadas que no se van a deshacer (partidas
+                de rollout o de simulacion), asi la pila no crece sin limite
+        Hace: Valida con can_move, mueve y, si record, guarda el delta en la pila
+        Devuelve: token (para undo() si se apilo), o None si el movimiento no es legal
+        """
+        from_point, die_value, player_color = move
+        if validate and not self.can_move(from_point, die_value, player_color):
+            return None
+        token = self._play(from_point, die_value, player_color)
+        if record:
+            self.__undo_stack__.append(token)
+        return token
+
+    def clear_undo(self):
+        """Descarta la pila de deshacer (los movimientos apilados quedan firmes)."""
+        self.__undo_stack__.clear()
+
+    def undo(self, token=None):
+        """
+        Deshace el ultimo movimiento aplicado con apply().
+
+        Recibe: token devuelto por apply (opcional; por defecto el ultimo)
+        Hace: Revierte origen, destino, golpe y retirada sin copiar el tablero
+        Devuelve: el token deshecho
+        Excepción: ValueError si no hay nada para deshacer o el token no es el ultimo
+        """
+        if not self.__undo_stack__:
+            raise ValueError("no hay movimientos para deshacer")
+        if token is not None and self.__undo_stack__[-1] != token:
+            raise ValueError("solo se puede deshacer el ultimo movimiento aplicado")
+        token = self.__undo_stack__.pop()
+        self._unplay(token)
+        return token
+
+    def origins(self, color):
+        """
+        Origenes posibles de un color.
+
+        Devuelve: (None,) si tiene fichas en la barra (solo puede entrar); si
+                  no, la lista de puntos (0-23) con fichas propias
+        """
+        if self.has_checkers_on_bar(color):
+            return (None,)
+        cells = self.__cells__
+        if color == 'B':
+            return [idx for idx in range(24) if cells[idx] > 0]
+        return [idx for idx in range(24) if cells[idx] < 0]
+
+    def _explore(self, color, dice):
+        """
+        Recorre el arbol de movimientos de una tirada sobre una copia.
+        Devuelve un dict que mapea cada posicion final -> secuencia.
+        """
+        scratch = self.copy()
+        cells = scratch.__cells__
+        finals = {}
+        depth = {}
+
+        def walk(remaining, seq):
+            state = (cells.tobytes(), remaining)
+            if state in depth:
+                return depth[state]
+            best = 0
+            for die in sorted(set(remaining), reverse=True):
+                rest = list(remaining)
+                rest.remove(die)
+                rest = tuple(rest)
+                for origin in scratch.origins(color):
+                    if scratch.can_move(origin, die, color):
+                        token = scratch._play(origin, die, color)
+                        played = 1 + walk(rest, seq + ((origin, die),))
+                        scratch._unplay(token)
+                        best = max(best, played)
+            if best == 0 and seq:
+                finals.setdefault(cells.tobytes(), seq)
+            depth[state] = best
+            return best
+
+        walk(tuple(sorted(dice)), ())
+        return finals
+
+    @staticmethod
+    def _must_play_high(dice, longest, used):
+        """Si solo entra un dado de dos distintos, hay que usar el mayor si se puede."""
+        return longest == 1 and len(set(dice)) == 2 and max(dice) in used
+
+    def legal_sequences(self, color, dice):
+        """
+        Enumera las secuencias legales completas para una tirada.
+
+        Incluye los 4 movimientos de dobles y el reingreso desde la barra. Solo
+        quedan las secuencias que usan la mayor cantidad de dados posible; si
+        solo se puede usar un dado de dos distintos, se exige el mayor cuando
+        es posible. Las secuencias que llegan a la misma posicion final se
+        devuelven una sola vez.
+        Devuelve: lista de tuplas ((from_point, die), ...)
+        """
+        finals = self._explore(color, dice)
+        if not finals:
+            return []
+
+        longest = max(len(seq) for seq in finals.values())
+        sequences = [seq for seq in finals.values() if len(seq) == longest]
+        if self._must_play_high(dice, longest, {seq[0][1] for seq in sequences}):
+            sequences = [seq for seq in sequences if seq[0][1] == max(dice)]
+        return sequences
+
+    def turn_tree(self, color, dice):
+        """
+        Arbol de sub-movimientos legales para una tirada completa.
+
+        Recibe: color que mueve y los dados disponibles
+        Hace: Recorre todas las combinaciones y poda las ramas que no usan la
+              mayor cantidad de dados posible (o el dado mayor si solo entra uno)
+        Devuelve: dict {(from_point, die): subarbol}; una hoja es un dict vacio.
+                  Los subarboles de estados repetidos se comparten.
+        """
+        scratch = self.copy()
+        cells = scratch.__cells__
+        memo = {}
+
+        def walk(remaining):
+            state = (cells.tobytes(), remaining)
+            if state in memo:
+                return memo[state]
+            children = {}
+            best = 0
+            for die in sorted(set(remaining), reverse=True):
+                rest = list(remaining)
+                rest.remove(die)
+                rest = tuple(rest)
+                for origin in scratch.origins(color):
+                    if scratch.can_move(origin, die, color):
+                        token = scratch._play(origin, die, color)
+                        played, subtree = walk(rest)
+                        scratch._unplay(token)
+                        children[(origin, die)] = (played + 1, subtree)
+                        best = max(best, played + 1)
+            node = {move: sub for move, (played, sub) in children.items() if played == best}
+            memo[state] = (best, node)
+            return best, node
+
+        longest, root = walk(tuple(sorted(dice)))
+        if self._must_play_high(dice, longest, {die for _, die in root}):
+            root = {move: sub for move, sub in root.items() if move[1] == max(dice)}
+        return root
+
+    def get_valid_moves(self, color, dice):
+        """Movimientos (from_point, die) con los que empieza alguna secuencia legal."""
+        moves = self.turn_tree(color, dice)
+        return sorted(moves, key=lambda m: (-1 if m[0] is None else m[0], m[1]))
+
+    def encode_position(self, side_to_move='B'):
+        """
+        Codifica la posicion en un ID binario de 10 bytes.
+
+        Recibe: side_to_move, el color que mueve ('B' o 'N')
+        Hace: Empaqueta los puntos y la barra de cada jugador desde su
+              perspectiva; las retiradas quedan implicitas (15 - en juego).
+              Arma el entero con desplazamientos y OR de las corridas
+              precalculadas de a dos puntos (_PID_PAIRS)
+        Devuelve: bytes de largo 10
+        Excepción: ValueError si un jugador tiene mas de 15 fichas en juego
+        """
+        cells = self.__cells__
+        keys = memoryview(cells.tobytes()).cast('H').tolist()
+        opponent = 'N' if side_to_move == 'B' else 'B'
+        value = 0
+        shift = 0
+        for color in (side_to_move, opponent):
+            pairs = _PID_PAIRS[color]
+            start = shift
+            for key in keys[_PID_KEYS[color]]:
+                try:
+                    pattern, width = pairs[key]
+                except KeyError:
+                    pattern, width = _pid_pair(key, color)
+                value |= pattern << shift
+                shift += width
+            pattern, width = _PID_BARS[color][cells[BAR_SLOT[color]]]
+            value |= pattern << shift
+            shift += width
+            # Cada casillero aporta sus fichas mas un separador
+            if shift - start - 25 > 15:
+                raise ValueError(f"'{color}' tiene mas de 15 fichas en juego")
+        return value.to_bytes(POSITION_ID_BYTES, "little")
+
+    @classmethod
+    def decode_position(cls, data, side_to_move='B'):
+        """
+        Reconstruye un tablero desde un ID de encode_position.
+
+        Recibe: data (10 bytes) y el color que mueve
+        Hace: Desempaqueta las corridas de bits 1 de cada casillero byte a
+              byte con la tabla _PID_BYTES, sin pasar por texto
+        Devuelve: nuevo Board
+        Excepción: ValueError si el ID no es valido
+        """
+        if len(data) != POSITION_ID_BYTES:
+            raise ValueError(f"el position ID debe tener {POSITION_ID_BYTES} bytes")
+        runs = []
+        carry = 0
+        for byte in data:
+            head, rest, tail = _PID_BYTES[byte]
+            if head is None:
+                carry += 8
+            else:
+                runs.append(carry + head)
+                runs.extend(rest)
+                carry = tail
+        if len(runs) < 50:
+            raise ValueError("position ID invalido")
+
+        own, opp = runs[:25], runs[25:50]
+        white, black = (own, opp) if side_to_move == 'B' else (opp, own)
+        white_total, black_total = sum(white), sum(black)
+        if white_total > 15 or black_total > 15:
+            raise ValueError("position ID invalido: mas de 15 fichas")
+        # Puntos 0..23 en el orden del tablero: blancas cuentan desde el 23
+        white_points, black_points = white[23::-1], black[:24]
+        if any(map(mul, white_points, black_points)):
+            raise ValueError("position ID invalido: punto ocupado por ambos")
+        cells = list(map(sub, white_points, black_points))
+        cells += (white[24], -black[24], 15 - white_total, black_total - 15)
+        return cls.from_cells(cells)
+
+    def position_id(self, side_to_move='B'):
+        """Position ID como texto base64 de 14 caracteres (sin relleno)."""
+        return base64.b64encode(self.encode_position(side_to_move)).decode("ascii").rstrip("=")
+
+    @classmethod
+    def from_position_id(cls, text, side_to_move='B'):
+        """Inverso de position_id."""
+        return cls.decode_position(base64.b64decode(text + "=="), side_to_move)
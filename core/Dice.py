@@ -1,22 +1,77 @@
 import random
 
+import numpy as np
+
+
 class Dice:
     """
     Representa los dados del juego de Backgammon.
     
     Maneja el lanzamiento de dos dados de 6 caras y la regla de dobles
     (cuando salen iguales se pueden hacer 4 movimientos).
+
+    Fuentes de azar, de mayor a menor prioridad:
+    - script: tiradas fijas para reproducir una partida grabada
+    - seed o un numpy.random.Generator: tiradas sacadas por bloques a un
+      buffer circular (una llamada a NumPy cada block_size tiradas)
+    - rng (random.Random): una secuencia propia
+    - nada: el generador global del módulo random
     """
     
-    def __init__(self):
+    def __init__(self, rng=None, seed=None, script=None, block_size=256):
         """
         Inicializa los dados sin valores.
         
-        Recibe: Nada
+        Recibe:
+            rng: random.Random o numpy.random.Generator opcional
+            seed: semilla para un numpy.random.Generator propio
+            script: lista opcional de tiradas (d1, d2) a repetir en orden;
+                    cuando se acaba sigue con rng/seed, o falla si no hay
+            block_size: tiradas que se sacan de NumPy de una vez
         Hace: Crea lista vacía para almacenar últimos valores
         Devuelve: Nada
+        Excepción: ValueError si el script tiene una tirada inválida
         """
         self.__last__ = []
+        self.__script__ = []
+        for roll in script or ():
+            d1, d2 = roll[0], roll[1]
+            if not (1 <= d1 <= 6 and 1 <= d2 <= 6):
+                raise ValueError(f"tirada inválida en el script: {roll}")
+            self.__script__.append((d1, d2))
+        self.__script__.reverse()  # se consume con pop() desde el final
+        self.__scripted__ = script is not None
+        if seed is not None:
+            rng = np.random.default_rng(seed)
+        self.__generator__ = rng if isinstance(rng, np.random.Generator) else None
+        self.__rng__ = None if self.__generator__ is not None else rng
+        self.__block__ = block_size
+        self.__buffer__ = []  # Buffer circular: 2 * block_size caras
+        self.__pos__ = 0
+
+    def _refill(self):
+        """Saca un bloque nuevo del Generator sobre el mismo buffer."""
+        faces = self.__generator__.integers(1, 7, size=2 * self.__block__).tolist()
+        if len(self.__buffer__) == len(faces):
+            self.__buffer__[:] = faces
+        else:
+            self.__buffer__ = faces
+        self.__pos__ = 0
+
+    def _draw(self):
+        """Devuelve el próximo par (d1, d2) según la fuente de azar."""
+        if self.__script__:
+            return self.__script__.pop()
+        if self.__generator__ is not None:
+            if self.__pos__ >= len(self.__buffer__):
+                self._refill()
+            pos = self.__pos__
+            self.__pos__ = pos + 2
+            return self.__buffer__[pos], self.__buffer__[pos + 1]
+        if self.__scripted__ and self.__rng__ is None:
+            raise IndexError("se acabaron las tiradas del script")
+        rng = self.__rng__ or random
+        return rng.randint(1, 6), rng.randint(1, 6)
 
     def roll(self):
         """
@@ -27,9 +82,9 @@ class Dice:
               Si son iguales (dobles), genera 4 valores iguales
               Si son diferentes, genera 2 valores
         Devuelve: Lista con los valores de los dados
+        Excepción: IndexError si se acabó el script y no hay otra fuente
         """
-        d1 = random.randint(1, 6)
-        d2 = random.randint(1, 6)
+        d1, d2 = self._draw()
         if d1 == d2:
             self.__last__ = [d1, d1, d1, d1]
         else:
@@ -44,4 +99,29 @@ class Dice:
         Hace: Retorna copia de los últimos valores tirados
         Devuelve: Lista con valores de la última tirada
         """
-        return list(self.__last__)
\ No newline at end of file
+        return list(self.__last__)
+
+# Las 36 tiradas ordenadas posibles, en un orden fijo
+ROLLS = [(d1, d2) for d1 in range(1, 7) for d2 in range(1, 7)]
+
+
+class StratifiedDice(Dice):
+    """
+    Dados cuasi-aleatorios para rollouts.
+
+    La partida numero trial arranca con la tirada ROLLS[trial % 36] y sigue
+    con ROLLS[(trial + trial // 36) % 36] (cuadrado latino): cada bloque de
+    36 partidas recorre las 36 primeras tiradas y tambien las 36 segundas,
+    asi ambas quedan balanceadas en cualquier multiplo de 36, y cada 1296
+    partidas aparecen todas las combinaciones de primera y segunda tirada.
+    Desde la tercera tirada los dados son aleatorios.
+    """
+
+    def __init__(self, trial, rng=None):
+        """
+        Recibe: trial, numero de partida dentro del rollout, y rng opcional
+        Hace: Usa las dos primeras tiradas estratificadas como script
+        Devuelve: Nada
+        """
+        # Sin rng, al terminar el script sigue con el módulo random global
+        super().__init__(rng or random, script=[ROLLS[trial % 36], ROLLS[(trial + trial // 36) % 36]])
@@ -0,0 +1,242 @@
+import numpy as np
+
+from .Board import NUM_SLOTS, BAR_SLOT, OFF_SLOT
+
+# Bloques de columnas de la salida
+TD_FEATURES = 198          # Las mismas 198 entradas que encode_board
+PIPS = 198                 # pips / 167 de blancas y negras
+BLOTS = 200                # fichas sueltas / 15
+PRIMES = 202               # largo del bloqueo mas largo / 6
+ESCAPES = 204              # fraccion de las 36 tiradas que sacan a la ultima ficha
+NUM_FEATURES = 206
+
+_INITIAL_PIPS = 167.0
+# Las 36 tiradas ordenadas: columna (pips) de cada dado y de la suma en la
+# tabla de destinos de _escapes (columna k = k pips mas adelante)
+_ROLL_D1 = np.repeat(np.arange(1, 7), 6)
+_ROLL_D2 = np.tile(np.arange(1, 7), 6)
+_ROLL_SUM = _ROLL_D1 + _ROLL_D2
+# int16 como white/black para que matmul no convierta el lote
+_TO_OFF_B = (24 - np.arange(24)).astype(np.int16)    # pips de cada punto hasta salir, blancas
+_TO_OFF_N = (np.arange(24) + 1).astype(np.int16)     # idem negras
+_POINTS = np.arange(24)
+_POINTS_FROM_24 = np.arange(24) - 24                # has * esto + 24: indice o 24 si no hay
+_POINTS_PLUS_1 = np.arange(24) + 1                  # ahead * esto - 1: indice o -1 si no hay
+_STEPS = np.arange(13)                              # destinos a 0..12 pips
+_PADDED = 38                                        # puntos -1..36 de la tabla de bloqueos
+
+
+class FeatureEncoder:
+    """
+    Codificador vectorizado de lotes de tableros.
+
+    Trabaja sobre la representacion compacta de Board (N, 28) int8 y no tiene
+    ciclos por ficha: todo son operaciones de NumPy sobre el lote. Reserva una
+    sola vez, para hasta capacity tableros, todos los buffers de trabajo
+    (celdas, fichas por color, pips, rachas y las mascaras e indices de los
+    escapes) y los llena con out=, asi encode no reserva arreglos por lote.
+    Solo quedan los buffers de conversion de tipos de NumPy, de tamaño fijo
+    (no crecen con N), y los turnos dados como lista, que se convierten.
+    """
+
+    def __init__(self, capacity=256):
+        """
+        Recibe: capacity, tamaño maximo de lote
+        Hace: Reserva los buffers de trabajo
+        """
+        self.__capacity__ = capacity
+        self.__cells__ = np.zeros((capacity, NUM_SLOTS), dtype=np.int8)
+        self.__white__ = np.zeros((capacity, 24), dtype=np.int16)
+        self.__black__ = np.zeros((capacity, 24), dtype=np.int16)
+        self.__run__ = np.zeros(capacity, dtype=np.int16)
+        self.__best__ = np.zeros(capacity, dtype=np.int16)
+        self.__bars__ = np.zeros((capacity, 2), dtype=np.int16)
+        self.__pips__ = np.zeros((capacity, 2), dtype=np.int16)
+        # Mascaras por punto: fichas sueltas, puntos hechos y fichas propias
+        self.__mask__ = np.zeros((capacity, 24), dtype=bool)
+        self.__made__ = np.zeros((capacity, 24), dtype=bool)
+        self.__has__ = np.zeros((capacity, 24), dtype=bool)
+        self.__index__ = np.zeros((capacity, 24), dtype=np.int64)
+        # Escapes: ficha mas atrasada, ultimo punto rival por delante y flags
+        self.__rear__ = np.zeros(capacity, dtype=np.int64)
+        self.__last__ = np.zeros(capacity, dtype=np.int64)
+        self.__flag__ = np.zeros(capacity, dtype=bool)
+        # Puntos hechos del rival en -1..36; las columnas fuera de 1..24 quedan en False
+        self.__padded__ = np.zeros((capacity, _PADDED), dtype=bool)
+        self.__rows__ = (np.arange(capacity) * _PADDED + 1)[:, None]
+        self.__dest__ = np.zeros((capacity, 13), dtype=np.int64)
+        self.__flat__ = np.zeros((capacity, 13), dtype=np.int64)
+        self.__free__ = np.zeros((capacity, 13), dtype=bool)
+        self.__passable__ = np.zeros((capacity, 13), dtype=bool)
+        self.__rolls__ = np.zeros((3, capacity, 36), dtype=bool)
+
+    def capacity(self):
+        return self.__capacity__
+
+    def allocate(self, n=None):
+        """Buffer de salida del tamaño justo para reutilizar entre lotes."""
+        return np.zeros((n or self.__capacity__, NUM_FEATURES))
+
+    def load(self, positions):
+        """
+        Copia un lote al buffer interno de celdas.
+
+        Recibe: lista de Board o arreglo (N, 28) de enteros
+        Devuelve: vista (N, 28) int8 del buffer interno
+        Excepción: ValueError si el lote excede la capacidad o la forma no es (N, 28)
+        """
+        n = len(positions)
+        if n > self.__capacity__:
+            raise ValueError("el lote excede la capacidad del codificador")
+        cells = self.__cells__[:n]
+        if isinstance(positions, np.ndarray):
+            if positions.ndim != 2 or positions.shape[1] != NUM_SLOTS:
+                raise ValueError(f"se esperaba un arreglo (N, {NUM_SLOTS})")
+            cells[:] = positions
+        else:
+            for i, board in enumerate(positions):
+                cells[i] = np.frombuffer(board.cells(), dtype=np.int8)
+        return cells
+
+    def encode(self, positions, turns, out):
+        """
+        Codifica un lote.
+
+        Recibe:
+            positions: lista de Board o arreglo (N, 28)
+            turns: color que mueve, uno para todo el lote o uno por tablero
+            out: buffer (M, NUM_FEATURES) con M >= N, reservado por quien llama
+        Hace: Escribe en out[:N] las 198 entradas TD, pips, fichas sueltas,
+              bloqueos y escapes de cada color
+        Devuelve: out[:N]
+        """
+        cells = self.load(positions)
+        n = len(cells)
+        x = out[:n]
+        white = self.__white__[:n]
+        black = self.__black__[:n]
+        np.maximum(cells[:, :24], 0, out=white)
+        np.negative(cells[:, :24], out=black)
+        np.maximum(black, 0, out=black)
+
+        # Entradas TD: 4 unidades por punto y color
+        for counts, base in ((white, 0), (black, 96)):
+            units = x[:, base:base + 96].reshape(n, 24, 4)
+            np.greater_equal(counts, 1, out=units[:, :, 0])
+            np.greater_equal(counts, 2, out=units[:, :, 1])
+            np.greater_equal(counts, 3, out=units[:, :, 2])
+            np.subtract(counts, 3, out=units[:, :, 3])
+            np.maximum(units[:, :, 3], 0.0, out=units[:, :, 3])
+            units[:, :, 3] *= 0.5
+        bars = self.__bars__[:n]
+        bar_b, bar_n = bars[:, 0], bars[:, 1]
+        bar_b[:] = cells[:, BAR_SLOT['B']]
+        np.negative(cells[:, BAR_SLOT['N']], out=bar_n)
+        np.multiply(bar_b, 0.5, out=x[:, 192])
+        np.multiply(bar_n, 0.5, out=x[:, 193])
+        np.multiply(cells[:, OFF_SLOT['B']], 1 / 15, out=x[:, 194])
+        np.multiply(cells[:, OFF_SLOT['N']], -1 / 15, out=x[:, 195])
+        if isinstance(turns, str):
+            x[:, 196] = turns == 'B'
+            x[:, 197] = turns == 'N'
+        else:
+            np.equal(np.asarray(turns), 'B', out=x[:, 196])
+            np.equal(np.asarray(turns), 'N', out=x[:, 197])
+
+        # Pips
+        pips = self.__pips__[:n]
+        run = self.__run__[:n]  # Libre hasta los bloqueos, se usa de auxiliar
+        for counts, to_off, bar, k in ((white, _TO_OFF_B, bar_b, 0), (black, _TO_OFF_N, bar_n, 1)):
+            np.matmul(counts, to_off, out=pips[:, k])
+            np.multiply(bar, 25, out=run)
+            pips[:, k] += run
+        np.divide(pips, _INITIAL_PIPS, out=x[:, PIPS:PIPS + 2])
+
+        # Fichas sueltas
+        mask = self.__mask__[:n]
+        for counts, col in ((white, BLOTS), (black, BLOTS + 1)):
+            np.equal(counts, 1, out=mask)
+            np.sum(mask, axis=1, out=x[:, col])
+        x[:, BLOTS:BLOTS + 2] /= 15.0
+
+        # Bloqueos: la racha mas larga de puntos hechos
+        made = self.__made__[:n]
+        best = self.__best__[:n]
+        for counts, col in ((white, PRIMES), (black, PRIMES + 1)):
+            np.greater_equal(counts, 2, out=made)
+            run[:] = 0
+            best[:] = 0
+            for idx in range(24):
+                run += 1
+                run *= made[:, idx]
+                np.maximum(best, run, out=best)
+            np.divide(best, 6.0, out=x[:, col])
+
+        # Escapes de la ultima ficha de cada color
+        self._escapes(white, black, bar_b, x[:, ESCAPES])
+        self._escapes(black[:, ::-1], white[:, ::-1], bar_n, x[:, ESCAPES + 1])
+        return x
+
+    def _escapes(self, own, opp, bar, out):
+        """
+        Escapes de la ficha mas atrasada de own, en coordenadas donde own
+        avanza hacia indices mayores (barra = -1).
+
+        Una tirada la escapa si con un dado, o con los dos seguidos pasando por
+        un punto libre, cae en un punto libre mas alla del ultimo punto hecho
+        del rival. Sin puntos rivales por delante vale 1; sin fichas, 0.
+        Recibe: fichas (N, 24) de cada lado, barra (N,) de own y out (N,)
+        Hace: Escribe en out la fraccion de las 36 tiradas usando solo los
+              buffers del codificador
+        """
+        n = len(own)
+        has = self.__has__[:n]
+        index = self.__index__[:n]
+        rear = self.__rear__[:n]
+        last = self.__last__[:n]
+        flag = self.__flag__[:n]
+        padded = self.__padded__[:n]
+        blocks = padded[:, 1:25]
+        ahead = self.__mask__[:n]
+
+        # rear: primer punto con fichas propias, 24 si no hay, -1 si hay en la barra
+        np.greater(own, 0, out=has)
+        np.multiply(has, _POINTS_FROM_24, out=index)
+        np.min(index, axis=1, out=rear)
+        rear += 24
+        np.greater(bar, 0, out=flag)
+        np.copyto(rear, -1, where=flag)
+        # last: ultimo punto hecho del rival por delante de rear, -1 si no hay
+        np.greater_equal(opp, 2, out=blocks)
+        np.greater(_POINTS, rear[:, None], out=ahead)
+        np.logical_and(ahead, blocks, out=ahead)
+        np.multiply(ahead, _POINTS_PLUS_1, out=index)
+        np.max(index, axis=1, out=last)
+        last -= 1
+
+        # Columna k de dest = destino a k pips (k = 0..12); padded cubre -1..36
+        dest = self.__dest__[:n]
+        flat = self.__flat__[:n]
+        free = self.__free__[:n]
+        passable = self.__passable__[:n]
+        np.add(rear[:, None], _STEPS, out=dest)
+        np.add(dest, self.__rows__[:n], out=flat)
+        np.take(padded, flat, out=passable, mode='clip')  # bloqueado
+        np.logical_not(passable, out=passable)
+        np.greater(dest, last[:, None], out=free)
+        np.logical_and(free, passable, out=free)         # libre y mas alla
+        escaped, first, second = self.__rolls__[:, :n]
+        np.take(free, _ROLL_D1, axis=1, out=escaped, mode='clip')
+        np.take(free, _ROLL_D2, axis=1, out=first, mode='clip')
+        np.logical_or(escaped, first, out=escaped)
+        np.take(passable, _ROLL_D1, axis=1, out=first, mode='clip')
+        np.take(passable, _ROLL_D2, axis=1, out=second, mode='clip')
+        np.logical_or(first, second, out=first)
+        np.take(free, _ROLL_SUM, axis=1, out=second, mode='clip')
+        np.logical_and(first, second, out=first)
+        np.logical_or(escaped, first, out=escaped)
+        np.mean(escaped, axis=1, out=out)
+        np.less(last, 0, out=flag)
+        np.copyto(out, 1.0, where=flag)
+        np.equal(rear, 24, out=flag)
+        np.copyto(out, 0.0, where=flag)
@@ -0,0 +1,261 @@
+import numpy as np
+
+from .BackgammonGame import BackgammonGame
+from .Board import BAR_SLOT, OFF_SLOT, NUM_SLOTS
+from .Dice import Dice
+from .FeatureEncoder import FeatureEncoder, TD_FEATURES
+
+NUM_FEATURES = 198
+HIDDEN_UNITS = 40
+
+
+def encode_board(board, turn, out=None):
+    """
+    Codifica un tablero con las 198 entradas de TD-Gammon.
+
+    Recibe: board, color al que le toca mover y out opcional (arreglo de 198)
+    Hace: Por punto y color, 4 unidades: >=1, >=2, >=3 fichas y (n - 3) / 2
+          del resto (192); barra / 2 y retiradas / 15 por color (4); quien
+          mueve (2). Primero blancas, despues negras
+    Devuelve: arreglo float de 198
+    """
+    x = np.zeros(NUM_FEATURES) if out is None else out
+    x[:] = 0.0
+    cells = board.cells()
+    for color, sign, base in (('B', 1, 0), ('N', -1, 96)):
+        for idx in range(24):
+            n = cells[idx] * sign
+            if n > 0:
+                unit = base + 4 * idx
+                x[unit] = 1.0
+                if n > 1:
+                    x[unit + 1] = 1.0
+                if n > 2:
+                    x[unit + 2] = 1.0
+                if n > 3:
+                    x[unit + 3] = (n - 3) / 2.0
+    x[192] = cells[BAR_SLOT['B']] / 2.0
+    x[193] = -cells[BAR_SLOT['N']] / 2.0
+    x[194] = cells[OFF_SLOT['B']] / 15.0
+    x[195] = -cells[OFF_SLOT['N']] / 15.0
+    x[196 if turn == 'B' else 197] = 1.0
+    return x
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+class NeuralEvaluator:
+    """
+    Perceptron de una capa oculta al estilo TD-Gammon, en NumPy.
+
+    La salida es la probabilidad de que ganen las blancas. La entrada
+    principal es predict_batch, que evalua una matriz (N, 198) con una sola
+    cadena de productos de matrices; el resto son envoltorios de una posicion.
+    """
+
+    def __init__(self, hidden=HIDDEN_UNITS, seed=0, weights=None):
+        """
+        Recibe: hidden, unidades ocultas; seed para la inicializacion; o
+                weights, dict con W1 (198, h), b1 (h,), W2 (h,), b2 ()
+        Excepción: ValueError si las formas de weights no son coherentes
+        """
+        if weights is None:
+            rng = np.random.default_rng(seed)
+            weights = {
+                "W1": rng.normal(0.0, 0.1, (NUM_FEATURES, hidden)),
+                "b1": np.zeros(hidden),
+                "W2": rng.normal(0.0, 0.1, hidden),
+                "b2": np.zeros(()),
+            }
+        self.W1 = np.asarray(weights["W1"], dtype=np.float64)
+        self.b1 = np.asarray(weights["b1"], dtype=np.float64)
+        self.W2 = np.asarray(weights["W2"], dtype=np.float64)
+        self.b2 = np.asarray(weights["b2"], dtype=np.float64).reshape(())
+        hidden = self.b1.shape[0]
+        if self.W1.shape != (NUM_FEATURES, hidden) or self.W2.shape != (hidden,):
+            raise ValueError("formas de pesos incoherentes")
+        self.__encoder__ = None  # FeatureEncoder y buffers de choose, se crean al usarlos
+
+    @classmethod
+    def load(cls, path):
+        """Carga pesos guardados con save()."""
+        with np.load(path) as data:
+            return cls(weights={key: data[key] for key in ("W1", "b1", "W2", "b2")})
+
+    def save(self, path):
+        """Guarda los pesos en un .npz."""
+        np.savez(path, W1=self.W1, b1=self.b1, W2=self.W2, b2=self.b2)
+
+    # =========================
+    # Inferencia
+    # =========================
+    def predict_batch(self, features):
+        """
+        Recibe: matriz (N, 198) de encode_board
+        Devuelve: arreglo (N,) con la probabilidad de victoria de blancas
+        """
+        hidden = _sigmoid(features @ self.W1 + self.b1)
+        return _sigmoid(hidden @ self.W2 + self.b2)
+
+    def predict(self, board, turn):
+        """Probabilidad de victoria de blancas para un tablero."""
+        return float(self.predict_batch(encode_board(board, turn)[None, :])[0])
+
+    def evaluate(self, board, color):
+        """
+        Evaluacion compatible con SearchEngine.
+
+        Recibe: board y el color que mueve
+        Devuelve: valor en (-1, 1) desde el punto de vista de color
+        """
+        p = self.predict(board, color)
+        return 2.0 * p - 1.0 if color == 'B' else 1.0 - 2.0 * p
+
+    __call__ = evaluate
+
+    def choose(self, board, color, dice, rng=None):
+        """
+        Politica a un turno: evalua todas las secuencias en un solo lote.
+
+        Recibe: board, color que mueve, dados y rng (no se usa; firma de politica)
+        Devuelve: la secuencia que maximiza la probabilidad de color, o ()
+        """
+        seqs = board.legal_sequences(color, dice)
+        if not seqs:
+            return ()
+        opponent = 'N' if color == 'B' else 'B'
+        encoder, cells, features = self._buffers(len(seqs))
+        for k, seq in enumerate(seqs):
+            tokens = [board.apply((origin, die, color), validate=False) for origin, die in seq]
+            cells[k] = np.frombuffer(board.cells(), dtype=np.int8)
+            for token in reversed(tokens):
+                board.undo(token)
+        x = encoder.encode(cells[:len(seqs)], opponent, features)
+        p = self.predict_batch(x[:, :TD_FEATURES])
+        return seqs[int(np.argmax(p) if color == 'B' else np.argmin(p))]
+
+    def _buffers(self, n):
+        """Codificador y buffers reutilizables con lugar para n posiciones."""
+        if self.__encoder__ is None or self.__encoder__[0].capacity() < n:
+            capacity = max(256, 1 << (n - 1).bit_length())
+            encoder = FeatureEncoder(capacity)
+            self.__encoder__ = (encoder, np.zeros((capacity, NUM_SLOTS), dtype=np.int8),
+                                encoder.allocate())
+        return self.__encoder__
+
+    # =========================
+    # Gradiente
+    # =========================
+    def value_and_gradient(self, x):
+        """
+        Recibe: vector de 198
+        Devuelve: (salida, dict de gradientes de la salida por cada peso)
+        """
+        hidden = _sigmoid(x @ self.W1 + self.b1)
+        y = float(_sigmoid(hidden @ self.W2 + self.b2))
+        dz2 = y * (1.0 - y)
+        dz1 = dz2 * self.W2 * hidden * (1.0 - hidden)
+        return y, {"W1": np.outer(x, dz1), "b1": dz1, "W2": dz2 * hidden, "b2": np.asarray(dz2)}
+
+
+class TDTrainer:
+    """
+    Entrenamiento TD(lambda) por autojuego sobre BackgammonGame sin interfaz.
+
+    Despues de cada turno la red se acerca a su propia prediccion del estado
+    siguiente; al terminar la partida, al resultado (1 si ganaron blancas).
+    """
+
+    def __init__(self, evaluator=None, alpha=0.1, lam=0.7, seed=0):
+        """
+        Recibe: evaluator (NeuralEvaluator nuevo si es None), tasa de
+                aprendizaje alpha, lam de las trazas y semilla de las partidas
+        """
+        self.evaluator = evaluator or NeuralEvaluator(seed=seed)
+        self.alpha = alpha
+        self.lam = lam
+        self.__seed__ = seed
+        self.__games__ = 0
+
+    def games_played(self):
+        return self.__games__
+
+    def play_game(self):
+        """
+        Juega y aprende una partida.
+
+        Devuelve: color ganador
+        """
+        net = self.evaluator
+        game_seed = (self.__seed__ << 32) | self.__games__
+        game = BackgammonGame(verbose=False, dice=Dice(seed=game_seed))
+        traces = {key: np.zeros_like(getattr(net, key)) for key in ("W1", "b1", "W2", "b2")}
+        x = encode_board(game.board(), game.turno())
+        y, grad = net.value_and_gradient(x)
+
+        while not game.is_game_over():
+            game.roll()
+            color = game.turno()
+            for origin, die in net.choose(game.board(), color, game.available_dice()):
+                game.move(origin, die)
+            if game.is_game_over():
+                break
+            if game.turno() == color:
+                game.end_turn()
+            for key in traces:
+                traces[key] = self.lam * traces[key] + grad[key]
+            encode_board(game.board(), game.turno(), x)
+            y_next, grad_next = net.value_and_gradient(x)
+            self._update(traces, y_next - y)
+            y, grad = y_next, grad_next
+
+        for key in traces:
+            traces[key] = self.lam * traces[key] + grad[key]
+        self._update(traces, (1.0 if game.winner() == 'B' else 0.0) - y)
+        self.__games__ += 1
+        return game.winner()
+
+    def _update(self, traces, delta):
+        step = self.alpha * delta
+        net = self.evaluator
+        net.W1 += step * traces["W1"]
+        net.b1 += step * traces["b1"]
+        net.W2 += step * traces["W2"]
+        net.b2 = net.b2 + step * traces["b2"]
+
+    def train(self, games, path=None):
+        """
+        Recibe: cantidad de partidas y path opcional de un .npz
+        Hace: Juega las partidas y, si hay path, guarda los pesos al final
+        Devuelve: dict con victorias por color
+        """
+        wins = {"B": 0, "N": 0}
+        for _ in range(games):
+            wins[self.play_game()] += 1
+        if path is not None:
+            self.evaluator.save(path)
+        return wins
+
+
+def main(argv=None):
+    """Punto de entrada: python -m core.NeuralEvaluator --games 1000 --out pesos.npz"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Entrena el evaluador por autojuego TD(lambda)")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--out", default="td_weights.npz")
+    parser.add_argument("--init", default=None, help="pesos .npz para seguir entrenando")
+    parser.add_argument("--hidden", type=int, default=HIDDEN_UNITS)
+    parser.add_argument("--alpha", type=float, default=0.1)
+    parser.add_argument("--lam", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    net = NeuralEvaluator.load(args.init) if args.init else NeuralEvaluator(args.hidden, args.seed)
+    trainer = TDTrainer(net, args.alpha, args.lam, args.seed)
+    wins = trainer.train(args.games, args.out)
+    print(f"{args.games} partidas (B {wins['B']} / N {wins['N']}); pesos en {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import multiprocessing
+import os
+import struct
+
+from .Board import Board
+from .Policies import greedy_policy
+from .Rollout import rollout
+from .SearchEngine import DICE_OUTCOMES, heuristic_eval
+from .TranspositionTable import make_key
+
+# Cabecera: magia, version, cantidad de cubetas (potencia de 2), entradas usadas
+_HEADER = struct.Struct("<4sHHI")
+_MAGIC = b"BGOB"
+_VERSION = 1
+# Entrada: clave, equity de la jugada, ocupada, 4 x (origen, dado)
+_ENTRY = struct.Struct("<Qf?8B")
+_BAR = 24  # Origen None (barra) en el archivo
+_MAX_MOVES = 4
+
+
+def _pack_sequence(seq):
+    """Secuencia ((origen, dado), ...) -> 8 bytes; dado 0 = sin movimiento."""
+    flat = []
+    for origin, die in seq:
+        flat += [_BAR if origin is None else origin, die]
+    flat += [0] * (2 * _MAX_MOVES - len(flat))
+    return flat
+
+
+def _unpack_sequence(flat):
+    seq = []
+    for k in range(0, 2 * _MAX_MOVES, 2):
+        origin, die = flat[k], flat[k + 1]
+        if die == 0:
+            break
+        seq.append((None if origin == _BAR else origin, die))
+    return tuple(seq)
+
+
+def book_key(board, color, dice):
+    """Clave del libro: hash Zobrist con quien mueve + tirada."""
+    return make_key(board.zobrist_hash(color), list(dice))
+
+
+def _score_plays(board, color, dice, candidates, trials, processes, seed, policy, pool=None):
+    """
+    Evalua las jugadas de una tirada por autojuego masivo.
+
+    Recibe: board, color que mueve, tirada, cuantas jugadas pasan el filtro
+            estatico, partidas por jugada, procesos, semilla, politica y el
+            pool compartido de rollout (None = sin pool)
+    Hace: Ordena las secuencias legales con heuristic_eval, se queda con las
+          mejores candidates y juega trials partidas desde cada una con rollout
+    Devuelve: lista de (equity de color, secuencia), mejor primero
+    """
+    opponent = 'N' if color == 'B' else 'B'
+    ranked = []
+    for seq in board.legal_sequences(color, list(dice)):
+        after = board.copy()
+        for origin, die in seq:
+            after.apply((origin, die, color), validate=False, record=False)
+        ranked.append((heuristic_eval(after, color), seq, after))
+    ranked.sort(key=lambda item: item[0], reverse=True)
+
+    scored = []
+    for _, seq, after in ranked[:candidates]:
+        report = rollout(after, opponent, policy, trials=trials, processes=processes,
+                         seed=seed, pool=pool)
+        scored.append((-report["equity"], seq))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored
+
+
+def build_opening_book(path, trials=100, candidates=4, processes=None, seed=0,
+                       policy=greedy_policy, rolls=None):
+    """
+    Arma el libro de aperturas desde la posicion de Board._setup.
+
+    Recibe:
+        path: archivo de salida
+        trials: partidas de autojuego por jugada candidata
+        candidates: jugadas por tirada que pasan el filtro estatico
+        processes: procesos del pool de rollout (None = todos los nucleos)
+        seed, policy: semilla y politica de las partidas de rollout
+        rolls: tiradas a cubrir (por defecto las 21 de DICE_OUTCOMES; el juego
+               deja empezar con dobles)
+    Hace: Para cada tirada de blancas guarda la mejor jugada y, desde la
+          posicion resultante, la mejor respuesta de negras a cada tirada.
+          Crea un solo multiprocessing.Pool para todos los rollouts
+    Devuelve: cantidad de entradas escritas
+    """
+    rolls = rolls or [dice for dice, _ in DICE_OUTCOMES]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        entries = _build_entries(rolls, trials, candidates, processes, seed, policy, None)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            entries = _build_entries(rolls, trials, candidates, processes, seed, policy, pool)
+    write_book(path, entries)
+    return len(entries)
+
+
+def _build_entries(rolls, trials, candidates, processes, seed, policy, pool):
+    """Entradas {clave: (equity, secuencia)} de build_opening_book."""
+    entries = {}
+    start = Board()
+    for dice in rolls:
+        scored = _score_plays(start, 'B', dice, candidates, trials, processes, seed, policy, pool)
+        if not scored:
+            continue
+        equity, best = scored[0]
+        entries[book_key(start, 'B', dice)] = (equity, best)
+        reply_board = start.copy()
+        for origin, die in best:
+            reply_board.apply((origin, die, 'B'), validate=False, record=False)
+        for reply in rolls:
+            replies = _score_plays(reply_board, 'N', reply, candidates, trials,
+                                   processes, seed, policy, pool)
+            if replies:
+                entries[book_key(reply_board, 'N', reply)] = replies[0]
+    return entries
+
+
+def write_book(path, entries):
+    """
+    Escribe el libro como tabla hash de direccionamiento abierto.
+
+    Recibe: path y dict {clave: (equity, secuencia)}
+    Hace: Usa al menos el doble de cubetas que entradas (potencia de 2)
+    """
+    buckets = 1 << max(1, (2 * len(entries)).bit_length())
+    mask = buckets - 1
+    table = [None] * buckets
+    for key, (equity, seq) in entries.items():
+        slot = key & mask
+        while table[slot] is not None:
+            slot = (slot + 1) & mask
+        table[slot] = (key, equity, seq)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, buckets, len(entries)))
+        for entry in table:
+            if entry is None:
+                f.write(_ENTRY.pack(0, 0.0, False, *([0] * 2 * _MAX_MOVES)))
+            else:
+                key, equity, seq = entry
+                f.write(_ENTRY.pack(key, equity, True, *_pack_sequence(seq)))
+
+
+class OpeningBook:
+    """
+    Libro de aperturas cargado en memoria.
+
+    La consulta es O(1): hash Zobrist de la posicion + tirada, cubeta y sondeo
+    lineal en una tabla que nunca pasa de la mitad de ocupacion.
+    """
+
+    def __init__(self, path):
+        """
+        Recibe: ruta de un archivo de build_opening_book
+        Excepción: ValueError si el archivo no es un libro valido
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("libro de aperturas invalido")
+        magic, version, buckets, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION or len(data) != _HEADER.size + buckets * _ENTRY.size:
+            raise ValueError("libro de aperturas invalido")
+        self.__data__ = data
+        self.__mask__ = buckets - 1
+        self.__count__ = count
+
+    def __len__(self):
+        return self.__count__
+
+    def probe(self, board, color, dice):
+        """
+        Recibe: board, color que mueve y la tirada
+        Devuelve: (equity, secuencia) del libro, o None si no esta
+        """
+        key = book_key(board, color, dice)
+        slot = key & self.__mask__
+        while True:
+            stored, equity, used, *flat = _ENTRY.unpack_from(
+                self.__data__, _HEADER.size + slot * _ENTRY.size)
+            if not used:
+                return None
+            if stored == key:
+                return equity, _unpack_sequence(flat)
+            slot = (slot + 1) & self.__mask__
+
+    def lookup(self, board, color, dice):
+        """Secuencia del libro o None."""
+        entry = self.probe(board, color, dice)
+        return None if entry is None else entry[1]
+
+
+class BookPolicy:
+    """Politica que juega del libro y, si la posicion no esta, delega en fallback."""
+
+    def __init__(self, book, fallback=greedy_policy):
+        self.__book__ = book
+        self.__fallback__ = fallback
+
+    def __call__(self, board, color, dice, rng):
+        seq = self.__book__.lookup(board, color, dice)
+        if seq is not None:
+            return seq
+        return self.__fallback__(board, color, dice, rng)
+
+
+def main(argv=None):
+    """Punto de entrada: python -m core.OpeningBook aperturas.book --trials 100"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Arma el libro de aperturas por autojuego")
+    parser.add_argument("path")
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--candidates", type=int, default=4)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    count = build_opening_book(args.path, args.trials, args.candidates, args.processes, args.seed)
+    print(f"{count} entradas escritas en {args.path}")
+
+
+if __name__ == "__main__":
+    main()
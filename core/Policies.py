@@ -0,0 +1,55 @@
+from .SearchEngine import SearchEngine, heuristic_eval
+
+# Una politica es cualquier callable (board, color, dice, rng) -> secuencia,
+# donde la secuencia es una de board.legal_sequences(color, dice) o () si no
+# hay movimientos. Las funciones de modulo se pueden pasar a otro proceso.
+
+
+def random_policy(board, color, dice, rng):
+    """Elige una secuencia legal al azar con rng."""
+    seqs = board.legal_sequences(color, dice)
+    return rng.choice(seqs) if seqs else ()
+
+
+def greedy_policy(board, color, dice, rng):
+    """
+    Elige la secuencia con mejor evaluacion estatica a un turno.
+
+    Recibe: board, color que mueve, dados y rng (desempata igualdades)
+    Hace: Aplica cada secuencia, la evalua con heuristic_eval y la deshace
+    Devuelve: la mejor secuencia, o () si no hay movimientos
+    """
+    best, best_value = [], None
+    for seq in board.legal_sequences(color, dice):
+        tokens = [board.apply((origin, die, color), validate=False) for origin, die in seq]
+        value = heuristic_eval(board, color)
+        for token in reversed(tokens):
+            board.undo(token)
+        if best_value is None or value > best_value:
+            best, best_value = [seq], value
+        elif value == best_value:
+            best.append(seq)
+    return rng.choice(best) if best else ()
+
+
+class SearchPolicy:
+    """Politica que juega la mejor secuencia de SearchEngine.best_move."""
+
+    def __init__(self, max_depth=1, max_nodes=None):
+        """
+        Recibe: max_depth en turnos y max_nodes, presupuesto por jugada
+        """
+        self.__max_depth__ = max_depth
+        self.__max_nodes__ = max_nodes
+
+    def __call__(self, board, color, dice, rng):
+        engine = SearchEngine(max_nodes=self.__max_nodes__)
+        return engine.best_move(board, color, dice, self.__max_depth__)[0]
+
+
+# Politicas por nombre, para la linea de comandos y los reportes
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "search": SearchPolicy(),
+}
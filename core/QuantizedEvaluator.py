@@ -0,0 +1,200 @@
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from .Board import Board, NUM_SLOTS
+from .Dice import Dice
+from .FeatureEncoder import FeatureEncoder, TD_FEATURES
+from .NeuralEvaluator import NeuralEvaluator, _sigmoid
+from .Policies import random_policy
+from .Rollout import game_result
+
+# Valor maximo de una entrada TD: (15 - 3) / 2
+INPUT_MAX = 6.0
+
+# Por precision: tipo de los pesos, tipo del acumulador y maximo entero.
+# Los acumuladores son float pero las sumas son enteras y exactas: con 8 bits
+# el maximo (198 * 127 * 127) entra en la mantisa de float32 y con 16 bits en
+# la de float64, asi el producto entero lo resuelve BLAS y no el ciclo de
+# NumPy para enteros, que es varias veces mas lento.
+_PRECISIONS = {
+    8: (np.int8, np.float32, 127),
+    16: (np.int16, np.float64, 32767),
+}
+
+
+class QuantizedEvaluator:
+    """
+    Version entera de NeuralEvaluator.
+
+    Pesos, entradas y activaciones ocultas se guardan como enteros de 8 o 16
+    bits con una escala por capa (cuantizacion simetrica). Los productos de
+    matrices se hacen en enteros y el acumulador se pasa a float con el
+    producto de las escalas; los sesgos quedan en float.
+    """
+
+    def __init__(self, bits, W1, W2, b1, b2, scales):
+        """
+        Recibe: bits (8 o 16), pesos enteros W1 y W2, sesgos float y dict de
+                escalas {"x", "w1", "h", "w2"}
+        Excepción: ValueError si la precision no es 8 ni 16
+        """
+        if bits not in _PRECISIONS:
+            raise ValueError("precision no soportada (8 o 16 bits)")
+        dtype, acc, _ = _PRECISIONS[bits]
+        self.bits = bits
+        self.W1 = np.asarray(W1, dtype=dtype)
+        self.W2 = np.asarray(W2, dtype=dtype)
+        self.b1 = np.asarray(b1, dtype=np.float64)
+        self.b2 = float(b2)
+        self.scales = {key: float(scales[key]) for key in ("x", "w1", "h", "w2")}
+        # Pesos ya convertidos al tipo del acumulador para no hacerlo por lote
+        self.__W1acc__ = self.W1.astype(acc)
+        self.__W2acc__ = self.W2.astype(acc)
+        # Codificador y buffer de un tablero para predict
+        self.__encoder__ = FeatureEncoder(1)
+        self.__features__ = self.__encoder__.allocate(1)
+
+    @classmethod
+    def from_float(cls, net, bits=8, input_max=INPUT_MAX):
+        """
+        Cuantiza un NeuralEvaluator.
+
+        Recibe: net, bits (8 o 16) e input_max, el mayor valor de entrada
+        Hace: Las entradas se cuantizan con escala 1 / pasos, con pasos el
+              mayor entero par que deja input_max por debajo de qmax (20
+              con 8 bits, 5460 con 16): asi 0, 0.5 y 1 quedan exactos
+        Devuelve: QuantizedEvaluator
+        """
+        if bits not in _PRECISIONS:
+            raise ValueError("precision no soportada (8 o 16 bits)")
+        dtype, _, qmax = _PRECISIONS[bits]
+
+        def quantize(weights):
+            scale = float(np.abs(weights).max()) / qmax or 1.0
+            return np.clip(np.rint(weights / scale), -qmax, qmax).astype(dtype), scale
+
+        W1, s_w1 = quantize(net.W1)
+        W2, s_w2 = quantize(net.W2)
+        steps = max(2 * int(qmax // (2 * input_max)), 1)
+        scales = {"x": 1.0 / steps, "w1": s_w1, "h": 1.0 / qmax, "w2": s_w2}
+        return cls(bits, W1, W2, net.b1, net.b2, scales)
+
+    @classmethod
+    def load(cls, path):
+        """Carga un .npz guardado con save()."""
+        with np.load(path) as data:
+            scales = dict(zip(("x", "w1", "h", "w2"), data["scales"]))
+            return cls(int(data["bits"]), data["W1"], data["W2"], data["b1"], data["b2"], scales)
+
+    def save(self, path):
+        """Exporta pesos enteros, sesgos y escalas a un .npz."""
+        s = self.scales
+        np.savez(path, bits=self.bits, W1=self.W1, W2=self.W2, b1=self.b1, b2=self.b2,
+                 scales=np.array([s["x"], s["w1"], s["h"], s["w2"]]))
+
+    def predict_batch(self, features):
+        """
+        Recibe: matriz (N, 198) de entradas TD en float
+        Hace: Cuantiza las entradas, multiplica en enteros y reescala en float
+        Devuelve: arreglo (N,) con la probabilidad de victoria de blancas
+        """
+        _, acc, qmax = _PRECISIONS[self.bits]
+        s = self.scales
+        x = np.clip(np.rint(features / s["x"]), 0, qmax).astype(acc)
+        hidden = _sigmoid((x @ self.__W1acc__) * (s["x"] * s["w1"]) + self.b1)
+        h = np.rint(hidden * qmax).astype(acc)
+        return _sigmoid((h @ self.__W2acc__) * (s["h"] * s["w2"]) + self.b2)
+
+    def predict(self, board, turn):
+        """Probabilidad de victoria de blancas para un tablero."""
+        x = self.__encoder__.encode([board], turn, self.__features__)
+        return float(self.predict_batch(x[:, :TD_FEATURES])[0])
+
+
+def held_out_positions(n, seed=12345):
+    """
+    Posiciones de prueba sacadas de partidas con politica aleatoria.
+
+    Recibe: cantidad de posiciones y semilla (distinta de la de entrenamiento)
+    Devuelve: (celdas (n, NUM_SLOTS) int8, turnos (n,) de 'B'/'N')
+    """
+    rng = random.Random(seed)
+    dice = Dice(seed=seed)
+    cells = np.zeros((n, NUM_SLOTS), dtype=np.int8)
+    turns = np.empty(n, dtype="<U1")
+    k = 0
+    while k < n:
+        board = Board()
+        turn = 'B'
+        while k < n and game_result(board) is None:
+            cells[k] = np.frombuffer(board.cells(), dtype=np.int8)
+            turns[k] = turn
+            k += 1
+            for origin, die in random_policy(board, turn, dice.roll(), rng):
+                board.apply((origin, die, turn), validate=False, record=False)
+            turn = 'N' if turn == 'B' else 'B'
+    return cells, turns
+
+
+def accuracy_report(net, positions=2000, seed=12345, precisions=(8, 16), repeat=5):
+    """
+    Compara el modelo float con sus versiones enteras.
+
+    Recibe: NeuralEvaluator, cantidad de posiciones de prueba, semilla,
+            precisiones a evaluar y repeticiones para medir tiempos
+    Devuelve: dict apto para JSON; por precision: error absoluto maximo y
+              medio, RMSE, acuerdo del lado favorito y posiciones/seg
+    """
+    cells, turns = held_out_positions(positions, seed)
+    encoder = FeatureEncoder(len(cells))
+    x = encoder.encode(cells, turns, encoder.allocate())[:, :TD_FEATURES]
+    x = np.ascontiguousarray(x)
+
+    def timed(model):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            out = model.predict_batch(x)
+        elapsed = time.perf_counter() - started
+        return out, len(x) * repeat / elapsed if elapsed > 0 else 0.0
+
+    reference, float_speed = timed(net)
+    report = {"positions": len(x), "float64": {"positions_per_sec": float_speed}}
+    for bits in precisions:
+        quantized = QuantizedEvaluator.from_float(net, bits)
+        values, speed = timed(quantized)
+        error = np.abs(values - reference)
+        report[f"int{bits}"] = {
+            "max_abs_error": float(error.max()),
+            "mean_abs_error": float(error.mean()),
+            "rmse": float(np.sqrt((error ** 2).mean())),
+            "favorite_agreement": float(((values > 0.5) == (reference > 0.5)).mean()),
+            "positions_per_sec": speed,
+        }
+    return report
+
+
+def main(argv=None):
+    """Punto de entrada: python -m core.QuantizedEvaluator pesos.npz [--bits 8 --out q.npz]"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Cuantiza el evaluador y mide su precision")
+    parser.add_argument("weights")
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--bits", type=int, choices=sorted(_PRECISIONS), default=None)
+    parser.add_argument("--out", default=None, help="exporta los pesos enteros a este .npz")
+    args = parser.parse_args(argv)
+    net = NeuralEvaluator.load(args.weights)
+    if args.out:
+        QuantizedEvaluator.from_float(net, args.bits or 8).save(args.out)
+    precisions = (args.bits,) if args.bits else tuple(sorted(_PRECISIONS))
+    report = accuracy_report(net, args.positions, precisions=precisions)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
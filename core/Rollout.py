@@ -0,0 +1,279 @@
+import math
+import multiprocessing
+import os
+import random
+import time
+from statistics import NormalDist
+
+from .Board import Board, OFF_SLOT, BAR_SLOT
+from .Dice import Dice, StratifiedDice, ROLLS
+from .Policies import random_policy
+from .SearchEngine import pip_count
+
+# Resultados posibles de una partida desde el punto de vista del que mueve
+# en la raiz: victoria simple/gammon/backgammon y lo mismo perdiendo.
+OUTCOMES = (1, 2, 3, -1, -2, -3)
+_OUTCOME_INDEX = {points: k for k, points in enumerate(OUTCOMES)}
+
+# Casa de cada color: una ficha del perdedor aca (o en la barra) es backgammon
+_HOME = {'B': range(18, 24), 'N': range(0, 6)}
+
+
+def game_result(board):
+    """
+    Resultado de una partida terminada.
+
+    Recibe: board
+    Devuelve: (ganador, puntos) con puntos 1, 2 (gammon) o 3 (backgammon),
+              o None si nadie retiro las 15 fichas
+    """
+    cells = board.cells()
+    for winner, loser in (('B', 'N'), ('N', 'B')):
+        if abs(cells[OFF_SLOT[winner]]) != 15:
+            continue
+        if cells[OFF_SLOT[loser]] != 0:
+            return winner, 1
+        sign = 1 if loser == 'B' else -1
+        if cells[BAR_SLOT[loser]] or any(cells[idx] * sign > 0 for idx in _HOME[winner]):
+            return winner, 3
+        return winner, 2
+    return None
+
+
+def _race_value(own, opp):
+    """Valor de carrera barato en (-1, 1) para quien tiene own pips."""
+    return math.tanh((opp - own) / max(own + opp, 1))
+
+
+def pip_luck(board, color, roll):
+    """
+    Suerte de una tirada medida solo con pips.
+
+    Recibe: board antes de mover, color que tiro y la tirada
+    Hace: Cuenta los pips que la tirada puede mover (un dado que no entra en
+          ningun origen no suma; con la regla de retiro exacto un 6 puede
+          valer menos que un 2) y compara el valor de carrera resultante con
+          el promedio sobre las 36 tiradas posibles
+    Devuelve: suerte de color; su esperanza sobre las tiradas es 0
+    """
+    own = pip_count(board, color)
+    opp = pip_count(board, 'N' if color == 'B' else 'B')
+    origins = board.origins(color)
+    usable = [0] + [die if any(board.can_move(o, die, color) for o in origins) else 0
+                    for die in range(1, 7)]
+
+    def value(d1, d2):
+        pips = 4 * usable[d1] if d1 == d2 else usable[d1] + usable[d2]
+        return _race_value(max(own - pips, 0), opp)
+
+    mean = sum(value(d1, d2) for d1, d2 in ROLLS) / 36
+    return value(roll[0], roll[1]) - mean
+
+
+def _play(board, color, policy, rng, dice, luck):
+    """Juega hasta el final; devuelve (puntos de color, suerte acumulada de color)."""
+    turn = color
+    total_luck = 0.0
+    result = game_result(board)
+    while result is None:
+        roll = dice.roll()
+        if luck is not None:
+            delta = luck(board, turn, roll)
+            total_luck += delta if turn == color else -delta
+        for origin, die in policy(board, turn, roll, rng):
+            board.apply((origin, die, turn), validate=False, record=False)
+        turn = 'N' if turn == 'B' else 'B'
+        result = game_result(board)
+    winner, points = result
+    return (points if winner == color else -points), total_luck
+
+
+def play_out(board, color, policy, rng, dice=None):
+    """
+    Juega una posicion hasta el final sin entrada/salida.
+
+    Recibe: board (se modifica), color que tira primero, politica, rng de la
+            politica y dice opcional (por defecto Dice(rng))
+    Devuelve: puntos ganados por color (negativos si pierde)
+    """
+    return _play(board, color, policy, rng, dice or Dice(rng), None)[0]
+
+
+def _run_batch(task):
+    """
+    Trabajo de un proceso: juega un lote de partidas con su propio rng.
+
+    Recibe: (celdas, color, politica, semilla, primera partida, cantidad,
+             estratificar, luck)
+    Devuelve: (conteos alineados con OUTCOMES, [suma suerte, suma suerte^2,
+              suma puntos*suerte], estratos); estratos es None sin
+              estratificar y si no, por primera tirada (trial % 36),
+              [partidas, suma puntos, suma puntos^2]
+    """
+    cells, color, policy, seed, first, trials, stratified, luck = task
+    rng = random.Random(seed)
+    dice = Dice(rng)
+    counts = [0] * len(OUTCOMES)
+    luck_sums = [0.0, 0.0, 0.0]
+    strata = [[0, 0, 0] for _ in ROLLS] if stratified else None
+    for trial in range(first, first + trials):
+        board = Board.from_cells(cells)
+        if stratified:
+            dice = StratifiedDice(trial, rng)
+        points, total_luck = _play(board, color, policy, rng, dice, luck)
+        counts[_OUTCOME_INDEX[points]] += 1
+        luck_sums[0] += total_luck
+        luck_sums[1] += total_luck * total_luck
+        luck_sums[2] += points * total_luck
+        if strata is not None:
+            stratum = strata[trial % len(ROLLS)]
+            stratum[0] += 1
+            stratum[1] += points
+            stratum[2] += points * points
+    return counts, luck_sums, strata
+
+
+def summarize(counts, confidence=0.95, luck_sums=None, strata=None):
+    """
+    Resume los conteos de resultados.
+
+    Recibe: conteos alineados con OUTCOMES, nivel de confianza y, opcionales,
+            las sumas de suerte y los estratos acumulados de _run_batch
+    Hace: Con luck_sums usa la suerte (de media 0) como variable de control:
+          equity = media(puntos) - beta * media(suerte), con beta de la
+          regresion de puntos sobre suerte
+    Devuelve: dict con tasas, equity, error estandar, semiancho del intervalo
+              y dos reducciones de varianza medidas por separado:
+              control_variate_reduction, la de la variable de control (1.0
+              sin ella), y stratification_reduction, la de StratifiedDice
+              (1.0 sin estratos): varianza total de los puntos sobre la
+              varianza dentro de cada estrato de primera tirada, que es la
+              varianza por partida del promedio estratificado. El error
+              estandar no descuenta la estratificacion (es conservador)
+    """
+    n = sum(counts)
+    by_points = dict(zip(OUTCOMES, counts))
+    mean = sum(p * c for p, c in by_points.items()) / n if n else 0.0
+    if n > 1:
+        var = sum(c * (p - mean) ** 2 for p, c in by_points.items()) / (n - 1)
+    else:
+        var = 0.0
+    raw_mean, raw_var = mean, var
+    if luck_sums is not None and n > 1:
+        sum_l, sum_ll, sum_xl = luck_sums
+        mean_l = sum_l / n
+        var_l = (sum_ll - n * mean_l * mean_l) / (n - 1)
+        if var_l > 0:
+            cov = (sum_xl - n * mean * mean_l) / (n - 1)
+            beta = cov / var_l
+            mean -= beta * mean_l
+            var = max(var - cov * beta, 0.0)
+    stratification = 1.0
+    if strata is not None:
+        used = [stratum for stratum in strata if stratum[0]]
+        if n > len(used):
+            within = sum(sq - total * total / m for m, total, sq in used) / (n - len(used))
+            stratification = raw_var / within if within > 0 else 1.0
+    std_error = math.sqrt(var / n) if n else 0.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = (lambda c: c / n) if n else (lambda c: 0.0)
+    return {
+        "trials": n,
+        "win": rate(by_points[1] + by_points[2] + by_points[3]),
+        "win_gammon": rate(by_points[2] + by_points[3]),
+        "win_backgammon": rate(by_points[3]),
+        "lose_gammon": rate(by_points[-2] + by_points[-3]),
+        "lose_backgammon": rate(by_points[-3]),
+        "equity": mean,
+        "std_error": std_error,
+        "confidence": confidence,
+        "half_width": z * std_error,
+        "raw_equity": raw_mean,
+        "raw_std_error": math.sqrt(raw_var / n) if n else 0.0,
+        "control_variate_reduction": raw_var / var if var > 0 else 1.0,
+        "stratification_reduction": stratification,
+    }
+
+
+def rollout(board, color, policy=random_policy, trials=1296, processes=None,
+            seed=0, batch_size=36, confidence=0.95, tolerance=None,
+            stratified=False, luck=None, pool=None):
+    """
+    Estima la equity de una posicion jugandola muchas veces en paralelo.
+
+    Recibe:
+        board, color que tira primero y politica (debe poder enviarse a otro
+        proceso: una funcion de modulo o una instancia de clase de modulo)
+        trials: maximo de partidas
+        processes: procesos del pool (None = todos los nucleos, 1 = sin pool)
+        seed: semilla base; el lote k usa su propio random.Random, asi el
+              resultado no depende de cuantos procesos lo jueguen
+        batch_size: partidas por lote
+        confidence, tolerance: si tolerance no es None se corta cuando el
+              semiancho del intervalo de la equity queda por debajo
+        stratified: usa StratifiedDice (primeras dos tiradas rotadas); el
+              corte por tolerance cae siempre en un multiplo de 36 partidas
+        luck: funcion (board, color, tirada) -> suerte de media 0, por
+              ejemplo pip_luck, usada como variable de control
+        pool: multiprocessing.Pool ya creado para reusar entre rollouts (por
+              ejemplo en build_opening_book); rollout no lo cierra y, si
+              corta antes, los lotes pendientes siguen ocupandolo
+    Hace: Reparte los lotes en un multiprocessing.Pool y acumula en orden
+    Devuelve: dict de summarize mas trials_per_sec, elapsed, processes y
+              stopped_early
+    """
+    processes = processes or os.cpu_count() or 1
+    cells = board.cells().tolist()
+    sizes = [batch_size] * (trials // batch_size)
+    if trials % batch_size:
+        sizes.append(trials % batch_size)
+    tasks = []
+    first = 0
+    for k, size in enumerate(sizes):
+        tasks.append((cells, color, policy, (seed << 32) | k, first, size, stratified, luck))
+        first += size
+
+    counts = [0] * len(OUTCOMES)
+    luck_sums = [0.0, 0.0, 0.0] if luck is not None else None
+    strata = [[0, 0, 0] for _ in ROLLS] if stratified else None
+    stopped_early = False
+    started = time.perf_counter()
+
+    def consume(results):
+        nonlocal stopped_early
+        for batch, batch_luck, batch_strata in results:
+            for k, c in enumerate(batch):
+                counts[k] += c
+            if luck_sums is not None:
+                for k, value in enumerate(batch_luck):
+                    luck_sums[k] += value
+            if strata is not None:
+                for stratum, partial in zip(strata, batch_strata):
+                    for k, value in enumerate(partial):
+                        stratum[k] += value
+            if tolerance is not None and sum(counts) < trials:
+                partial = summarize(counts, confidence, luck_sums, strata)
+                # Con estratos solo se corta en multiplos de 36 (bloques balanceados)
+                balanced = strata is None or partial["trials"] % len(ROLLS) == 0
+                if partial["trials"] >= 2 * batch_size and balanced and partial["half_width"] <= tolerance:
+                    stopped_early = True
+                    return
+
+    if pool is not None:
+        consume(pool.imap(_run_batch, tasks))
+    elif processes == 1:
+        consume(map(_run_batch, tasks))
+    else:
+        # Salir del with termina el pool, incluido lo pendiente si se corto antes
+        with multiprocessing.Pool(processes) as pool:
+            consume(pool.imap(_run_batch, tasks))
+
+    elapsed = time.perf_counter() - started
+    report = summarize(counts, confidence, luck_sums, strata)
+    report.update({
+        "elapsed": elapsed,
+        "trials_per_sec": report["trials"] / elapsed if elapsed > 0 else 0.0,
+        "processes": processes,
+        "stopped_early": stopped_early,
+    })
+    return report
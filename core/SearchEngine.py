@@ -0,0 +1,318 @@
+import math
+import time
+
+from .Board import BAR_SLOT, OFF_SLOT
+from .TranspositionTable import EXACT, LOWER, UPPER, make_key
+
+# Las 21 tiradas distintas con su probabilidad (dobles 1/36, el resto 2/36).
+# Se listan primero las no dobles, que suman mas probabilidad.
+DICE_OUTCOMES = (
+    [((d1, d2), 2 / 36) for d1 in range(6, 0, -1) for d2 in range(d1 - 1, 0, -1)]
+    + [((d, d, d, d), 1 / 36) for d in range(6, 0, -1)]
+)
+
+# Cotas de la evaluacion: las necesita la poda Star1/Star2
+VALUE_MIN = -1.0
+VALUE_MAX = 1.0
+
+
+def pip_count(board, color):
+    """Pips que le faltan a un color para retirar todas sus fichas."""
+    cells = board.cells()
+    if color == 'B':
+        pips = sum((24 - idx) * cells[idx] for idx in range(24) if cells[idx] > 0)
+        return pips + 25 * cells[BAR_SLOT['B']]
+    pips = sum((idx + 1) * -cells[idx] for idx in range(24) if cells[idx] < 0)
+    return pips - 25 * cells[BAR_SLOT['N']]
+
+
+def heuristic_eval(board, color):
+    """
+    Evaluacion estatica simple desde el punto de vista de color.
+
+    Recibe: board y el color que mueve
+    Hace: Combina la diferencia de pips y la cantidad de fichas sueltas
+    Devuelve: valor en (-1, 1); las victorias se tratan aparte
+    """
+    cells = board.cells()
+    opponent = 'N' if color == 'B' else 'B'
+    sign = 1 if color == 'B' else -1
+    my_blots = sum(1 for idx in range(24) if cells[idx] * sign == 1)
+    opp_blots = sum(1 for idx in range(24) if cells[idx] * sign == -1)
+    score = (pip_count(board, opponent) - pip_count(board, color)) / 30
+    score -= 0.1 * (my_blots - opp_blots)
+    return 0.99 * math.tanh(score)
+
+
+class _BudgetExceeded(Exception):
+    """Se agoto el presupuesto de nodos o de tiempo."""
+
+
+class SearchEngine:
+    """
+    Busqueda expectiminimax sobre Board con poda Star1/Star2.
+
+    Cada nivel de profundidad es un turno completo: un nodo de azar con las
+    21 tiradas distintas y, por debajo, un nodo max con las secuencias
+    legales de Board.legal_sequences. Los valores son siempre desde el punto
+    de vista del color que mueve (formulacion negamax) y estan acotados en
+    [VALUE_MIN, VALUE_MAX].
+    """
+
+    def __init__(self, evaluate=None, max_nodes=None, max_time=None, table=None):
+        """
+        Recibe:
+            evaluate: funcion (board, color) -> valor en (-1, 1); por defecto heuristic_eval
+            max_nodes: presupuesto de nodos por busqueda (None = sin limite)
+            max_time: presupuesto de tiempo en segundos (None = sin limite)
+            table: TranspositionTable opcional, compartible entre busquedas
+        """
+        self.__evaluate__ = evaluate or heuristic_eval
+        self.__table__ = table
+        self.__max_nodes__ = max_nodes
+        self.__max_time__ = max_time
+        self.__nodes__ = 0
+        self.__deadline__ = None
+        self.__stats__ = {"nodes": 0, "elapsed": 0.0, "nodes_per_sec": 0.0, "depth": 0}
+
+    def stats(self):
+        """Estadisticas de la ultima busqueda: nodos, tiempo, nodos/seg y profundidad."""
+        return dict(self.__stats__)
+
+    # =========================
+    # Presupuesto
+    # =========================
+    def _count_node(self):
+        self.__nodes__ += 1
+        if self.__max_nodes__ is not None and self.__nodes__ > self.__max_nodes__:
+            raise _BudgetExceeded()
+        if self.__deadline__ is not None and self.__nodes__ % 256 == 0:
+            if time.perf_counter() > self.__deadline__:
+                raise _BudgetExceeded()
+
+    def _start(self):
+        self.__nodes__ = 0
+        self.__started__ = time.perf_counter()
+        self.__deadline__ = None
+        if self.__max_time__ is not None:
+            self.__deadline__ = self.__started__ + self.__max_time__
+
+    def _finish(self, depth):
+        elapsed = time.perf_counter() - self.__started__
+        self.__stats__ = {
+            "nodes": self.__nodes__,
+            "elapsed": elapsed,
+            "nodes_per_sec": self.__nodes__ / elapsed if elapsed > 0 else 0.0,
+            "depth": depth,
+        }
+
+    # =========================
+    # Nodos
+    # =========================
+    @staticmethod
+    def _winner_value(board, color):
+        """+1/-1 si la partida termino, None si no."""
+        cells = board.cells()
+        if abs(cells[OFF_SLOT[color]]) == 15:
+            return VALUE_MAX
+        opponent = 'N' if color == 'B' else 'B'
+        if abs(cells[OFF_SLOT[opponent]]) == 15:
+            return VALUE_MIN
+        return None
+
+    def _ordered_children(self, board, color, dice):
+        """Secuencias legales ordenadas por evaluacion estatica (mejor primero)."""
+        scored = []
+        for seq in board.legal_sequences(color, dice):
+            tokens = [board.apply((origin, die, color), validate=False) for origin, die in seq]
+            scored.append((self.__evaluate__(board, color), seq))
+            for token in reversed(tokens):
+                board.undo(token)
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [seq for _, seq in scored]
+
+    # =========================
+    # Tabla de transposicion
+    # =========================
+    def _lookup(self, key, depth, alpha, beta):
+        """
+        Consulta la tabla. Devuelve (valor, alpha, beta): valor no es None si
+        la entrada alcanza para cortar; si no, la ventana puede achicarse.
+        """
+        entry = self.__table__.probe(key)
+        if entry is not None:
+            value, stored_depth, bound = entry
+            if stored_depth >= depth:
+                if bound == EXACT:
+                    return value, alpha, beta
+                if bound == LOWER and value > alpha:
+                    alpha = value
+                elif bound == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value, alpha, beta
+        return None, alpha, beta
+
+    def _save(self, key, value, depth, alpha, beta):
+        if value <= alpha:
+            bound = UPPER
+        elif value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.__table__.store(key, value, depth, bound)
+
+    def _max_node(self, board, color, dice, depth, alpha, beta, probe=False):
+        """
+        Nodo max: color elige la secuencia para la tirada dice.
+        Con probe=True solo evalua el primer hijo (cota inferior para Star2).
+        """
+        if self.__table__ is None or probe:
+            return self._max_search(board, color, dice, depth, alpha, beta, probe)
+        key = make_key(board.zobrist_hash(color), dice)
+        value, low, high = self._lookup(key, depth, alpha, beta)
+        if value is not None:
+            return value
+        value = self._max_search(board, color, dice, depth, low, high, probe)
+        self._save(key, value, depth, low, high)
+        return value
+
+    def _max_search(self, board, color, dice, depth, alpha, beta, probe):
+        self._count_node()
+        opponent = 'N' if color == 'B' else 'B'
+        children = self._ordered_children(board, color, dice)
+        if not children:
+            return -self._chance_node(board, opponent, depth - 1, -beta, -alpha)
+        if probe:
+            children = children[:1]
+
+        best = VALUE_MIN
+        for seq in children:
+            tokens = [board.apply((origin, die, color), validate=False) for origin, die in seq]
+            value = -self._chance_node(board, opponent, depth - 1, -beta, -alpha)
+            for token in reversed(tokens):
+                board.undo(token)
+            if value > best:
+                best = value
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+        return best
+
+    def _chance_node(self, board, color, depth, alpha, beta):
+        """Nodo de azar: color va a tirar. Aplica Star2 (sondeo) y luego Star1."""
+        result = self._winner_value(board, color)
+        if result is not None:
+            self._count_node()
+            return result
+        if depth <= 0:
+            self._count_node()
+            return self.__evaluate__(board, color)
+        if self.__table__ is None:
+            return self._chance_search(board, color, depth, alpha, beta)
+        key = make_key(board.zobrist_hash(color))
+        value, low, high = self._lookup(key, depth, alpha, beta)
+        if value is not None:
+            return value
+        value = self._chance_search(board, color, depth, low, high)
+        self._save(key, value, depth, low, high)
+        return value
+
+    def _chance_search(self, board, color, depth, alpha, beta):
+        self._count_node()
+
+        # Star2: sondear cada tirada con su primer hijo da cotas inferiores
+        lower = []
+        if beta < VALUE_MAX:
+            remaining = 1.0
+            acc = 0.0
+            for dice, prob in DICE_OUTCOMES:
+                remaining -= prob
+                bound = self._max_node(board, color, dice, depth, VALUE_MIN, VALUE_MAX, probe=True)
+                lower.append(bound)
+                acc += prob * bound
+                if acc + remaining * VALUE_MIN >= beta:
+                    return acc + remaining * VALUE_MIN
+
+        # Star1: ventana de cada hijo a partir de lo ya acumulado
+        remaining = 1.0
+        acc = 0.0
+        for k, (dice, prob) in enumerate(DICE_OUTCOMES):
+            remaining -= prob
+            child_lo = lower[k] if lower else VALUE_MIN
+            low = max((alpha - acc - remaining * VALUE_MAX) / prob, VALUE_MIN)
+            high = min((beta - acc - remaining * VALUE_MIN) / prob, VALUE_MAX)
+            value = max(self._max_node(board, color, dice, depth, max(low, child_lo), high), child_lo)
+            acc += prob * value
+            if acc + remaining * VALUE_MIN >= beta:
+                return acc + remaining * VALUE_MIN
+            if acc + remaining * VALUE_MAX <= alpha:
+                return acc + remaining * VALUE_MAX
+        return acc
+
+    # =========================
+    # API
+    # =========================
+    def evaluate(self, board, color, depth=1):
+        """
+        Valor esperado de la posicion antes de que color tire los dados.
+
+        Recibe: board, color que tira y profundidad en turnos
+        Devuelve: valor en [-1, 1], o None si se agoto el presupuesto
+        """
+        self._start()
+        work = board.copy()
+        try:
+            value = self._chance_node(work, color, depth, VALUE_MIN, VALUE_MAX)
+        except _BudgetExceeded:
+            value = None
+        self._finish(depth if value is not None else 0)
+        return value
+
+    def best_move(self, board, color, dice, max_depth=2):
+        """
+        Mejor secuencia para una tirada con profundizacion iterativa.
+
+        Recibe: board, color que mueve, dados y profundidad maxima en turnos
+        Hace: Busca a profundidad 1, 2, ... hasta max_depth o hasta agotar el
+              presupuesto; se queda con la ultima iteracion completa
+        Devuelve: (secuencia, valor); secuencia es () si no hay movimientos
+        """
+        self._start()
+        work = board.copy()
+        opponent = 'N' if color == 'B' else 'B'
+        children = self._ordered_children(work, color, list(dice))
+        if not children:
+            self._finish(0)
+            return (), None
+
+        best_seq, best_value, completed = children[0], None, 0
+        try:
+            for depth in range(1, max_depth + 1):
+                alpha = VALUE_MIN
+                iteration_best = None
+                for seq in children:
+                    # Si se agota el presupuesto se descarta work, no hace falta deshacer
+                    tokens = [work.apply((o, d, color), validate=False) for o, d in seq]
+                    value = -self._chance_node(work, opponent, depth - 1, VALUE_MIN, -alpha)
+                    for token in reversed(tokens):
+                        work.undo(token)
+                    if iteration_best is None or value > alpha:
+                        alpha = value
+                        iteration_best = seq
+                        if completed == 0:
+                            # Aun sin una iteracion completa, guardar lo mejor visto
+                            best_seq, best_value = seq, value
+                best_seq, best_value, completed = iteration_best, alpha, depth
+                # Ordenar la raiz dejando primero la mejor de esta iteracion
+                children.remove(iteration_best)
+                children.insert(0, iteration_best)
+        except _BudgetExceeded:
+            pass
+        self._finish(completed)
+        return best_seq, best_value
+
+    def best_move_for(self, game, max_depth=2):
+        """Mejor secuencia para el turno en curso de un BackgammonGame."""
+        return self.best_move(game.board(), game.turno(), game.available_dice(), max_depth)
@@ -0,0 +1,142 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from .BackgammonGame import BackgammonGame
+from .Dice import Dice
+from .OpeningBook import BookPolicy, OpeningBook
+from .Policies import POLICIES, SearchPolicy
+
+# Fases cronometradas de cada turno ("roll" incluye armar el plan de movimientos)
+PHASES = ("roll", "decide", "move", "end_turn")
+
+
+def game_seed(seed, index):
+    """Semilla de la partida index de una corrida con semilla seed."""
+    return (seed << 32) | index
+
+
+def play_game(white, black, rng, timings=None, dice=None):
+    """
+    Juega una partida completa de BackgammonGame sin entrada/salida.
+
+    Recibe: politicas de blancas y negras, rng de las politicas, timings
+            opcional (dict fase -> segundos acumulados) y dice opcional
+    Devuelve: (ganador, movimientos, turnos)
+    Excepción: ValueError si una politica devuelve un movimiento que el plan
+               del turno rechaza
+    """
+    game = BackgammonGame(verbose=False, dice=dice)
+    policies = {"B": white, "N": black}
+    clock = time.perf_counter
+    timings = timings if timings is not None else dict.fromkeys(PHASES, 0.0)
+    moves = turns = 0
+    while not game.is_game_over():
+        t0 = clock()
+        game.roll()
+        t1 = clock()
+        color = game.turno()
+        seq = policies[color](game.board(), color, game.available_dice(), rng)
+        t2 = clock()
+        for origin, die in seq:
+            if not game.move(origin, die):
+                name = getattr(policies[color], "__name__", repr(policies[color]))
+                raise ValueError(f"la politica {name} ({color}) jugo un movimiento "
+                                 f"ilegal: ({origin}, {die}) en la secuencia {seq}")
+        t3 = clock()
+        # move() ya cierra el turno al gastar todos los dados
+        if game.turno() == color and not game.is_game_over():
+            game.end_turn()
+        t4 = clock()
+        timings["roll"] += t1 - t0
+        timings["decide"] += t2 - t1
+        timings["move"] += t3 - t2
+        timings["end_turn"] += t4 - t3
+        moves += len(seq)
+        turns += 1
+    return game.winner(), moves, turns
+
+
+def simulate(games, white="random", black="random", seed=0):
+    """
+    Juega N partidas entre dos politicas y mide el rendimiento.
+
+    Recibe: cantidad de partidas, nombres de politicas (claves de POLICIES)
+            o callables, y semilla de la corrida
+    Hace: Juega todas las partidas sin entrada/salida dentro del ciclo. La
+          partida k usa s = game_seed(seed, k) para Dice(seed=s) y para el
+          random.Random(s) de las politicas, asi se reproduce sola con
+          play_game(white, black, random.Random(s), dice=Dice(seed=s))
+    Devuelve: dict apto para JSON con victorias, games/sec, moves/sec y
+              segundos por fase
+    Excepción: ValueError si una politica no existe
+    """
+    chosen = []
+    for policy in (white, black):
+        if callable(policy):
+            chosen.append(policy)
+        elif policy in POLICIES:
+            chosen.append(POLICIES[policy])
+        else:
+            raise ValueError(f"politica desconocida: {policy}")
+    timings = dict.fromkeys(PHASES, 0.0)
+    wins = {"B": 0, "N": 0}
+    moves = turns = 0
+
+    started = time.perf_counter()
+    for k in range(games):
+        s = game_seed(seed, k)
+        winner, game_moves, game_turns = play_game(
+            chosen[0], chosen[1], random.Random(s), timings, Dice(seed=s))
+        wins[winner] += 1
+        moves += game_moves
+        turns += game_turns
+    elapsed = time.perf_counter() - started
+
+    per_sec = (lambda n: n / elapsed) if elapsed > 0 else (lambda n: 0.0)
+    return {
+        "games": games,
+        "white": white if isinstance(white, str) else getattr(white, "__name__", repr(white)),
+        "black": black if isinstance(black, str) else getattr(black, "__name__", repr(black)),
+        "seed": seed,
+        "wins": wins,
+        "moves": moves,
+        "turns": turns,
+        "elapsed": elapsed,
+        "games_per_sec": per_sec(games),
+        "moves_per_sec": per_sec(moves),
+        "phases": timings,
+    }
+
+
+def main(argv=None):
+    """Punto de entrada: python -m core.Simulation --games 100 --white greedy"""
+    parser = argparse.ArgumentParser(description="Partidas automaticas sin interfaz")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--white", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--black", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--search-depth", type=int, default=1)
+    parser.add_argument("--book", default=None, help="libro de aperturas para ambos jugadores")
+    args = parser.parse_args(argv)
+
+    white, black = args.white, args.black
+    if args.search_depth != 1:
+        search = SearchPolicy(max_depth=args.search_depth)
+        white = search if white == "search" else white
+        black = search if black == "search" else black
+    if args.book:
+        book = OpeningBook(args.book)
+        white = BookPolicy(book, POLICIES.get(white, white))
+        black = BookPolicy(book, POLICIES.get(black, black))
+    report = simulate(args.games, white, black, args.seed)
+    report["white"], report["black"] = args.white, args.black
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import random
+from array import array
+
+# Tipos de cota guardados en cada entrada
+EXACT = 0
+LOWER = 1   # El valor real es >= al guardado
+UPPER = 2   # El valor real es <= al guardado
+
+_EMPTY = -1  # Profundidad que marca una entrada libre
+_ENTRY_BYTES = 8 + 8 + 1 + 1  # clave + valor + profundidad + tipo de cota
+_SLOTS = 2  # Por cubeta: [0] prefiere profundidad, [1] reemplaza siempre
+
+# Claves para mezclar la tirada con el hash de la posicion: una por
+# (posicion dentro de la tirada ordenada, valor del dado)
+_DICE_RNG = random.Random(0xD1CE_7AB1E)
+_DICE_KEYS = [[0] + [_DICE_RNG.getrandbits(64) for _ in range(6)] for _ in range(4)]
+
+
+def make_key(position_hash, dice=None):
+    """
+    Clave de la tabla: hash de la posicion (con quien mueve) + contexto de dados.
+
+    Recibe: position_hash de 64 bits y dice opcional (None para nodos de azar)
+    Devuelve: entero de 64 bits
+    """
+    key = position_hash
+    if dice:
+        for k, die in enumerate(sorted(dice)):
+            key ^= _DICE_KEYS[k][die]
+    return key
+
+
+class TranspositionTable:
+    """
+    Tabla de transposicion de tamaño fijo sobre arreglos preasignados.
+
+    Cada cubeta tiene dos entradas: la primera solo se reemplaza por una
+    busqueda de igual o mayor profundidad, la segunda se reemplaza siempre.
+    Guarda valor, profundidad y tipo de cota (EXACT, LOWER, UPPER).
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        """
+        Recibe: max_bytes, tope de memoria para las entradas
+        Hace: Reserva la mayor cantidad de cubetas (potencia de 2) que entra en el tope
+        Devuelve: Nada
+        Excepción: ValueError si el tope no alcanza para una cubeta
+        """
+        buckets = max_bytes // (_ENTRY_BYTES * _SLOTS)
+        if buckets < 1:
+            raise ValueError("max_bytes no alcanza para una cubeta")
+        self.__buckets__ = 1 << (buckets.bit_length() - 1)
+        self.__mask__ = self.__buckets__ - 1
+        size = self.__buckets__ * _SLOTS
+        self.__keys__ = array("Q", bytes(8 * size))
+        self.__values__ = array("d", bytes(8 * size))
+        self.__depths__ = array("b", [_EMPTY]) * size
+        self.__bounds__ = array("b", bytes(size))
+        self.__hits__ = 0
+        self.__misses__ = 0
+        self.__stores__ = 0
+        self.__overwrites__ = 0
+
+    def capacity(self):
+        """Cantidad total de entradas."""
+        return self.__buckets__ * _SLOTS
+
+    def memory_bytes(self):
+        """Memoria ocupada por los arreglos de entradas."""
+        return self.capacity() * _ENTRY_BYTES
+
+    def clear(self):
+        """Vacia la tabla y reinicia los contadores."""
+        size = self.capacity()
+        self.__depths__ = array("b", [_EMPTY]) * size
+        self.__hits__ = self.__misses__ = self.__stores__ = self.__overwrites__ = 0
+
+    def probe(self, key):
+        """
+        Busca una entrada.
+
+        Recibe: key de make_key
+        Devuelve: (valor, profundidad, cota) o None si no esta
+        """
+        base = (key & self.__mask__) * _SLOTS
+        for i in (base, base + 1):
+            if self.__depths__[i] != _EMPTY and self.__keys__[i] == key:
+                self.__hits__ += 1
+                return self.__values__[i], self.__depths__[i], self.__bounds__[i]
+        self.__misses__ += 1
+        return None
+
+    def store(self, key, value, depth, bound):
+        """
+        Guarda una entrada con la politica de dos niveles.
+
+        Recibe: key, valor, profundidad buscada y tipo de cota
+        Hace: Usa la entrada de profundidad si la clave ya esta ahi o si la
+              nueva busqueda es al menos igual de profunda; si no, la de
+              reemplazo siempre
+        Devuelve: Nada
+        """
+        base = (key & self.__mask__) * _SLOTS
+        depths = self.__depths__
+        keys = self.__keys__
+        if depths[base] == _EMPTY or keys[base] == key or depth >= depths[base]:
+            i = base
+        else:
+            i = base + 1
+        if depths[i] != _EMPTY and keys[i] != key:
+            self.__overwrites__ += 1
+        keys[i] = key
+        self.__values__[i] = value
+        depths[i] = depth
+        self.__bounds__[i] = bound
+        self.__stores__ += 1
+
+    def stats(self):
+        """Contadores de aciertos, fallos, escrituras y reemplazos."""
+        return {
+            "hits": self.__hits__,
+            "misses": self.__misses__,
+            "stores": self.__stores__,
+            "overwrites": self.__overwrites__,
+        }
@@ -4,8 +4,10 @@ Layout estandar de backgammon
 """
 
 import pygame
+from pygame import gfxdraw
 import sys
 from core.BackgammonGame import BackgammonGame
+from pygame_ui.TextCache import TextCache
 
 # Constantes de colores
 BEIGE = (245, 222, 179)
@@ -36,22 +38,51 @@ BAR_X = TABLERO_X + 6 * ANCHO_PUNTO + ANCHO_PUNTO // 2
 OFF_X = TABLERO_X + ANCHO_TABLERO + 10  # DERECHA: despues del tablero
 OFF_WIDTH = ANCHO_PUNTO - 20
 
+# Fichas retiradas: "tiritas" horizontales apiladas
+SEG_ANCHO = OFF_WIDTH - 10     # ancho de la tirita
+SEG_ALTO = 6                   # alto de la tirita
+SEG_GAP = 4                    # espacio entre tiritas
+
+# Regiones de la pantalla que se redibujan por separado (dirty rects)
+Y_DADOS = TABLERO_Y + ALTO_TABLERO + 50
+Y_PIE = TABLERO_Y + ALTO_TABLERO + 120
+RECT_ENCABEZADO = pygame.Rect(0, 0, ANCHO_VENTANA, TABLERO_Y)
+RECT_TABLERO = pygame.Rect(0, TABLERO_Y, ANCHO_VENTANA, Y_DADOS - TABLERO_Y)
+RECT_DADOS = pygame.Rect(0, Y_DADOS, ANCHO_VENTANA, Y_PIE - Y_DADOS)
+RECT_PIE = pygame.Rect(0, Y_PIE, ANCHO_VENTANA, ALTO_VENTANA - Y_PIE)
+RECT_AVISO = pygame.Rect(20, ALTO_VENTANA // 2 - 60, ANCHO_VENTANA - 40, 120)
+RECT_ERROR = pygame.Rect(20, ALTO_VENTANA // 2 - 75, ANCHO_VENTANA - 40, 150)
+DURACION_ERROR = 10000  # ms que permanece visible el cartel de error
 
 
 class BackgammonUI:
-    def __init__(self, nombre1="Blancas", nombre2="Negras"):
+    def __init__(self, nombre1="Blancas", nombre2="Negras", modo_ocioso=True):
+        """
+        Recibe: nombres de los jugadores y modo_ocioso; si es True el bucle
+                duerme en pygame.event.wait hasta la proxima entrada o el
+                proximo vencimiento de un cartel, si es False sondea a 60 FPS
+        """
         pygame.init()
         self.game = BackgammonGame(nombre1, nombre2)
         self.screen = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
         pygame.display.set_caption("Backgammon")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
+        self.textos = TextCache()  # Fuentes creadas una vez + cache de textos renderizados
+        self.font = self.textos.font(36)
         self.info_message = None
         self.info_time = 0
         self.info_duration = 2000  # ms que permanece visible (2s)
         self.pending_end_turn = False  # si True, al expirar el mensaje, se pasa el turno
         self.punto_seleccionado = None
         self.dado_seleccionado = None
+        self.error_message = None
+        self.error_time = 0
+        self.fondo = self.crear_fondo()  # Tablero estatico, se dibuja una sola vez
+        self.sprites = self.crear_sprites()  # Fichas y resaltado pre-renderizados
+        self.construir_indice()  # Hit-testing O(1) para clicks y hover
+        self.hover = None  # Objetivo bajo el mouse (ver objetivo_hover)
+        self.estado_previo = None  # Estado de cada region en el ultimo cuadro dibujado
+        self.modo_ocioso = modo_ocioso
 
     def punto_a_coords(self, idx):
         """
@@ -91,80 +122,118 @@ class BackgammonUI:
             
         return x, y
 
+    def construir_indice(self):
+        """
+        Precalcula el indice de hit-testing (al iniciar y al cambiar el tamaño).
+
+        Hace: La geometria de puntos, barra y retirada es separable en x e y:
+              guarda por columna de pixeles el punto de arriba y el de abajo
+              (segun punto_a_coords, la misma geometria con la que se dibujan
+              los triangulos) y por fila de pixeles la banda de triangulos
+              (arriba, abajo o ninguna), mas los rects de los dados para 2 y
+              4 dados. Asi cada consulta es O(1)
+        """
+        columnas = range(ANCHO_VENTANA + 1)
+        self.indice_x = {
+            "arriba": [None] * len(columnas),
+            "abajo": [None] * len(columnas),
+            "bar": [BAR_X - ANCHO_PUNTO // 2 <= x <= BAR_X + ANCHO_PUNTO // 2 for x in columnas],
+            "off": [OFF_X <= x <= OFF_X + OFF_WIDTH for x in columnas],
+        }
+        for idx in range(24):
+            x_centro, _ = self.punto_a_coords(idx)
+            banda = self.indice_x["arriba" if idx >= 12 else "abajo"]
+            for x in range(max(0, x_centro - ANCHO_PUNTO // 2),
+                           min(ANCHO_VENTANA, x_centro + ANCHO_PUNTO // 2 - 1) + 1):
+                banda[x] = idx
+
+        # Por fila: (banda de triangulos o None, dentro del alto del tablero)
+        self.indice_y = []
+        for y in range(ALTO_VENTANA + 1):
+            y_rel = y - TABLERO_Y
+            banda = None
+            if 0 <= y_rel <= ALTO_PUNTO:
+                banda = "arriba"
+            elif ALTO_TABLERO - ALTO_PUNTO <= y_rel <= ALTO_TABLERO:
+                banda = "abajo"
+            self.indice_y.append((banda, 0 <= y_rel <= ALTO_TABLERO))
+        self.rects_dados = {n: self._rects_dados(n) for n in (2, 4)}
+
+    def _rects_dados(self, n):
+        """Rects de n dados en fila debajo del tablero (incluyen el borde derecho e inferior)."""
+        dado_size = 50
+        espacio_entre_dados = 15
+        total_width = n * dado_size + (n - 1) * espacio_entre_dados
+        x_base = ANCHO_VENTANA // 2 - total_width // 2
+        y_base = TABLERO_Y + ALTO_TABLERO + 50
+        return [pygame.Rect(x_base + i * (dado_size + espacio_entre_dados), y_base,
+                            dado_size + 1, dado_size + 1) for i in range(n)]
+
+    def _en_ventana(self, x, y):
+        return 0 <= x <= ANCHO_VENTANA and 0 <= y <= ALTO_VENTANA
+
     def coords_a_punto(self, x, y):
         """Mapea coordenadas de click al i­ndice de un punto."""
-        x_rel = x - TABLERO_X
-        y_rel = y - TABLERO_Y
-
-        if not (0 <= y_rel <= ALTO_TABLERO):
+        if not self._en_ventana(x, y):
             return None
-
-        # Determinar si estÃ¡ arriba o abajo
-        if y_rel < ALTO_TABLERO // 2:  # ARRIBA
-            if x_rel < 6 * ANCHO_PUNTO:  # IZQUIERDA (13-18)
-                col = x_rel // ANCHO_PUNTO
-                idx = 12 + col
-            elif x_rel > 6 * ANCHO_PUNTO + ANCHO_PUNTO:  # DERECHA (19-24)
-                col = (x_rel - ANCHO_PUNTO * 7) // ANCHO_PUNTO
-                idx = 18 + col
-            else:
-                return None  # Barra
-                
-        else:  # ABAJO
-            if x_rel < 6 * ANCHO_PUNTO:  # IZQUIERDA (12-7)
-                col = x_rel // ANCHO_PUNTO
-                idx = 11 - col
-            elif x_rel > 6 * ANCHO_PUNTO + ANCHO_PUNTO:  # DERECHA (6-1)
-                col = (x_rel - ANCHO_PUNTO * 7) // ANCHO_PUNTO
-                idx = 5 - col
-            else:
-                return None  # Barra
-                
-        # Verificar que el click esta dentro del triangulo
-        if (0 <= y_rel <= ALTO_PUNTO or ALTO_TABLERO - ALTO_PUNTO <= y_rel <= ALTO_TABLERO):
-            return idx
-        return None
+        banda = self.indice_y[y][0]
+        return None if banda is None else self.indice_x[banda][x]
     
     def es_area_bar(self, x, y):
         """Verifica si el click esta en el area de la barra."""
-        return BAR_X - ANCHO_PUNTO // 2 <= x <= BAR_X + ANCHO_PUNTO // 2 and \
-               TABLERO_Y <= y <= TABLERO_Y + ALTO_TABLERO
+        return self._en_ventana(x, y) and self.indice_x["bar"][x] and self.indice_y[y][1]
 
     def es_area_off(self, x, y):
         """Verifica si el click esta en el area de retirada (Off)."""
-        return OFF_X <= x <= OFF_X + OFF_WIDTH and \
-               TABLERO_Y <= y <= TABLERO_Y + ALTO_TABLERO
+        return self._en_ventana(x, y) and self.indice_x["off"][x] and self.indice_y[y][1]
 
     def get_dado_at_pos(self, x, y):
         """Retorna el valor del dado en la posicion del click, o None."""
         dice = self.game.dice()
-        disponibles = self.game.available_dice()
-        
         if not dice:
             return None
-            
-        dado_size = 50
-        espacio_entre_dados = 15
-        total_width = len(dice) * dado_size + (len(dice) - 1) * espacio_entre_dados
-        x_base = ANCHO_VENTANA // 2 - total_width // 2
-        y_base = TABLERO_Y + ALTO_TABLERO + 50
-        
-        for i, die_val in enumerate(dice):
-            dado_x = x_base + i * (dado_size + espacio_entre_dados)
-            dado_y = y_base
-            
-            if dado_x <= x <= dado_x + dado_size and dado_y <= y <= dado_y + dado_size:
-                if die_val in disponibles:
-                    return die_val
-                    
+        rects = self.rects_dados.get(len(dice)) or self._rects_dados(len(dice))
+        for rect, die_val in zip(rects, dice):
+            if rect.collidepoint(x, y):
+                return die_val if die_val in self.game.available_dice() else None
         return None
 
-    def dibujar_tablero(self):
-        """Dibuja el marco y los triangulos del tablero."""
-        self.screen.fill(BEIGE)
+    def objetivo_hover(self, x, y):
+        """
+        Recibe: posicion del mouse
+        Devuelve: lo que haria un click ahi: ("punto", idx), ("bar", None)
+                  o ("dado", valor); None si el click no tendria efecto
+        """
+        if self.game.is_game_over() or not self.game.dice():
+            return None
+        turno = self.game.turno()
+        en_bar = self.game.board().has_checkers_on_bar(turno)
+        if self.punto_seleccionado is not None:
+            dado = self.get_dado_at_pos(x, y)
+            origen = None if self.punto_seleccionado == "bar" else self.punto_seleccionado
+            if dado is not None and self.game.can_move(origen, dado):
+                return "dado", dado
+        punto = self.coords_a_punto(x, y)
+        if punto is None:
+            return ("bar", None) if en_bar and self.es_area_bar(x, y) else None
+        if punto in range(24) and not en_bar:
+            owner, count = self.game.board().point_owner_count(punto)
+            if owner == turno and count > 0 and punto != self.punto_seleccionado:
+                return "punto", punto
+        return None
+
+    def crear_fondo(self):
+        """
+        Pre-renderiza la parte estatica del tablero.
+
+        Devuelve: Surface del tamaño de la ventana con fondo, marco,
+                  triangulos, barra y area de retirada
+        """
+        fondo = pygame.Surface((ANCHO_VENTANA, ALTO_VENTANA)).convert()
+        fondo.fill(BEIGE)
         
         # Marco del tablero
-        pygame.draw.rect(self.screen, MARRON_OSCURO, 
+        pygame.draw.rect(fondo, MARRON_OSCURO, 
                          (TABLERO_X, TABLERO_Y, ANCHO_TABLERO, ALTO_TABLERO), 5)
 
         # Triangulos
@@ -186,134 +255,151 @@ class BackgammonUI:
                           (x + ANCHO_PUNTO // 2, y),      # Base derecha
                           (x, y - ALTO_PUNTO)]            # Punta hacia arriba
             
-            pygame.draw.polygon(self.screen, color_punto, puntos)
+            pygame.draw.polygon(fondo, color_punto, puntos)
 
         # Barra Central
-        pygame.draw.line(self.screen, MARRON_OSCURO, 
+        pygame.draw.line(fondo, MARRON_OSCURO, 
                          (BAR_X, TABLERO_Y), (BAR_X, TABLERO_Y + ALTO_TABLERO), ANCHO_PUNTO)
         
         # area de Retirada
-        pygame.draw.rect(self.screen, GRIS, 
+        pygame.draw.rect(fondo, GRIS, 
                          (OFF_X, TABLERO_Y, OFF_WIDTH, ALTO_TABLERO), 0)
-        pygame.draw.rect(self.screen, MARRON_OSCURO, 
+        pygame.draw.rect(fondo, MARRON_OSCURO, 
                          (OFF_X, TABLERO_Y, OFF_WIDTH, ALTO_TABLERO), 3)
+        return fondo
+
+    def dibujar_tablero(self):
+        """Dibuja el marco y los triangulos del tablero (copia el fondo pre-renderizado)."""
+        self.screen.blit(self.fondo, (0, 0))
+
+    def crear_sprites(self):
+        """
+        Pre-renderiza fichas, resaltado y tiritas de retirada.
+
+        Devuelve: dict con "ficha" y "retirada" por color ('B'/'N') y
+                  "resaltado"; las fichas llevan borde y antialias
+        """
+        def circulo(surface, centro, radio, color):
+            gfxdraw.filled_circle(surface, centro, centro, radio, color)
+            gfxdraw.aacircle(surface, centro, centro, radio, color)
+
+        sprites = {"ficha": {}, "retirada": {}}
+        for color, rgb in (('B', BLANCO), ('N', NEGRO)):
+            ficha = pygame.Surface((2 * RADIO_FICHA + 1, 2 * RADIO_FICHA + 1), pygame.SRCALPHA)
+            circulo(ficha, RADIO_FICHA, RADIO_FICHA, MARRON_OSCURO)       # Borde de 2 px
+            circulo(ficha, RADIO_FICHA, RADIO_FICHA - 2, rgb)
+            sprites["ficha"][color] = ficha.convert_alpha()
+
+            tirita = pygame.Surface((SEG_ANCHO, SEG_ALTO))
+            tirita.fill(rgb)
+            pygame.draw.rect(tirita, MARRON_OSCURO, (0, 0, SEG_ANCHO, SEG_ALTO), 1)
+            sprites["retirada"][color] = tirita.convert()
+
+        radio = RADIO_FICHA + 3
+        resaltado = pygame.Surface((2 * radio + 1, 2 * radio + 1), pygame.SRCALPHA)
+        pygame.draw.circle(resaltado, VERDE, (radio, radio), radio, 3)
+        gfxdraw.aacircle(resaltado, radio, radio, radio, VERDE)
+        gfxdraw.aacircle(resaltado, radio, radio, radio - 3, VERDE)
+        sprites["resaltado"] = resaltado.convert_alpha()
+        return sprites
 
     def dibujar_fichas(self):
         """Dibuja las fichas en el tablero, la barra y el area de retirada."""
+        # Todas las fichas del cuadro se juntan en un solo lote para Surface.blits
+        lote = []
+        fichas = self.sprites["ficha"]
+
         # Dibujar fichas en los puntos (apoyadas en la base, con +n si hay más de 5)
         MAX_VISIBLE_STACK = 5   # cuántas se muestran por punto
         PADDING_BASE = 6        # espacio entre base y la primera ficha
         GAP_STACK = 2           # (opcional) espacio entre fichas visibles
+        PASO = 2 * RADIO_FICHA + GAP_STACK
 
+        board = self.game.board()
         for i in range(24):
             coords = self.punto_a_coords(i)
             if coords is None:
                 continue
 
             x, y = coords
-            stack = self.game.board().points()[i]
-            count = len(stack)
+            owner, count = board.point_owner_count(i)
             if count == 0:
                 continue
 
             # Color (todas las fichas de un punto son del mismo color si count>1)
-            color = BLANCO if stack[0].color() == 'B' else NEGRO
+            sprite = fichas[owner]
+            color = BLANCO if owner == 'B' else NEGRO
 
             visible = min(count, MAX_VISIBLE_STACK)
+            x_sprite = x - RADIO_FICHA
 
             if 12 <= i <= 23:
                 # TRIANGULOS DE ARRIBA (apuntan hacia abajo) -> base en y (arriba)
                 # Apilar desde la base hacia adentro del triángulo
                 start_y = y + PADDING_BASE + RADIO_FICHA
-                for k in range(visible):
-                    y_centro = start_y + k * (2 * RADIO_FICHA + GAP_STACK)
-                    pygame.draw.circle(self.screen, color, (int(x), int(y_centro)), RADIO_FICHA)
-                    pygame.draw.circle(self.screen, MARRON_OSCURO, (int(x), int(y_centro)), RADIO_FICHA, 2)
+                lote += [(sprite, (x_sprite, start_y + k * PASO - RADIO_FICHA)) for k in range(visible)]
 
                 # Indicador +n si hay más de las visibles
                 if count > visible:
-                    font_small = pygame.font.Font(None, 24)
                     extra = count - visible
-                    text = font_small.render(f"+{extra}", True, color)
+                    text = self.textos.render(f"+{extra}", 24, color)
                     # Lo colocamos debajo de la última visible, pegadito
                     tx = int(x - text.get_width() // 2)
-                    ty = int(start_y + visible * (2 * RADIO_FICHA + GAP_STACK))
+                    ty = int(start_y + visible * PASO)
                     # Evitar salirnos del triángulo
                     ty = min(ty, y + ALTO_PUNTO - text.get_height() - 2)
-                    self.screen.blit(text, (tx, ty))
+                    lote.append((text, (tx, ty)))
 
             else:
                 # TRIÁNGULOS DE ABAJO (apuntan hacia arriba) -> base en y (abajo)
                 # Apilar desde la base hacia adentro del triángulo
                 start_y = y - PADDING_BASE - RADIO_FICHA
-                for k in range(visible):
-                    y_centro = start_y - k * (2 * RADIO_FICHA + GAP_STACK)
-                    pygame.draw.circle(self.screen, color, (int(x), int(y_centro)), RADIO_FICHA)
-                    pygame.draw.circle(self.screen, MARRON_OSCURO, (int(x), int(y_centro)), RADIO_FICHA, 2)
+                lote += [(sprite, (x_sprite, start_y - k * PASO - RADIO_FICHA)) for k in range(visible)]
 
                 # Indicador +n si hay más de las visibles
                 if count > visible:
-                    font_small = pygame.font.Font(None, 24)
                     extra = count - visible
-                    text = font_small.render(f"+{extra}", True, color)
+                    text = self.textos.render(f"+{extra}", 24, color)
                     # Lo colocamos arriba de la última visible, pegadito
                     tx = int(x - text.get_width() // 2)
-                    ty = int(start_y - visible * (2 * RADIO_FICHA + GAP_STACK) - text.get_height())
+                    ty = int(start_y - visible * PASO - text.get_height())
                     # Evitar salirnos del triángulo
                     ty = max(ty, y - ALTO_PUNTO + 2)
-                    self.screen.blit(text, (tx, ty))
+                    lote.append((text, (tx, ty)))
 
         # Dibujar fichas en la Barra
-        bar = self.game.board().bar()
-        if bar['B']:
-            for j, _ in enumerate(bar['B']):
-                y_centro = TABLERO_Y + 30 + j * 2 * RADIO_FICHA
-                x_centro = BAR_X - 20
-                pygame.draw.circle(self.screen, BLANCO, (int(x_centro), int(y_centro)), RADIO_FICHA)
-                pygame.draw.circle(self.screen, MARRON_OSCURO, (int(x_centro), int(y_centro)), RADIO_FICHA, 2)
-        
-        if bar['N']:
-            for j, _ in enumerate(bar['N']):
-                y_centro = TABLERO_Y + ALTO_TABLERO - 30 - j * 2 * RADIO_FICHA
-                x_centro = BAR_X - 20
-                pygame.draw.circle(self.screen, NEGRO, (int(x_centro), int(y_centro)), RADIO_FICHA)
-                pygame.draw.circle(self.screen, MARRON_OSCURO, (int(x_centro), int(y_centro)), RADIO_FICHA, 2)
-
-                # Dibujar fichas retiradas como "tiritas" horizontales apiladas
-        off = self.game.board().off()
-
-        SEG_ANCHO = OFF_WIDTH - 10     # ancho de la tirita
-        SEG_ALTO  = 6                  # alto de la tirita
-        SEG_GAP   = 4                  # espacio entre tiritas
+        bar = board.bar()
+        x_bar = BAR_X - 20 - RADIO_FICHA
+        lote += [(fichas['B'], (x_bar, TABLERO_Y + 30 + j * 2 * RADIO_FICHA - RADIO_FICHA))
+                 for j in range(len(bar['B']))]
+        lote += [(fichas['N'], (x_bar, TABLERO_Y + ALTO_TABLERO - 30 - j * 2 * RADIO_FICHA - RADIO_FICHA))
+                 for j in range(len(bar['N']))]
+
+        # Dibujar fichas retiradas como "tiritas" horizontales apiladas
+        off = board.off()
         x_seg = OFF_X + (OFF_WIDTH - SEG_ANCHO) // 2
 
         # BLANCAS: de arriba hacia abajo
-        if off['B'] > 0:
-            max_draw = min(off['B'], 15)
-            for j in range(max_draw):
-                y_seg = TABLERO_Y + 10 + j * (SEG_ALTO + SEG_GAP)
-                pygame.draw.rect(self.screen, BLANCO, (x_seg, y_seg, SEG_ANCHO, SEG_ALTO))
-                pygame.draw.rect(self.screen, MARRON_OSCURO, (x_seg, y_seg, SEG_ANCHO, SEG_ALTO), 1)
-            # Mostrar +n si hay más de 15
-            if off['B'] > 15:
-                font_num = pygame.font.Font(None, 24)
-                extra = off['B'] - 15
-                text_num = font_num.render(f"+{extra}", True, BLANCO)
-                self.screen.blit(text_num, (x_seg, TABLERO_Y + 10 + max_draw * (SEG_ALTO + SEG_GAP) + 4))
-
-        # NEGRAS: de abajo hacia arriba
-        if off['N'] > 0:
-            max_draw = min(off['N'], 15)
-            for j in range(max_draw):
-                # j=0 dibuja pegado abajo; luego sube
-                y_seg = TABLERO_Y + ALTO_TABLERO - 10 - (j + 1) * (SEG_ALTO + SEG_GAP)
-                pygame.draw.rect(self.screen, NEGRO, (x_seg, y_seg, SEG_ANCHO, SEG_ALTO))
-                pygame.draw.rect(self.screen, MARRON_OSCURO, (x_seg, y_seg, SEG_ANCHO, SEG_ALTO), 1)
-            if off['N'] > 15:
-                font_num = pygame.font.Font(None, 24)
-                extra = off['N'] - 15
-                text_num = font_num.render(f"+{extra}", True, NEGRO)
-                self.screen.blit(text_num, (x_seg, TABLERO_Y + ALTO_TABLERO - 10 - max_draw * (SEG_ALTO + SEG_GAP) - 24))
+        max_draw = min(off['B'], 15)
+        lote += [(self.sprites["retirada"]['B'], (x_seg, TABLERO_Y + 10 + j * (SEG_ALTO + SEG_GAP)))
+                 for j in range(max_draw)]
+        # Mostrar +n si hay más de 15
+        if off['B'] > 15:
+            extra = off['B'] - 15
+            text_num = self.textos.render(f"+{extra}", 24, BLANCO)
+            lote.append((text_num, (x_seg, TABLERO_Y + 10 + max_draw * (SEG_ALTO + SEG_GAP) + 4)))
+
+        # NEGRAS: de abajo hacia arriba (j=0 pegado abajo; luego sube)
+        max_draw = min(off['N'], 15)
+        lote += [(self.sprites["retirada"]['N'],
+                  (x_seg, TABLERO_Y + ALTO_TABLERO - 10 - (j + 1) * (SEG_ALTO + SEG_GAP)))
+                 for j in range(max_draw)]
+        if off['N'] > 15:
+            extra = off['N'] - 15
+            text_num = self.textos.render(f"+{extra}", 24, NEGRO)
+            lote.append((text_num, (x_seg, TABLERO_Y + ALTO_TABLERO - 10 - max_draw * (SEG_ALTO + SEG_GAP) - 24)))
+
+        self.screen.blits(lote, doreturn=False)
 
 
     def dibujar_dados(self):
@@ -323,14 +409,10 @@ class BackgammonUI:
         
         if dice:
             dado_size = 50
-            espacio_entre_dados = 15
-            total_width = len(dice) * dado_size + (len(dice) - 1) * espacio_entre_dados
-            x_base = ANCHO_VENTANA // 2 - total_width // 2
-            y_base = TABLERO_Y + ALTO_TABLERO + 50
+            rects = self.rects_dados.get(len(dice)) or self._rects_dados(len(dice))
             
-            for i, die_val in enumerate(dice):
-                x = x_base + i * (dado_size + espacio_entre_dados)
-                y = y_base
+            for rect, die_val in zip(rects, dice):
+                x, y = rect.topleft
                 
                 # Color del dado segun estado
                 if die_val in disponibles:
@@ -341,10 +423,25 @@ class BackgammonUI:
                 pygame.draw.rect(self.screen, die_color, (x, y, dado_size, dado_size), 0, 5)
                 pygame.draw.rect(self.screen, NEGRO, (x, y, dado_size, dado_size), 2, 5)
                 
-                text_dado = self.font.render(str(die_val), True, NEGRO)
+                text_dado = self.textos.render(str(die_val), 36, NEGRO)
                 text_rect = text_dado.get_rect(center=(x + dado_size // 2, y + dado_size // 2))
                 self.screen.blit(text_dado, text_rect)
                 
+    def texto_instruccion(self):
+        """Devuelve (texto, color) de la instruccion dinamica de arriba."""
+        if not self.game.dice():
+            return "Presiona ESPACIO para tirar dados", AZUL
+        if self.game.board().has_checkers_on_bar(self.game.turno()):
+            # MENSAJE ESPECIAL: Hay fichas en el bar
+            if self.puede_sacar_del_bar():
+                return "¡DEBES SACAR TUS FICHAS DEL BAR PRIMERO!", ROJO
+            return "BLOQUEADO - Presiona ESPACIO para pasar turno", ROJO
+        if self.punto_seleccionado is None:
+            return "1. Selecciona una de tus fichas (clic para cambiar)", VERDE
+        if self.dado_seleccionado is None:
+            return "2. Haz CLICK en un DADO (se movera automaticamente)", AMARILLO
+        return "Presiona ESPACIO para terminar turno", AZUL
+
     def dibujar_info(self):
         """Muestra informacion del turno y el juego."""
         color_turno = "BLANCAS" if self.game.turno() == 'B' else "NEGRAS"
@@ -354,20 +451,8 @@ class BackgammonUI:
         nombre_jugador = jugador_actual.nombre()
 
         # Instrucciones dinÃ¡micas arriba
-        if not self.game.dice():
-            text_instruccion = self.font.render("Presiona ESPACIO para tirar dados", True, AZUL)
-        elif self.game.board().has_checkers_on_bar(self.game.turno()):
-            # MENSAJE ESPECIAL: Hay fichas en el bar
-            if self.puede_sacar_del_bar():
-                text_instruccion = self.font.render("¡DEBES SACAR TUS FICHAS DEL BAR PRIMERO!", True, ROJO)
-            else:
-                text_instruccion = self.font.render("BLOQUEADO - Presiona ESPACIO para pasar turno", True, ROJO)
-        elif self.punto_seleccionado is None:
-            text_instruccion = self.font.render("1. Selecciona una de tus fichas (clic para cambiar)", True, VERDE)
-        elif self.dado_seleccionado is None:
-            text_instruccion = self.font.render("2. Haz CLICK en un DADO (se movera automaticamente)", True, AMARILLO)
-        else:
-            text_instruccion = self.font.render("Presiona ESPACIO para terminar turno", True, AZUL)
+        texto, color_instruccion = self.texto_instruccion()
+        text_instruccion = self.textos.render(texto, 36, color_instruccion)
             
         rect_instruccion = text_instruccion.get_rect(center=(ANCHO_VENTANA // 2, TABLERO_Y - 20))
         self.screen.blit(text_instruccion, rect_instruccion)
@@ -375,14 +460,13 @@ class BackgammonUI:
         # Info de retiradas y turno
         off_B = self.game.board().off()['B']
         off_N = self.game.board().off()['N']
-        text_off = self.font.render(f"Retiradas - B: {off_B} | N: {off_N}", True, MARRON_OSCURO)
+        text_off = self.textos.render(f"Retiradas - B: {off_B} | N: {off_N}", 36, MARRON_OSCURO)
         self.screen.blit(text_off, (ANCHO_VENTANA - text_off.get_width() - 20, TABLERO_Y + ALTO_TABLERO + 120))
 
-        text_turno = self.font.render(f"Turno: {color_turno} ({nombre_jugador})", True, color_rgb)
+        text_turno = self.textos.render(f"Turno: {color_turno} ({nombre_jugador})", 36, color_rgb)
         self.screen.blit(text_turno, (20, TABLERO_Y + ALTO_TABLERO + 120))
 
         # Instrucciones
-        font_pequena = pygame.font.Font(None, 28)
         instrucciones = [
             "COMO JUGAR:",
             "1. Presiona ESPACIO para tirar los dados",
@@ -394,17 +478,17 @@ class BackgammonUI:
         for i, linea in enumerate(instrucciones):
             if i == 0:
                 color_texto = MARRON_OSCURO
-                font_usada = self.font
+                tamano = 36
             else:
                 color_texto = NEGRO
-                font_usada = font_pequena
-            text_inst = font_usada.render(linea, True, color_texto)
+                tamano = 28
+            text_inst = self.textos.render(linea, tamano, color_texto)
             self.screen.blit(text_inst, (20, y_inicial + i * 32))
 
         # Mensaje de victoria
         if self.game.is_game_over():
             ganador = "BLANCAS" if self.game.winner() == 'B' else "NEGRAS"
-            text_ganador = self.font.render(f"¡JUEGO TERMINADO! GANADOR: {ganador}", True, ROJO)
+            text_ganador = self.textos.render(f"¡JUEGO TERMINADO! GANADOR: {ganador}", 36, ROJO)
             self.screen.blit(text_ganador, (ANCHO_VENTANA // 2 - text_ganador.get_width() // 2, 10))
 
     def puede_sacar_del_bar(self):
@@ -556,110 +640,232 @@ class BackgammonUI:
             self.dado_seleccionado = None
             raise  # Re-lanzar para que lo capture el bucle principal
 
+    def bar_bloqueado(self):
+        """True si hay dados y fichas en el bar del turno que no pueden entrar."""
+        return bool(self.game.dice()) and \
+            self.game.board().has_checkers_on_bar(self.game.turno()) and \
+            not self.puede_sacar_del_bar()
+
+    def dibujar_resaltados(self):
+        """Resalta la barra bloqueada y la ficha o barra seleccionada."""
+        # Resaltar área del bar si hay fichas bloqueadas
+        if self.bar_bloqueado():
+            # Resaltar en ROJO para indicar bloqueo
+            pygame.draw.rect(self.screen, ROJO, 
+                           (BAR_X - ANCHO_PUNTO // 4, TABLERO_Y,
+                            ANCHO_PUNTO // 2, ALTO_TABLERO), 5)
+        
+        # Resaltar la seleccion
+        if self.punto_seleccionado == "bar":
+            pygame.draw.rect(self.screen, VERDE, 
+                           (BAR_X - ANCHO_PUNTO // 4, TABLERO_Y,
+                            ANCHO_PUNTO // 2, ALTO_TABLERO), 4)
+                            
+        elif self.punto_seleccionado is not None and self.punto_seleccionado != 24:
+            coords = self.punto_a_coords(self.punto_seleccionado)
+            if coords:
+                x, y = coords
+                
+                # ARRIBA (12-23): fichas estan en punta hacia abajo
+                if 12 <= self.punto_seleccionado <= 23:
+                    y_center = y + ALTO_PUNTO - RADIO_FICHA
+                # ABAJO (0-11): fichas estan en punta hacia arriba
+                else:
+                    y_center = y - ALTO_PUNTO + RADIO_FICHA
+                    
+                radio = RADIO_FICHA + 3
+                self.screen.blit(self.sprites["resaltado"], (int(x) - radio, int(y_center) - radio))
+
+    def dibujar_hover(self):
+        """Marca lo que se activaria con un click en la posicion del mouse."""
+        if self.hover is None:
+            return
+        tipo, valor = self.hover
+        if tipo == "dado":
+            dice = self.game.dice()
+            rects = self.rects_dados.get(len(dice)) or self._rects_dados(len(dice))
+            rect = next(r for r, d in zip(rects, dice) if d == valor)
+            pygame.draw.rect(self.screen, AMARILLO, rect.inflate(6, 6), 3, 7)
+        elif tipo == "bar":
+            pygame.draw.rect(self.screen, AMARILLO,
+                             (BAR_X - ANCHO_PUNTO // 4, TABLERO_Y, ANCHO_PUNTO // 2, ALTO_TABLERO), 2)
+        else:
+            x, y = self.punto_a_coords(valor)
+            y_top = y if valor >= 12 else y - ALTO_PUNTO
+            pygame.draw.rect(self.screen, AMARILLO,
+                             (x - ANCHO_PUNTO // 2, y_top, ANCHO_PUNTO, ALTO_PUNTO), 2)
+
+    def actualizar_hover(self, x, y):
+        """Recalcula el objetivo bajo el mouse."""
+        self.hover = self.objetivo_hover(x, y)
+
+    def dibujar_avisos(self):
+        """Dibuja el cartel de error y el cartel informativo, si estan activos."""
+        if self.error_message:
+            error_surf = pygame.Surface(RECT_ERROR.size)
+            error_surf.fill(ROJO)
+            pygame.draw.rect(error_surf, NEGRO, (0, 0, error_surf.get_width(), error_surf.get_height()), 3)
+            
+            lines = self.error_message.split('\n')
+            y_offset = 10
+            for line in lines:
+                text = self.textos.render(line, 24, BLANCO)
+                error_surf.blit(text, (10, y_offset))
+                y_offset += 30
+            
+            self.screen.blit(error_surf, RECT_ERROR.topleft)
+
+        if self.info_message:
+            info_surf = pygame.Surface(RECT_AVISO.size)
+            info_surf.fill(AMARILLO)
+            pygame.draw.rect(info_surf, NEGRO, (0, 0, info_surf.get_width(), info_surf.get_height()), 3)
+            t1 = self.textos.render("Aviso", 32, NEGRO)
+            t2 = self.textos.render(self.info_message, 26, NEGRO)
+            info_surf.blit(t1, (12, 10))
+            info_surf.blit(t2, (12, 55))
+            self.screen.blit(info_surf, RECT_AVISO.topleft)
+
+    def dibujar_escena(self):
+        """Compone el cuadro completo sobre self.screen (sin enviarlo a la pantalla)."""
+        self.dibujar_tablero()
+        self.dibujar_fichas()
+        self.dibujar_dados()
+        self.dibujar_info()
+        self.dibujar_resaltados()
+        self.dibujar_hover()
+        self.dibujar_avisos()
+
+    def actualizar_temporizadores(self):
+        """Vence los carteles y, al expirar el aviso, pasa el turno si estaba pendiente."""
+        current_time = pygame.time.get_ticks()
+        if self.error_message and current_time - self.error_time >= DURACION_ERROR:
+            self.error_message = None
+        if self.info_message and current_time - self.info_time >= self.info_duration:
+            self.info_message = None
+            if self.pending_end_turn and self.game.can_end_turn():
+                self.game.end_turn()
+            self.pending_end_turn = False
+
+    def proximo_vencimiento(self):
+        """
+        Devuelve: ms hasta que venza el proximo cartel (aviso o error), o
+                  None si no hay ninguno activo
+        """
+        current_time = pygame.time.get_ticks()
+        vencimientos = []
+        if self.info_message:
+            vencimientos.append(self.info_time + self.info_duration - current_time)
+        if self.error_message:
+            vencimientos.append(self.error_time + DURACION_ERROR - current_time)
+        return max(0, min(vencimientos)) if vencimientos else None
+
+    def esperar_eventos(self):
+        """
+        Espera la proxima entrada sin consumir CPU.
+
+        Hace: Bloquea en pygame.event.wait; si hay un cartel activo, como
+              mucho hasta su vencimiento. Sin modo ocioso solo sondea
+        Devuelve: lista de eventos pendientes (vacia si vencio el plazo)
+        """
+        if not self.modo_ocioso:
+            return pygame.event.get()
+        espera = self.proximo_vencimiento()
+        if espera == 0:
+            return pygame.event.get()
+        # event.wait() sin plazo bloquea hasta que llegue un evento
+        event = pygame.event.wait() if espera is None else pygame.event.wait(espera)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def estado_regiones(self):
+        """
+        Resume lo que muestra cada region de la pantalla.
+
+        Devuelve: dict {nombre: (estado, rect)}; si el estado de una region
+                  cambia entre dos cuadros, su rect esta sucio
+        """
+        board = self.game.board()
+        off = board.off()
+        return {
+            "encabezado": ((self.texto_instruccion(), self.game.winner()), RECT_ENCABEZADO),
+            "tablero": ((board.cells().tobytes(), self.punto_seleccionado, self.bar_bloqueado(),
+                         self.hover if self.hover and self.hover[0] != "dado" else None),
+                        RECT_TABLERO),
+            "dados": ((tuple(self.game.dice()), tuple(self.game.available_dice()),
+                       self.hover if self.hover and self.hover[0] == "dado" else None),
+                      RECT_DADOS),
+            "pie": ((self.game.turno(), self.game.current_player().nombre(), off['B'], off['N']),
+                    RECT_PIE),
+            "aviso": (self.info_message, RECT_AVISO),
+            "error": (self.error_message, RECT_ERROR),
+        }
+
+    def regiones_sucias(self):
+        """
+        Compara el estado de cada region con el del ultimo cuadro dibujado.
+
+        Devuelve: lista de rects a actualizar (la ventana entera en el primer
+                  cuadro o despues de forzar_redibujo); vacia si nada cambio
+        """
+        estado = self.estado_regiones()
+        if self.estado_previo is None:
+            sucias = [self.screen.get_rect()]
+        else:
+            sucias = [rect for nombre, (valor, rect) in estado.items()
+                      if self.estado_previo.get(nombre) != valor]
+        self.estado_previo = {nombre: valor for nombre, (valor, _) in estado.items()}
+        return sucias
+
+    def forzar_redibujo(self):
+        """El proximo cuadro redibuja y envia la ventana entera."""
+        self.estado_previo = None
+
     def run(self):
         """Bucle principal de Pygame."""
         running = True
-        error_message = None
-        error_time = 0
         
         while running:
             try:
-                for event in pygame.event.get():
+                self.actualizar_temporizadores()
+                # El hover depende del mouse y del estado del juego: se recalcula
+                # en cada vuelta (un MOUSEMOTION alcanza para despertar el bucle)
+                if pygame.mouse.get_focused():
+                    self.actualizar_hover(*pygame.mouse.get_pos())
+
+                # Solo se recompone el cuadro y se envian las regiones que cambiaron
+                sucias = self.regiones_sucias()
+                if sucias:
+                    self.dibujar_escena()
+                    pygame.display.update(sucias)
+                if not self.modo_ocioso:
+                    self.clock.tick(60)
+
+                # Se dibuja antes de esperar: lo que cambie al atender eventos
+                # (o un error) se muestra en la vuelta siguiente sin demora
+                for event in self.esperar_eventos():
                     if event.type == pygame.QUIT:
                         running = False
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_SPACE:
                             self.manejar_espacio()
-                        elif event.key == pygame.K_ESCAPE and error_message:
+                        elif event.key == pygame.K_ESCAPE and self.error_message:
                             # Presionar ESC para cerrar mensaje de error
-                            error_message = None
+                            self.error_message = None
                     elif event.type == pygame.MOUSEBUTTONDOWN:
                         x, y = event.pos
                         self.manejar_click(x, y)
-
-                self.dibujar_tablero()
-                self.dibujar_fichas()
-                self.dibujar_dados()
-                self.dibujar_info()
-                
-                # Resaltar área del bar si hay fichas bloqueadas
-                if self.game.dice() and self.game.board().has_checkers_on_bar(self.game.turno()):
-                    if not self.puede_sacar_del_bar():
-                        # Resaltar en ROJO para indicar bloqueo
-                        pygame.draw.rect(self.screen, ROJO, 
-                                       (BAR_X - ANCHO_PUNTO // 4, TABLERO_Y,
-                                        ANCHO_PUNTO // 2, ALTO_TABLERO), 5)
-                
-                # Resaltar la seleccion
-                if self.punto_seleccionado == "bar":
-                    pygame.draw.rect(self.screen, VERDE, 
-                                   (BAR_X - ANCHO_PUNTO // 4, TABLERO_Y,
-                                    ANCHO_PUNTO // 2, ALTO_TABLERO), 4)
-                                    
-                elif self.punto_seleccionado is not None and self.punto_seleccionado != 24:
-                    coords = self.punto_a_coords(self.punto_seleccionado)
-                    if coords:
-                        x, y = coords
-                        
-                        # ARRIBA (12-23): fichas estan en punta hacia abajo
-                        if 12 <= self.punto_seleccionado <= 23:
-                            y_center = y + ALTO_PUNTO - RADIO_FICHA
-                        # ABAJO (0-11): fichas estan en punta hacia arriba
-                        else:
-                            y_center = y - ALTO_PUNTO + RADIO_FICHA
-                            
-                        pygame.draw.circle(self.screen, VERDE, (int(x), int(y_center)), RADIO_FICHA + 3, 3)
-                
-                # Mostrar mensaje de error si existe
-                if error_message:
-                    current_time = pygame.time.get_ticks()
-                    if current_time - error_time < 10000:  # Mostrar por 10 segundos
-                        error_surf = pygame.Surface((ANCHO_VENTANA - 40, 150))
-                        error_surf.fill(ROJO)
-                        pygame.draw.rect(error_surf, NEGRO, (0, 0, error_surf.get_width(), error_surf.get_height()), 3)
-                        
-                        font_error = pygame.font.Font(None, 24)
-                        lines = error_message.split('\n')
-                        y_offset = 10
-                        for line in lines:
-                            text = font_error.render(line, True, BLANCO)
-                            error_surf.blit(text, (10, y_offset))
-                            y_offset += 30
-                        
-                        self.screen.blit(error_surf, (20, ALTO_VENTANA // 2 - 75))
-                    else:
-                        error_message = None
-                # Cartel informativo (amarillo) y auto "end turn" si corresponde
-                if self.info_message:
-                    current_time = pygame.time.get_ticks()
-                    # Render del cartel
-                    info_surf = pygame.Surface((ANCHO_VENTANA - 40, 120))
-                    info_surf.fill(AMARILLO)
-                    pygame.draw.rect(info_surf, NEGRO, (0, 0, info_surf.get_width(), info_surf.get_height()), 3)
-                    font_info_title = pygame.font.Font(None, 32)
-                    font_info_text  = pygame.font.Font(None, 26)
-
-                    t1 = font_info_title.render("Aviso", True, NEGRO)
-                    t2 = font_info_text.render(self.info_message, True, NEGRO)
-                    info_surf.blit(t1, (12, 10))
-                    info_surf.blit(t2, (12, 55))
-                    self.screen.blit(info_surf, (20, ALTO_VENTANA // 2 - 60))
-
-                    # Al expirar el tiempo, ejecutamos acción pendiente (si la hay)
-                    if current_time - self.info_time >= self.info_duration:
-                        self.info_message = None
-                        if self.pending_end_turn and self.game.can_end_turn():
-                            self.game.end_turn()
-                        self.pending_end_turn = False
-
-                pygame.display.flip()
-                self.clock.tick(60)
+                    elif event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+                        self.construir_indice()
+                        self.forzar_redibujo()
+                    elif event.type == pygame.VIDEOEXPOSE:
+                        self.forzar_redibujo()
                 
             except Exception as e:
                 # Capturar cualquier error y mostrarlo
                 import traceback
-                error_message = f"ERROR: {str(e)}\nPresiona ESC para continuar"
-                error_time = pygame.time.get_ticks()
+                self.error_message = f"ERROR: {str(e)}\nPresiona ESC para continuar"
+                self.error_time = pygame.time.get_ticks()
                 print("\n=== ERROR CAPTURADO ===")
                 print(traceback.format_exc())
                 print("=======================\n")
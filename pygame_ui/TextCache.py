@@ -0,0 +1,77 @@
+"""
+Cache de fuentes y de textos renderizados para la interfaz Pygame
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# Tamaños que usa la interfaz; se crean una sola vez al iniciar
+TAMANOS_FUENTE = (24, 26, 28, 32, 36)
+
+
+class TextCache:
+    """
+    Registro de fuentes + cache LRU de superficies de texto.
+
+    Construir un pygame.font.Font y rasterizar texto son de las llamadas mas
+    caras de Pygame: las fuentes se crean una vez por tamaño y cada texto se
+    renderiza una vez por (texto, tamaño, color) mientras siga en la cache.
+    """
+
+    def __init__(self, tamanos=TAMANOS_FUENTE, max_entradas=256):
+        """
+        Recibe: tamaños de fuente a registrar y tope de superficies en cache
+        Hace: Inicializa pygame.font y crea las fuentes
+        """
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.__fuentes__ = {tamano: pygame.font.Font(None, tamano) for tamano in tamanos}
+        self.__textos__ = OrderedDict()
+        self.__max__ = max_entradas
+        self.__hits__ = 0
+        self.__misses__ = 0
+
+    def font(self, tamano):
+        """Fuente del registro; un tamaño nuevo se crea una vez y queda registrado."""
+        fuente = self.__fuentes__.get(tamano)
+        if fuente is None:
+            fuente = self.__fuentes__[tamano] = pygame.font.Font(None, tamano)
+        return fuente
+
+    def render(self, texto, tamano, color):
+        """
+        Recibe: texto, tamaño de fuente y color RGB
+        Devuelve: Surface con el texto (antialias); compartida, no modificarla
+        """
+        key = (texto, tamano, tuple(color))
+        surface = self.__textos__.get(key)
+        if surface is not None:
+            self.__hits__ += 1
+            self.__textos__.move_to_end(key)
+            return surface
+        self.__misses__ += 1
+        surface = self.font(tamano).render(texto, True, color)
+        self.__textos__[key] = surface
+        if len(self.__textos__) > self.__max__:
+            self.__textos__.popitem(last=False)
+        return surface
+
+    def hits(self):
+        return self.__hits__
+
+    def misses(self):
+        return self.__misses__
+
+    def stats(self):
+        """Devuelve: dict con hits, misses, entradas en cache y fuentes registradas."""
+        return {
+            "hits": self.__hits__,
+            "misses": self.__misses__,
+            "entries": len(self.__textos__),
+            "fonts": len(self.__fuentes__),
+        }
+
+    def clear(self):
+        """Vacia la cache de textos (conserva fuentes y contadores)."""
+        self.__textos__.clear()
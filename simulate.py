@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+Backgammon - Simulación sin interfaz
+Juega N partidas entre políticas automáticas y reporta el rendimiento en JSON
+Ejemplo: python simulate.py --games 200 --white greedy --black random
+"""
+from core.Simulation import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Constructores de posiciones compartidos por los tests."""
+
+from core.Board import Board
+
+
+def carrera_final():
+    """Posicion de carrera chica (ambos colores casi todo afuera)."""
+    cells = [0] * 28
+    cells[18], cells[20], cells[22], cells[26] = 1, 2, 3, 9
+    cells[1], cells[2], cells[4], cells[27] = -1, -2, -3, -9
+    return Board.from_cells(cells)
+
+
+def tablero_aleatorio(rng):
+    """Tablero con hasta 15 fichas por color, con fichas en barra y en casa."""
+    cells = [0] * 28
+    for color, sign, bar, casa in (('B', 1, 24, range(18, 24)), ('N', -1, 25, range(0, 6))):
+        for _ in range(rng.randint(0, 15)):
+            slot = rng.choice(list(range(24)) + [bar] * 2 + list(casa) * 3)
+            if slot < 24 and cells[slot] * sign < 0:
+                continue
+            cells[slot] += sign
+    return Board.from_cells(cells)
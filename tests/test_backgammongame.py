@@ -3,6 +3,7 @@ from unittest.mock import patch
 from core.BackgammonGame import BackgammonGame
 from core.Board import Board
 from core.Checker import Checker
+from core.Dice import Dice
 
 class TestGame(unittest.TestCase):
     def test_basicos_turno_y_players(self):
@@ -72,8 +73,10 @@ class TestGame(unittest.TestCase):
             g.roll()
         # Exacto permitido
         self.assertTrue(g.can_move(18, 6))
-        # Con 5 debería ser movimiento interno (no off). Si el destino es válido, can_move True.
-        self.assertTrue(g.can_move(18, 5))
+        # Con 5 el Board lo acepta como movimiento interno (no off)...
+        self.assertTrue(b.can_move(18, 5, 'B'))
+        # ...pero solo entra un dado y hay que usar el mayor (el 6)
+        self.assertFalse(g.can_move(18, 5))
 
     def test_is_game_over_y_winner(self):
         g = BackgammonGame("Ana", "Noa")
@@ -217,5 +220,118 @@ class TestGameCoverMore(unittest.TestCase):
         self.assertFalse(self.g.has_valid_moves())
         self.assertTrue(self.g.can_end_turn())
 
+    def test_get_valid_moves_usa_el_board(self):
+        with patch("core.Dice.random.randint", side_effect=[3, 1]):
+            self.g.roll()
+        moves = self.g.get_valid_moves()
+        self.assertIn((0, 3), moves)
+        self.assertIn((0, 1), moves)
+        self.assertTrue(self.g.has_valid_moves())
+
+    def test_undo_last_move_devuelve_el_dado(self):
+        with patch("core.Dice.random.randint", side_effect=[3, 1]):
+            self.g.roll()
+        self.assertFalse(self.g.undo_last_move())
+        self.assertTrue(self.g.move(0, 3))
+        self.assertEqual(self.g.available_dice(), [1])
+        self.assertTrue(self.g.undo_last_move())
+        self.assertEqual(sorted(self.g.available_dice()), [1, 3])
+        self.assertEqual(self.b.point_owner_count(0), ('B', 2))
+        self.assertEqual(self.b.point_owner_count(3), (None, 0))
+
+    def test_position_hash_incluye_turno(self):
+        h_blancas = self.g.position_hash()
+        self.g.end_turn()
+        self.assertNotEqual(self.g.position_hash(), h_blancas)
+        self.g.end_turn()
+        self.assertEqual(self.g.position_hash(), h_blancas)
+
+    def test_turn_id_y_restore(self):
+        with patch("core.Dice.random.randint", side_effect=[3, 1]):
+            self.g.roll()
+        self.assertTrue(self.g.move(0, 3))
+        pid, tid = self.g.position_id(), self.g.turn_id()
+        self.assertEqual(len(tid), 2)
+        otro = BackgammonGame()
+        otro.restore(pid, tid)
+        self.assertEqual(otro.turno(), "B")
+        self.assertEqual(otro.dice(), [3, 1])
+        self.assertEqual(otro.available_dice(), [1])
+        self.assertEqual(otro.position_hash(), self.g.position_hash())
+
+    def test_contador_de_dados(self):
+        self.assertTrue(self.g.is_exhausted())
+        with patch("core.Dice.random.randint", return_value=5):
+            self.g.roll()
+        self.assertEqual(self.g.remaining(), 4)
+        self.assertEqual(self.g.remaining(5), 4)
+        self.assertEqual(self.g.remaining(2), 0)
+        self.assertTrue(self.g.consume(5))
+        self.assertFalse(self.g.consume(2))
+        self.assertFalse(self.g.consume(7))
+        self.assertEqual(self.g.available_dice(), [5, 5, 5])
+        for _ in range(3):
+            self.assertTrue(self.g.consume(5))
+        self.assertTrue(self.g.is_exhausted())
+        self.assertFalse(self.g.consume(5))
+        self.assertEqual(self.g.dice(), [5, 5, 5, 5])
+
+    def test_plan_exige_usar_ambos_dados(self):
+        self._clear_board()
+        # Dos blancas: idx 0 y idx 10. Si se juega 10->16 con el 6, el 1 ya
+        # no entra (17 y 1 bloqueados); como 0->6 y 10->11 usa los dos dados,
+        # el plan descarta 10->16.
+        self.b.points()[0].append(Checker('B'))
+        self.b.points()[10].append(Checker('B'))
+        for idx in (1, 7, 17):
+            self.b.points()[idx].extend([Checker('N'), Checker('N')])
+        with patch("core.Dice.random.randint", side_effect=[6, 1]):
+            self.g.roll()
+        self.assertTrue(self.b.can_move(10, 6, 'B'))
+        self.assertTrue(self.g.can_move(0, 6))
+        self.assertFalse(self.g.can_move(10, 6))
+        self.assertFalse(self.g.move(10, 6))
+        self.assertTrue(self.g.move(0, 6))
+        self.assertEqual(self.g.get_valid_moves(), [(10, 1)])
+        self.assertTrue(self.g.undo_last_move())
+        self.assertIn((0, 6), self.g.get_valid_moves())
+
+    def test_plan_se_recalcula_si_cambia_el_tablero(self):
+        with patch("core.Dice.random.randint", side_effect=[3, 1]):
+            self.g.roll()
+        self.assertTrue(self.g.can_move(0, 3))
+        self._clear_board()
+        self.b.points()[4].append(Checker('B'))
+        self.assertFalse(self.g.can_move(0, 3))
+        self.assertTrue(self.g.can_move(4, 3))
+
+    def test_turn_id_dobles_e_invalido(self):
+        self.g.end_turn()
+        with patch("core.Dice.random.randint", return_value=4):
+            self.g.roll()
+        self.assertTrue(self.g.move(12, 4))
+        otro = BackgammonGame()
+        otro.restore(self.g.position_id(), self.g.turn_id())
+        self.assertEqual(otro.turno(), "N")
+        self.assertEqual(otro.available_dice(), [4, 4, 4])
+        with self.assertRaises(ValueError):
+            otro.restore(self.g.position_id(), b"\xff\x03")
+
+    def test_dados_inyectados(self):
+        g = BackgammonGame(dice=Dice(script=[(6, 5), (3, 3)]))
+        self.assertEqual(g.roll(), [6, 5])
+        g.end_turn()
+        self.assertEqual(g.roll(), [3, 3, 3, 3])
+        self.assertEqual(g.turno(), "N")
+
+    def test_end_turn_vacia_la_pila_de_deshacer(self):
+        g = BackgammonGame(dice=Dice(script=[(3, 1)]))
+        g.roll()
+        self.assertTrue(g.move(0, 3))
+        self.assertTrue(g.move(0, 1))  # Agota los dados y pasa el turno
+        self.assertEqual(g.turno(), "N")
+        with self.assertRaises(ValueError):
+            g.board().undo()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+import numpy as np
+from core.Board import Board
+from core.BatchBoard import BatchBoard
+from tests.helpers import tablero_aleatorio
+
+
+class TestBatchBoard(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.boards = [Board()] + [tablero_aleatorio(rng) for _ in range(300)]
+        self.colors = ['B'] + [rng.choice('BN') for _ in range(300)]
+        self.batch = BatchBoard.from_boards(self.boards)
+
+    def test_forma_invalida(self):
+        with self.assertRaises(ValueError):
+            BatchBoard(np.zeros((3, 27)))
+
+    def test_move_table_igual_a_can_move(self):
+        table = self.batch.move_table(self.colors)
+        self.assertEqual(table.shape, (len(self.boards), 25, 6))
+        for i, board in enumerate(self.boards):
+            for p in range(25):
+                origen = None if p == 24 else p
+                for die in range(1, 7):
+                    self.assertEqual(table[i, p, die - 1],
+                                     board.can_move(origen, die, self.colors[i]),
+                                     f"tablero {i}, origen {origen}, dado {die}")
+
+    def test_bear_off_bloqueos_y_barra(self):
+        bear = self.batch.can_bear_off(self.colors)
+        blocked = self.batch.blocked_points(self.colors)
+        entry = self.batch.bar_entry(self.colors)
+        for i, board in enumerate(self.boards):
+            color = self.colors[i]
+            self.assertEqual(bear[i], board.can_bear_off(color))
+            for idx in range(24):
+                owner, count = board.point_owner_count(idx)
+                self.assertEqual(blocked[i, idx], owner not in (None, color) and count >= 2)
+            for die in range(1, 7):
+                self.assertEqual(entry[i, die - 1], board.can_move(None, die, color))
+
+    def test_legal_moves_filtra_por_dados(self):
+        dice = np.array([[3, 1]] * len(self.boards))
+        legal = self.batch.legal_moves(self.colors, dice)
+        self.assertFalse(legal[:, :, [1, 3, 4, 5]].any())
+        # Apertura de blancas con 3-1: 0->3 y 0->1 entre otros
+        self.assertTrue(legal[0, 0, 2])
+        self.assertTrue(legal[0, 0, 0])
+        self.assertEqual(self.batch.board(0).cells(), self.boards[0].cells())
+
+
+if __name__ == "__main__":
+    unittest.main()
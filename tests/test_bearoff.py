@@ -0,0 +1,164 @@
+import os
+import random
+import tempfile
+import unittest
+from core.Board import Board
+from core.Bearoff import (
+    OneSidedBearoff,
+    TwoSidedBearoff,
+    build_one_sided,
+    build_two_sided,
+    solve_two_sided,
+    home_counts,
+    num_positions,
+    position_index,
+    _positions,
+    _turn_finals,
+)
+from core.SearchEngine import DICE_OUTCOMES
+
+
+def tablero_de_casa(counts):
+    """Blancas con counts en casa (resto afuera), negras ya retiradas."""
+    cells = [0] * 28
+    for k, c in enumerate(counts):
+        cells[23 - k] = c
+    cells[26] = 15 - sum(counts)
+    cells[27] = -15
+    return Board.from_cells(cells)
+
+
+class TestBearoff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "bearoff.bin")
+        build_one_sided(cls.path, max_checkers=4, max_rolls=32)
+        cls.db = OneSidedBearoff(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmp.cleanup()
+
+    def test_indice_es_biyectivo(self):
+        indices = sorted(position_index(p) for p in _positions(4))
+        self.assertEqual(indices, list(range(num_positions(4))))
+        self.assertEqual(len(self.db), num_positions(4))
+        self.assertEqual(position_index((0,) * 6), 0)
+
+    def test_finales_igual_que_board(self):
+        rng = random.Random(3)
+        for pos in rng.sample(list(_positions(4)), 40):
+            board = tablero_de_casa(pos)
+            for dice, _ in DICE_OUTCOMES:
+                esperado = set()
+                for seq in board.legal_sequences('B', list(dice)):
+                    b = board.copy()
+                    for origen, dado in seq:
+                        b.move(origen, dado, 'B')
+                    esperado.add(home_counts(b, 'B'))
+                self.assertEqual(_turn_finals(pos, dice), esperado, (pos, dice))
+
+    def test_valores_conocidos(self):
+        # Una ficha a 1 pip: solo sale con un 1 (11/36 por tirada)
+        self.assertAlmostEqual(self.db.expected_rolls((1, 0, 0, 0, 0, 0)), 36 / 11, places=5)
+        self.assertEqual(self.db.expected_rolls((0,) * 6), 0.0)
+        dist = self.db.distribution((2, 1, 0, 0, 1, 0))
+        self.assertAlmostEqual(float(dist.sum()), 1.0, places=5)
+        self.assertEqual(dist[0], 0.0)
+
+    def test_desde_board(self):
+        board = tablero_de_casa((1, 0, 0, 0, 0, 0))
+        self.assertAlmostEqual(self.db.expected_rolls_for(board, 'B'), 36 / 11, places=5)
+        self.assertIsNone(self.db.expected_rolls_for(Board(), 'B'))
+        with self.assertRaises(ValueError):
+            self.db.expected_rolls((5, 0, 0, 0, 0, 0))
+
+    def test_fichas_rivales_en_casa_no_cuentan(self):
+        # Blancas retirando con dos negras todavia en idx 23 (a 1 pip de salir)
+        cells = [0] * 28
+        cells[22] = 1
+        cells[20] = 2
+        cells[26] = 12
+        cells[23] = -2
+        cells[0] = -13
+        board = Board.from_cells(cells)
+        self.assertEqual(home_counts(board, 'B'), (0, 1, 0, 2, 0, 0))
+        esperado = self.db.expected_rolls((0, 1, 0, 2, 0, 0))
+        self.assertAlmostEqual(self.db.expected_rolls_for(board, 'B'), esperado, places=6)
+        # Y al reves: negras retirando con una blanca en su casa
+        cells = [0] * 28
+        cells[2] = -3
+        cells[0] = 1
+        cells[27] = -12
+        cells[26] = 14
+        self.assertEqual(home_counts(Board.from_cells(cells), 'N'), (0, 0, 3, 0, 0, 0))
+
+    def test_archivo_invalido(self):
+        path = os.path.join(self.tmp.name, "roto.bin")
+        with open(path, "wb") as f:
+            f.write(b"no es una base")
+        with self.assertRaises(ValueError):
+            OneSidedBearoff(path)
+
+
+class TestTwoSidedBearoff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "two.bin")
+        build_two_sided(cls.path, max_checkers=3)
+        cls.db = TwoSidedBearoff(cls.path)
+        cls.equity = solve_two_sided(3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmp.cleanup()
+
+    def test_cumple_la_ecuacion_de_bellman(self):
+        E = self.equity
+        rng = random.Random(5)
+        posiciones = [p for p in _positions(3) if any(p)]
+        for _ in range(60):
+            a, b = rng.choice(posiciones), rng.choice(posiciones)
+            ia, ib = position_index(a), position_index(b)
+            valor = 0.0
+            for dice, prob in DICE_OUTCOMES:
+                finales = _turn_finals(a, dice)
+                if finales:
+                    valor += prob * max(-E[ib, position_index(c)] for c in finales)
+                else:
+                    valor -= prob * E[ib, ia]
+            self.assertAlmostEqual(valor, E[ia, ib], places=12)
+
+    def test_valor_conocido_y_probe(self):
+        # Una ficha a 1 pip cada uno: W = p / (1 - (1 - p)^2) con p = 11/36
+        p = 11 / 36
+        esperado = 2 * p / (1 - (1 - p) ** 2) - 1
+        uno = (1, 0, 0, 0, 0, 0)
+        self.assertAlmostEqual(self.db.probe(uno, uno), esperado, places=4)
+        self.assertEqual(self.db.probe(uno, (0,) * 6), -1.0)
+        with self.assertRaises(ValueError):
+            self.db.probe((4, 0, 0, 0, 0, 0), uno)
+
+    def test_probe_board(self):
+        cells = [0] * 28
+        cells[23], cells[26] = 1, 14      # blanca a 1 pip
+        cells[5], cells[27] = -2, -13     # negras a 6 pips
+        b = Board.from_cells(cells)
+        self.assertAlmostEqual(
+            self.db.probe_board(b, 'B'),
+            self.db.probe((1, 0, 0, 0, 0, 0), (0, 0, 0, 0, 0, 2)))
+        self.assertIsNone(self.db.probe_board(Board(), 'B'))
+
+    def test_archivo_de_un_lado_no_sirve(self):
+        path = os.path.join(self.tmp.name, "uno.bin")
+        build_one_sided(path, max_checkers=2, max_rolls=8)
+        with self.assertRaises(ValueError):
+            TwoSidedBearoff(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import random
 import unittest
 from core.Board import Board
 from core.Checker import Checker
+from tests.helpers import tablero_aleatorio
 
 class TestBoard(unittest.TestCase):
     def test_setup_inicial(self):
@@ -209,5 +211,256 @@ class TestBoardCoverMore(unittest.TestCase):
             self.b.points()[0].append(Checker('N'))
         self.assertFalse(self.b.can_bear_off('N'))
 
+class TestBoardCompacto(unittest.TestCase):
+    def setUp(self):
+        self.b = Board()
+
+    def test_cells_setup_inicial(self):
+        cells = self.b.cells()
+        self.assertEqual(len(cells), 28)
+        self.assertEqual(cells[0], 2)      # 2 blancas en punto 1
+        self.assertEqual(cells[23], -2)    # 2 negras en punto 24
+        self.assertEqual(sum(v for v in cells if v > 0), 15)
+        self.assertEqual(sum(-v for v in cells if v < 0), 15)
+
+    def test_vista_points_refleja_el_arreglo(self):
+        self.b.points()[3].extend([Checker('N'), Checker('N')])
+        self.assertEqual(self.b.cells()[3], -2)
+        self.assertEqual(len(self.b.points()[3]), 2)
+        self.assertEqual(self.b.points()[3][0].color(), 'N')
+        self.b.points()[3].pop()
+        self.assertEqual(self.b.point_owner_count(3), ('N', 1))
+        self.b.points()[3].clear()
+        self.assertFalse(self.b.points()[3])
+
+    def test_vista_no_mezcla_colores(self):
+        with self.assertRaises(ValueError):
+            self.b.points()[0].append(Checker('N'))
+        with self.assertRaises(ValueError):
+            self.b.bar()['B'].append(Checker('N'))
+
+    def test_bar_y_off_en_el_arreglo(self):
+        self.b.bar()['N'].append(Checker('N'))
+        self.assertTrue(self.b.has_checkers_on_bar('N'))
+        self.assertEqual(len(self.b.bar()['N']), 1)
+        self.b.off()['B'] = 15
+        self.b.off()['N'] += 2
+        self.assertEqual(self.b.cells()[26], 15)
+        self.assertEqual(self.b.cells()[27], -2)
+        self.assertEqual(dict(self.b.off().items()), {'B': 15, 'N': 2})
+
+class TestBoardSecuencias(unittest.TestCase):
+    def setUp(self):
+        self.b = Board()
+
+    def _vaciar(self):
+        for i in range(24):
+            self.b.points()[i].clear()
+
+    def test_apertura_31_sin_duplicados(self):
+        seqs = self.b.legal_sequences('B', [3, 1])
+        self.assertEqual(len(seqs), 16)
+        self.assertTrue(all(len(s) == 2 for s in seqs))
+        # Ninguna secuencia repite posicion final
+        finales = set()
+        for seq in seqs:
+            copia = self.b.copy()
+            for origen, dado in seq:
+                self.assertTrue(copia.move(origen, dado, 'B'))
+            finales.add(copia.cells().tobytes())
+        self.assertEqual(len(finales), len(seqs))
+        # El tablero original no se modifica
+        self.assertEqual(self.b.point_owner_count(0), ('B', 2))
+
+    def test_dobles_usan_cuatro_movimientos(self):
+        seqs = self.b.legal_sequences('N', [2, 2, 2, 2])
+        self.assertTrue(seqs)
+        self.assertTrue(all(len(s) == 4 for s in seqs))
+
+    def test_reingreso_desde_bar_primero(self):
+        self.b.bar()['B'].append(Checker('B'))
+        moves = self.b.get_valid_moves('B', [3, 5])
+        self.assertTrue(moves)
+        self.assertTrue(all(origen is None for origen, _ in moves))
+        for seq in self.b.legal_sequences('B', [3, 5]):
+            self.assertIsNone(seq[0][0])
+
+    def test_debe_usar_el_dado_mayor(self):
+        self._vaciar()
+        # Una blanca en idx 10; con 4 cae en 14 y con 6 en 16 (ambas libres),
+        # pero despues de cualquiera el otro dado queda bloqueado.
+        self.b.points()[10].append(Checker('B'))
+        for idx in (20, 18):
+            self.b.points()[idx].extend([Checker('N'), Checker('N')])
+        self.assertEqual(self.b.get_valid_moves('B', [4, 6]), [(10, 6)])
+        self.assertEqual(self.b.legal_sequences('B', [4, 6]), [((10, 6),)])
+
+    def test_turn_tree_coincide_con_secuencias(self):
+        arbol = self.b.turn_tree('B', [3, 1])
+        self.assertEqual(sorted(arbol), self.b.get_valid_moves('B', [3, 1]))
+
+        def hojas(nodo, camino):
+            if not nodo:
+                yield camino
+            for mov, sub in nodo.items():
+                yield from hojas(sub, camino + (mov,))
+
+        caminos = list(hojas(arbol, ()))
+        self.assertTrue(all(len(c) == 2 for c in caminos))
+        for seq in self.b.legal_sequences('B', [3, 1]):
+            self.assertIn(seq, caminos)
+
+    def test_sin_movimientos(self):
+        self.b.bar()['B'].append(Checker('B'))
+        for idx in range(6):
+            self.b.points()[idx].clear()
+            self.b.points()[idx].extend([Checker('N'), Checker('N')])
+        self.assertEqual(self.b.legal_sequences('B', [1, 2]), [])
+        self.assertEqual(self.b.get_valid_moves('B', [1, 2]), [])
+
+class TestBoardApplyUndo(unittest.TestCase):
+    def setUp(self):
+        self.b = Board()
+
+    def test_apply_undo_movimiento_normal(self):
+        antes = self.b.cells().tobytes()
+        token = self.b.apply((0, 3, 'B'))
+        self.assertIsNotNone(token)
+        self.assertEqual(self.b.point_owner_count(3), ('B', 1))
+        self.b.undo(token)
+        self.assertEqual(self.b.cells().tobytes(), antes)
+
+    def test_apply_ilegal_devuelve_none(self):
+        self.assertIsNone(self.b.apply((0, 5, 'B')))  # idx 5 tiene 5 negras
+        with self.assertRaises(ValueError):
+            self.b.undo()
+
+    def test_undo_restaura_golpe_y_bar(self):
+        self.b.points()[3].append(Checker('N'))
+        antes = self.b.cells().tobytes()
+        token = self.b.apply((0, 3, 'B'))
+        self.assertTrue(token[3])  # golpe registrado
+        self.assertTrue(self.b.has_checkers_on_bar('N'))
+        self.b.undo(token)
+        self.assertFalse(self.b.has_checkers_on_bar('N'))
+        self.assertEqual(self.b.cells().tobytes(), antes)
+
+    def test_undo_restaura_retirada(self):
+        for i in range(24):
+            self.b.points()[i].clear()
+        self.b.points()[23].append(Checker('B'))
+        t1 = self.b.apply((23, 1, 'B'))
+        self.assertTrue(t1[4])  # retirada registrada
+        self.assertEqual(self.b.off()['B'], 1)
+        self.b.undo()
+        self.assertEqual(self.b.off()['B'], 0)
+        self.assertEqual(self.b.point_owner_count(23), ('B', 1))
+
+    def test_undo_fuera_de_orden(self):
+        t1 = self.b.apply((0, 3, 'B'))
+        self.b.apply((0, 1, 'B'))
+        with self.assertRaises(ValueError):
+            self.b.undo(t1)
+
+    def test_apply_sin_registro(self):
+        token = self.b.apply((0, 3, 'B'), record=False)
+        self.assertIsNotNone(token)
+        self.assertEqual(self.b.point_owner_count(3), ('B', 1))
+        with self.assertRaises(ValueError):
+            self.b.undo()
+
+    def test_origins(self):
+        self.assertEqual(self.b.origins('B'), [0, 11, 16, 18])
+        cells = [0] * 28
+        cells[24] = 1
+        cells[5] = -2
+        self.assertEqual(Board.from_cells(cells).origins('B'), (None,))
+
+    def test_clear_undo(self):
+        self.b.apply((0, 3, 'B'))
+        self.b.clear_undo()
+        with self.assertRaises(ValueError):
+            self.b.undo()
+
+class TestBoardZobrist(unittest.TestCase):
+    def setUp(self):
+        self.b = Board()
+
+    def _hash_completo(self, board):
+        return Board.from_cells(board.cells()).zobrist_hash()
+
+    def test_hash_incremental_coincide_con_recalculo(self):
+        self.b.points()[3].append(Checker('N'))
+        self.assertTrue(self.b.move(0, 3, 'B'))      # golpe
+        self.assertTrue(self.b.move(None, 3, 'N'))   # reingreso
+        self.b.off()['B'] = 2
+        self.assertEqual(self.b.zobrist_hash(), self._hash_completo(self.b))
+
+    def test_undo_restaura_hash(self):
+        h = self.b.zobrist_hash()
+        self.b.apply((0, 3, 'B'))
+        self.assertNotEqual(self.b.zobrist_hash(), h)
+        self.b.undo()
+        self.assertEqual(self.b.zobrist_hash(), h)
+
+    def test_transposicion_mismo_hash(self):
+        otro = Board()
+        self.b.move(0, 3, 'B')
+        self.b.move(3, 1, 'B')
+        otro.move(0, 1, 'B')
+        otro.move(1, 3, 'B')
+        self.assertEqual(self.b.zobrist_hash(), otro.zobrist_hash())
+
+    def test_turno_cambia_hash(self):
+        self.assertNotEqual(self.b.zobrist_hash('B'), self.b.zobrist_hash('N'))
+
+class TestBoardPositionId(unittest.TestCase):
+    def test_position_id_inicial_estandar(self):
+        b = Board()
+        self.assertEqual(b.position_id('B'), "4HPwATDgc/ABMA")
+        self.assertEqual(len(b.encode_position('B')), 10)
+
+    def test_ida_y_vuelta_con_bar_y_retiradas(self):
+        b = Board()
+        b.points()[3].append(b.points()[5].pop())
+        b.points()[5].pop()
+        b.off()['N'] = 1
+        self.assertTrue(b.move(0, 3, 'B'))
+        for lado in ('B', 'N'):
+            copia = Board.decode_position(b.encode_position(lado), lado)
+            self.assertEqual(copia.cells().tolist(), b.cells().tolist())
+            self.assertEqual(copia.zobrist_hash(), b.zobrist_hash())
+        self.assertEqual(Board.from_position_id(b.position_id('N'), 'N').cells(), b.cells())
+
+    def test_mas_de_15_fichas_falla(self):
+        b = Board()
+        b.points()[2].append(Checker('B'))
+        with self.assertRaises(ValueError):
+            b.encode_position('B')
+
+    def test_id_invalido(self):
+        with self.assertRaises(ValueError):
+            Board.decode_position(b"\x00" * 9)
+        with self.assertRaises(ValueError):
+            Board.decode_position(b"\xff" * 10)
+        # 8 blancas en su punto 1 (celda 23) y 7 negras en su punto 24 (la misma)
+        with self.assertRaises(ValueError):
+            Board.decode_position((0xFF | 0x7F << 56).to_bytes(10, "little"))
+
+    def test_coincide_con_las_corridas_de_bits(self):
+        rng = random.Random(4)
+        for _ in range(200):
+            b = tablero_aleatorio(rng)
+            for lado in ('B', 'N'):
+                cells = b.cells()
+                bits = ""
+                for color in (lado, 'N' if lado == 'B' else 'B'):
+                    sign = 1 if color == 'B' else -1
+                    order = list(range(23, -1, -1)) + [24] if color == 'B' else list(range(24)) + [25]
+                    bits += "".join("1" * max(cells[i] * sign, 0) + "0" for i in order)
+                pid = b.encode_position(lado)
+                self.assertEqual(pid, int(bits[::-1], 2).to_bytes(10, "little"))
+                self.assertEqual(Board.decode_position(pid, lado).cells()[:26], cells[:26])
+
 if __name__ == "__main__":
     unittest.main()
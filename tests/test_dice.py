@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch
-from core.Dice import Dice
+from core.Dice import Dice, StratifiedDice, ROLLS
 
 
 class TestDice(unittest.TestCase):
@@ -43,5 +43,63 @@ class TestDiceExtra(unittest.TestCase):
         v2.append(99)
         self.assertEqual(d.last(), [4, 4, 4, 4])
 
+    def test_rng_propio_reproducible(self):
+        import random
+        a = Dice(random.Random(11))
+        b = Dice(random.Random(11))
+        self.assertEqual([a.roll() for _ in range(20)], [b.roll() for _ in range(20)])
+
+    def test_stratified_balancea_la_segunda_tirada_en_cada_bloque(self):
+        from collections import Counter
+        for n in (36, 72, 360):
+            primeras, segundas = Counter(), Counter()
+            for trial in range(n):
+                d = StratifiedDice(trial)
+                primeras[tuple(d.roll())] += 1
+                segundas[tuple(d.roll())] += 1
+            self.assertEqual(set(primeras.values()), {n // 36})
+            self.assertEqual(set(segundas.values()), {n // 36})
+            self.assertEqual(len(segundas), 36)
+
+    def test_stratified_cubre_todas_las_combinaciones(self):
+        pares = set()
+        for trial in range(36 * 36):
+            d = StratifiedDice(trial)
+            primera, segunda = d.roll(), d.roll()
+            pares.add((tuple(primera), tuple(segunda)))
+        self.assertEqual(len(pares), 36 * 36)
+        d = StratifiedDice(8)
+        self.assertEqual(d.roll(), list(ROLLS[8]))
+        self.assertEqual(d.roll(), list(ROLLS[8]))
+        d = StratifiedDice(8)
+        self.assertEqual(d.roll(), list(ROLLS[8]))
+        self.assertEqual(d.last(), list(ROLLS[8]))
+        d.roll()
+        with patch("core.Dice.random.randint", return_value=2):
+            self.assertEqual(d.roll(), [2, 2, 2, 2])  # tercera: aleatoria
+
+    def test_semilla_numpy_reproducible(self):
+        import numpy as np
+        a = Dice(seed=42, block_size=3)
+        b = Dice(rng=np.random.default_rng(42), block_size=3)
+        tiradas = [a.roll() for _ in range(10)]  # cruza varios bloques
+        self.assertEqual(tiradas, [b.roll() for _ in range(10)])
+        for t in tiradas:
+            self.assertIn(len(t), (2, 4))
+            self.assertTrue(all(1 <= v <= 6 for v in t))
+        self.assertNotEqual(tiradas, [Dice(seed=43, block_size=3).roll() for _ in range(10)])
+
+    def test_script_de_tiradas(self):
+        d = Dice(script=[(3, 1), [5, 5, 5, 5], (6, 2)])
+        self.assertEqual([d.roll(), d.roll(), d.roll()], [[3, 1], [5, 5, 5, 5], [6, 2]])
+        with self.assertRaises(IndexError):
+            d.roll()
+        with self.assertRaises(ValueError):
+            Dice(script=[(7, 1)])
+        # Con semilla, al terminar el script sigue con el generador
+        d = Dice(seed=1, script=[(2, 4)])
+        self.assertEqual(d.roll(), [2, 4])
+        d.roll()
+
 if __name__ == "__main__":
     unittest.main()
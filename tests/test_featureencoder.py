@@ -0,0 +1,86 @@
+import random
+import tracemalloc
+import unittest
+import numpy as np
+from core.Board import Board
+from core.FeatureEncoder import (
+    FeatureEncoder,
+    NUM_FEATURES,
+    TD_FEATURES,
+    PIPS,
+    BLOTS,
+    PRIMES,
+    ESCAPES,
+)
+from core.NeuralEvaluator import encode_board
+from core.SearchEngine import pip_count
+from tests.helpers import tablero_aleatorio
+
+
+class TestFeatureEncoder(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.boards = [Board()] + [tablero_aleatorio(rng) for _ in range(200)]
+        self.turns = ['B'] + [rng.choice('BN') for _ in range(200)]
+        self.encoder = FeatureEncoder(capacity=256)
+        self.out = self.encoder.allocate()
+
+    def test_igual_a_encode_board_y_pips(self):
+        x = self.encoder.encode(self.boards, self.turns, self.out)
+        self.assertEqual(x.shape, (len(self.boards), NUM_FEATURES))
+        for i, board in enumerate(self.boards):
+            np.testing.assert_array_equal(x[i, :TD_FEATURES], encode_board(board, self.turns[i]))
+            self.assertAlmostEqual(x[i, PIPS] * 167, pip_count(board, 'B'))
+            self.assertAlmostEqual(x[i, PIPS + 1] * 167, pip_count(board, 'N'))
+
+    def test_desde_arreglo_plano_y_sin_reservar(self):
+        cells = np.stack([np.frombuffer(b.cells(), dtype=np.int8) for b in self.boards])
+        desde_boards = self.encoder.encode(self.boards, self.turns, self.out).copy()
+        x = self.encoder.encode(cells.astype(np.int64), self.turns, self.out)
+        self.assertTrue(np.shares_memory(x, self.out))
+        np.testing.assert_array_equal(x, desde_boards)
+        with self.assertRaises(ValueError):
+            self.encoder.encode(np.zeros((300, 28)), 'B', self.out)
+        with self.assertRaises(ValueError):
+            self.encoder.encode(np.zeros((3, 27)), 'B', self.out)
+
+    def test_sueltas_bloqueos_y_escapes(self):
+        cells = [0] * 28
+        cells[0], cells[5] = 1, 1                        # dos blancas sueltas
+        for idx in (8, 9, 10, 11):                       # bloqueo negro de 4
+            cells[idx] = -2
+        cells[27] = -7
+        cells[26] = 13
+        x = self.encoder.encode([Board.from_cells(cells)], 'B', self.out)[0]
+        self.assertAlmostEqual(x[BLOTS], 2 / 15)
+        self.assertEqual(x[BLOTS + 1], 0)
+        self.assertAlmostEqual(x[PRIMES + 1], 4 / 6)
+        self.assertEqual(x[PRIMES], 0)
+        # La blanca en 0 escapa si cae mas alla de 11: 12 solo con 6-6 (6+6)
+        self.assertAlmostEqual(x[ESCAPES], 1 / 36)
+        # Negras sin puntos blancos hechos por delante: escape libre
+        self.assertEqual(x[ESCAPES + 1], 1.0)
+
+    def test_encode_no_reserva_por_lote(self):
+        cells = np.stack([np.frombuffer(b.cells(), dtype=np.int8) for b in self.boards])
+        peaks = []
+        for n in (512, 4096):
+            encoder = FeatureEncoder(capacity=n)
+            out = encoder.allocate()
+            lote = np.resize(cells, (n, 28))
+            encoder.encode(lote, 'B', out)
+            tracemalloc.start()
+            x = encoder.encode(lote, 'B', out)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.assertTrue(np.shares_memory(x, out))
+            self.assertLess(current, 4096)
+            peaks.append(peak)
+        # Un solo arreglo (N, 24) int16 del lote grande ya ocuparia 196608 bytes;
+        # lo que queda son los buffers de conversion de NumPy, que no crecen con N
+        self.assertLess(peaks[1], 4096 * 24 * 2)
+        self.assertLessEqual(peaks[1], peaks[0] + 4096)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from unittest.mock import patch
+from core.BackgammonGame import BackgammonGame
+from core.Board import Board
+from core.NeuralEvaluator import NeuralEvaluator, TDTrainer, encode_board, NUM_FEATURES
+from core.SearchEngine import SearchEngine
+
+
+class TestNeuralEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.net = NeuralEvaluator(hidden=8, seed=1)
+
+    def test_codificacion_inicial(self):
+        x = encode_board(Board(), 'B')
+        self.assertEqual(x.shape, (NUM_FEATURES,))
+        # Blancas en idx 0 (2 fichas): unidades >=1 y >=2
+        self.assertEqual(list(x[0:4]), [1.0, 1.0, 0.0, 0.0])
+        # Negras en idx 5 (5 fichas): >=1, >=2, >=3 y (5 - 3) / 2
+        self.assertEqual(list(x[96 + 20:96 + 24]), [1.0, 1.0, 1.0, 1.0])
+        self.assertEqual(list(x[192:198]), [0, 0, 0, 0, 1, 0])
+        buffer = np.full(NUM_FEATURES, 7.0)
+        self.assertIs(encode_board(Board(), 'N', buffer), buffer)
+        self.assertEqual(list(buffer[196:198]), [0, 1])
+
+    def test_lote_igual_a_individual(self):
+        boards = [Board()]
+        b = Board()
+        b.move(0, 3, 'B')
+        boards.append(b)
+        batch = np.stack([encode_board(board, 'N') for board in boards])
+        p = self.net.predict_batch(batch)
+        self.assertEqual(p.shape, (2,))
+        for board, value in zip(boards, p):
+            self.assertAlmostEqual(self.net.predict(board, 'N'), value)
+        v = self.net.evaluate(Board(), 'B')
+        self.assertAlmostEqual(v, 2 * self.net.predict(Board(), 'B') - 1)
+        self.assertTrue(-1 < self.net(Board(), 'N') < 1)
+
+    def test_gradiente_numerico(self):
+        x = encode_board(Board(), 'B')
+        y, grad = self.net.value_and_gradient(x)
+        eps = 1e-6
+        for key, index in (("W1", (0, 3)), ("b1", (2,)), ("W2", (5,)), ("b2", ())):
+            weights = getattr(self.net, key)
+            original = weights[index]
+            weights[index] = original + eps
+            up = self.net.predict_batch(x[None, :])[0]
+            weights[index] = original
+            self.assertAlmostEqual((up - y) / eps, grad[key][index], places=4)
+
+    def test_choose_y_search_engine(self):
+        g = BackgammonGame(verbose=False)
+        with patch("core.Dice.random.randint", side_effect=[6, 4]):
+            g.roll()
+        seq = self.net.choose(g.board(), 'B', g.available_dice())
+        self.assertIn(seq, g.board().legal_sequences('B', [6, 4]))
+        seq, value = SearchEngine(evaluate=self.net).best_move(Board(), 'B', [3, 1], max_depth=1)
+        self.assertEqual(len(seq), 2)
+
+    def test_entrenamiento_y_npz(self):
+        trainer = TDTrainer(self.net, alpha=0.1, lam=0.7, seed=3)
+        before = self.net.W1.copy()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pesos.npz")
+            wins = trainer.train(2, path)
+            self.assertEqual(sum(wins.values()), 2)
+            self.assertEqual(trainer.games_played(), 2)
+            self.assertFalse(np.array_equal(before, self.net.W1))
+            loaded = NeuralEvaluator.load(path)
+        self.assertAlmostEqual(loaded.predict(Board(), 'B'), self.net.predict(Board(), 'B'))
+        with self.assertRaises(ValueError):
+            NeuralEvaluator(weights={"W1": np.zeros((3, 2)), "b1": np.zeros(2),
+                                     "W2": np.zeros(2), "b2": 0.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+from core.Board import Board
+from core.OpeningBook import (
+    BookPolicy,
+    OpeningBook,
+    build_opening_book,
+    write_book,
+    book_key,
+    _pack_sequence,
+    _unpack_sequence,
+)
+
+ROLLS = [(3, 1), (6, 5), (2, 2, 2, 2)]
+
+
+class TestOpeningBook(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "aperturas.book")
+        cls.count = build_opening_book(cls.path, trials=4, candidates=2, processes=1, rolls=ROLLS)
+        cls.book = OpeningBook(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_cantidad_de_entradas(self):
+        # Una jugada de apertura por tirada y una respuesta por cada par
+        self.assertEqual(self.count, len(ROLLS) + len(ROLLS) ** 2)
+        self.assertEqual(len(self.book), self.count)
+
+    def test_aperturas_legales(self):
+        board = Board()
+        for dice in ROLLS:
+            seq = self.book.lookup(board, 'B', list(dice))
+            self.assertIn(seq, board.legal_sequences('B', list(dice)))
+
+    def test_orden_de_los_dados_no_importa(self):
+        board = Board()
+        self.assertEqual(self.book.lookup(board, 'B', [1, 3]), self.book.lookup(board, 'B', [3, 1]))
+
+    def test_respuestas_legales(self):
+        board = Board()
+        for dice in ROLLS:
+            for origin, die in self.book.lookup(board, 'B', list(dice)):
+                board.apply((origin, die, 'B'))
+            for reply in ROLLS:
+                seq = self.book.lookup(board, 'N', list(reply))
+                self.assertIn(seq, board.legal_sequences('N', list(reply)))
+            board = Board()
+
+    def test_posicion_fuera_del_libro(self):
+        board = Board()
+        self.assertIsNone(self.book.lookup(board, 'B', [5, 4]))
+        self.assertIsNone(self.book.lookup(board, 'N', [3, 1]))
+
+    def test_book_policy_delega(self):
+        llamadas = []
+
+        def fallback(board, color, dice, rng):
+            llamadas.append(tuple(dice))
+            return ()
+
+        policy = BookPolicy(self.book, fallback)
+        rng = random.Random(0)
+        self.assertEqual(policy(Board(), 'B', [3, 1], rng), self.book.lookup(Board(), 'B', [3, 1]))
+        self.assertEqual(llamadas, [])
+        self.assertEqual(policy(Board(), 'B', [5, 4], rng), ())
+        self.assertEqual(llamadas, [(5, 4)])
+
+    def test_secuencia_con_barra(self):
+        seq = ((None, 3), (2, 5))
+        self.assertEqual(_unpack_sequence(_pack_sequence(seq)), seq)
+
+    def test_colisiones_de_cubeta(self):
+        # Claves con la misma cubeta se resuelven por sondeo lineal
+        path = os.path.join(self.tmp.name, "colisiones.book")
+        board = Board()
+        key = book_key(board, 'B', [4, 2])
+        entries = {key ^ (k << 40): (0.1 * k, ((0, 4), (0, 2))) for k in range(1, 4)}
+        entries[key] = (0.5, ((11, 4), (16, 2)))
+        write_book(path, entries)
+        book = OpeningBook(path)
+        equity, seq = book.probe(board, 'B', [4, 2])
+        self.assertAlmostEqual(equity, 0.5, places=6)
+        self.assertEqual(seq, ((11, 4), (16, 2)))
+
+    def test_un_solo_pool_para_todos_los_rollouts(self):
+        path = os.path.join(self.tmp.name, "pool.book")
+        # Sin pool compartido serian hasta 12: uno por jugada candidata
+        with patch("multiprocessing.Pool", wraps=multiprocessing.Pool) as pool:
+            count = build_opening_book(path, trials=4, candidates=2, processes=2, rolls=ROLLS[:2])
+        self.assertEqual(pool.call_count, 1)
+        self.assertEqual(count, 2 + 2 ** 2)
+        serial = os.path.join(self.tmp.name, "serial.book")
+        build_opening_book(serial, trials=4, candidates=2, processes=1, rolls=ROLLS[:2])
+        with open(path, "rb") as a, open(serial, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_archivo_invalido(self):
+        path = os.path.join(self.tmp.name, "roto.book")
+        with open(path, "wb") as f:
+            f.write(b"XXXX" + bytes(20))
+        with self.assertRaises(ValueError):
+            OpeningBook(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from core.Board import Board
+from core.NeuralEvaluator import NeuralEvaluator, encode_board
+from core.QuantizedEvaluator import QuantizedEvaluator, accuracy_report, held_out_positions
+
+
+class TestQuantizedEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.net = NeuralEvaluator(hidden=16, seed=2)
+        cells, turns = held_out_positions(200, seed=4)
+        self.x = np.stack([encode_board(Board.from_cells(c.tolist()), t)
+                           for c, t in zip(cells, turns)])
+
+    def test_tipos_y_error_por_precision(self):
+        reference = self.net.predict_batch(self.x)
+        q8 = QuantizedEvaluator.from_float(self.net, 8)
+        q16 = QuantizedEvaluator.from_float(self.net, 16)
+        self.assertEqual(q8.W1.dtype, np.int8)
+        self.assertEqual(q16.W2.dtype, np.int16)
+        err8 = np.abs(q8.predict_batch(self.x) - reference).max()
+        err16 = np.abs(q16.predict_batch(self.x) - reference).max()
+        self.assertLess(err8, 0.02)
+        self.assertLess(err16, err8)
+        self.assertAlmostEqual(q8.predict(Board(), 'B'), self.net.predict(Board(), 'B'), places=2)
+        with self.assertRaises(ValueError):
+            QuantizedEvaluator.from_float(self.net, 4)
+
+    def test_acumulacion_entera_exacta(self):
+        q8 = QuantizedEvaluator.from_float(self.net, 8)
+        xq = np.clip(np.rint(self.x / q8.scales["x"]), 0, 127).astype(np.int64)
+        exacto = xq @ q8.W1.astype(np.int64)
+        blas = xq.astype(np.float32) @ q8.W1.astype(np.float32)
+        np.testing.assert_array_equal(exacto, blas.astype(np.int64))
+
+    def test_entradas_binarias_exactas(self):
+        valores = np.array([0.0, 0.5, 1.0, 1.5, 6.0])
+        for bits in (8, 16):
+            s = QuantizedEvaluator.from_float(self.net, bits).scales["x"]
+            np.testing.assert_array_equal(np.rint(valores / s) * s, valores)
+
+    def test_exportar_y_cargar(self):
+        q = QuantizedEvaluator.from_float(self.net, 8)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "q8.npz")
+            q.save(path)
+            loaded = QuantizedEvaluator.load(path)
+        self.assertEqual(loaded.bits, 8)
+        np.testing.assert_array_equal(loaded.predict_batch(self.x), q.predict_batch(self.x))
+
+    def test_reporte(self):
+        report = accuracy_report(self.net, positions=100, repeat=1)
+        self.assertEqual(report["positions"], 100)
+        for key in ("int8", "int16"):
+            self.assertIn("rmse", report[key])
+            self.assertGreater(report[key]["positions_per_sec"], 0)
+            self.assertGreaterEqual(report[key]["favorite_agreement"], 0.9)
+        self.assertLess(report["int16"]["max_abs_error"], report["int8"]["max_abs_error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
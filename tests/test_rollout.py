@@ -0,0 +1,88 @@
+import random
+import unittest
+from core.Board import Board
+from core.Policies import random_policy, greedy_policy
+from core.Dice import ROLLS
+from core.Rollout import rollout, play_out, game_result, summarize, pip_luck, OUTCOMES
+from tests.helpers import carrera_final
+
+
+class TestRollout(unittest.TestCase):
+    def test_game_result_gammon_y_backgammon(self):
+        cells = [0] * 28
+        cells[26] = 15
+        cells[10] = -15
+        self.assertEqual(game_result(Board.from_cells(cells)), ('B', 2))
+        cells[10], cells[20] = -14, -1   # negra en la casa blanca
+        self.assertEqual(game_result(Board.from_cells(cells)), ('B', 3))
+        cells[20], cells[27] = 0, -1
+        self.assertEqual(game_result(Board.from_cells(cells)), ('B', 1))
+        self.assertIsNone(game_result(Board()))
+
+    def test_play_out_termina(self):
+        rng = random.Random(1)
+        for policy in (random_policy, greedy_policy):
+            board = Board()
+            points = play_out(board, 'B', policy, rng)
+            self.assertIn(points, OUTCOMES)
+            self.assertIsNotNone(game_result(board))
+
+    def test_summarize(self):
+        report = summarize([1, 0, 0, 1, 0, 0])
+        self.assertEqual(report["win"], 0.5)
+        self.assertEqual(report["equity"], 0.0)
+        self.assertAlmostEqual(report["std_error"], 1.0)
+
+    def test_reproducible_con_o_sin_pool(self):
+        b = carrera_final()
+        serial = rollout(b, 'B', trials=100, processes=1, seed=5, batch_size=30)
+        pool = rollout(b, 'B', trials=100, processes=2, seed=5, batch_size=30)
+        self.assertEqual(serial["trials"], 100)
+        for key in ("win", "win_gammon", "equity", "std_error"):
+            self.assertEqual(serial[key], pool[key])
+        self.assertEqual(b.cells(), carrera_final().cells())
+
+    def test_corte_por_confianza(self):
+        report = rollout(carrera_final(), 'B', trials=2000, processes=1,
+                         batch_size=50, tolerance=0.2)
+        self.assertTrue(report["stopped_early"])
+        self.assertLess(report["trials"], 2000)
+        self.assertLessEqual(report["half_width"], 0.2)
+
+    def test_reduccion_por_estratos(self):
+        # Estrato 0: +1 +1 +1 -1; estrato 1: -1 -1 -1 +1
+        strata = [[4, 2, 4], [4, -2, 4]] + [[0, 0, 0]] * 34
+        report = summarize([4, 0, 0, 4, 0, 0], strata=strata)
+        # Varianza total 8/7, dentro de los estratos 6/6
+        self.assertAlmostEqual(report["stratification_reduction"], 8 / 7)
+        self.assertEqual(summarize([4, 0, 0, 4, 0, 0])["stratification_reduction"], 1.0)
+
+    def test_corte_estratificado_en_bloques_balanceados(self):
+        report = rollout(carrera_final(), 'B', trials=2000, processes=1,
+                         batch_size=24, tolerance=0.3, stratified=True)
+        self.assertTrue(report["stopped_early"])
+        self.assertEqual(report["trials"] % 36, 0)
+
+    def test_pip_luck_media_cero(self):
+        for board, color in ((Board(), 'B'), (carrera_final(), 'N')):
+            total = sum(pip_luck(board, color, roll) for roll in ROLLS)
+            self.assertAlmostEqual(total, 0.0)
+        self.assertGreater(pip_luck(Board(), 'B', (6, 6)), pip_luck(Board(), 'B', (2, 1)))
+
+    def test_reduccion_de_varianza(self):
+        b = carrera_final()
+        plain = rollout(b, 'B', trials=360, processes=1, seed=2)
+        reduced = rollout(b, 'B', trials=360, processes=1, seed=2,
+                          stratified=True, luck=pip_luck)
+        self.assertEqual(plain["control_variate_reduction"], 1.0)
+        self.assertEqual(plain["stratification_reduction"], 1.0)
+        self.assertGreater(reduced["stratification_reduction"], 0.0)
+        self.assertGreater(reduced["control_variate_reduction"], 1.0)
+        self.assertLess(reduced["std_error"], reduced["raw_std_error"])
+        again = rollout(b, 'B', trials=360, processes=2, seed=2,
+                        stratified=True, luck=pip_luck)
+        self.assertAlmostEqual(again["equity"], reduced["equity"])
+
+
+if __name__ == "__main__":
+    unittest.main()
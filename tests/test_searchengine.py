@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+from core.Board import Board
+from core.BackgammonGame import BackgammonGame
+from core.SearchEngine import (
+    SearchEngine,
+    DICE_OUTCOMES,
+    heuristic_eval,
+    pip_count,
+)
+from tests.helpers import carrera_final
+
+
+def expectimax(board, color, depth):
+    """Expectiminimax sin poda, para comparar."""
+    winner = SearchEngine._winner_value(board, color)
+    if winner is not None:
+        return winner
+    if depth <= 0:
+        return heuristic_eval(board, color)
+    opponent = 'N' if color == 'B' else 'B'
+    total = 0.0
+    for dice, prob in DICE_OUTCOMES:
+        seqs = board.legal_sequences(color, list(dice))
+        if not seqs:
+            total += prob * -expectimax(board, opponent, depth - 1)
+            continue
+        best = -2.0
+        for seq in seqs:
+            child = board.copy()
+            for origen, dado in seq:
+                child.move(origen, dado, color)
+            best = max(best, -expectimax(child, opponent, depth - 1))
+        total += prob * best
+    return total
+
+
+class TestSearchEngine(unittest.TestCase):
+    def test_tiradas_y_probabilidades(self):
+        self.assertEqual(len(DICE_OUTCOMES), 21)
+        self.assertAlmostEqual(sum(p for _, p in DICE_OUTCOMES), 1.0)
+
+    def test_pip_count_inicial(self):
+        b = Board()
+        self.assertEqual(pip_count(b, 'B'), 167)
+        self.assertEqual(pip_count(b, 'N'), 167)
+
+    def test_poda_no_cambia_el_valor(self):
+        b = carrera_final()
+        engine = SearchEngine()
+        self.assertAlmostEqual(engine.evaluate(b, 'B', 2), expectimax(b, 'B', 2))
+        # El tablero original no se toca
+        self.assertEqual(b.cells(), carrera_final().cells())
+
+    def test_best_move_y_estadisticas(self):
+        engine = SearchEngine()
+        seq, value = engine.best_move(Board(), 'B', [6, 3], max_depth=1)
+        self.assertEqual(len(seq), 2)
+        self.assertTrue(-1 <= value <= 1)
+        stats = engine.stats()
+        self.assertEqual(stats["depth"], 1)
+        self.assertGreater(stats["nodes"], 0)
+        self.assertGreaterEqual(stats["nodes_per_sec"], 0)
+
+    def test_presupuesto_de_nodos(self):
+        engine = SearchEngine(max_nodes=50)
+        seq, _ = engine.best_move(Board(), 'B', [6, 3], max_depth=3)
+        self.assertIn(seq, Board().legal_sequences('B', [6, 3]))
+        self.assertLessEqual(engine.stats()["nodes"], 51)
+        self.assertLess(engine.stats()["depth"], 3)
+        self.assertIsNone(SearchEngine(max_nodes=5).evaluate(Board(), 'B', 2))
+
+    def test_sin_movimientos(self):
+        cells = [0] * 28
+        cells[24], cells[23], cells[26] = 1, 2, 12   # blanca en la barra
+        for idx in range(6):
+            cells[idx] = -2                          # entradas bloqueadas
+        cells[27] = -3
+        seq, value = SearchEngine().best_move(Board.from_cells(cells), 'B', [6, 5])
+        self.assertEqual(seq, ())
+        self.assertIsNone(value)
+
+    def test_best_move_for_game(self):
+        g = BackgammonGame()
+        with patch("core.Dice.random.randint", side_effect=[3, 1]):
+            g.roll()
+        seq, _ = SearchEngine().best_move_for(g, max_depth=1)
+        for origen, dado in seq:
+            self.assertTrue(g.move(origen, dado))
+
+
+if __name__ == "__main__":
+    unittest.main()
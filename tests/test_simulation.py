@@ -0,0 +1,70 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from core.BackgammonGame import BackgammonGame
+from core.Dice import Dice
+from core.Simulation import simulate, play_game, game_seed, main, PHASES
+from core.Policies import random_policy, greedy_policy, SearchPolicy
+
+
+class TestSimulation(unittest.TestCase):
+    def test_play_game_sin_salida(self):
+        import random
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            winner, moves, turns = play_game(greedy_policy, random_policy, random.Random(0))
+        self.assertEqual(salida.getvalue(), "")
+        self.assertIn(winner, ("B", "N"))
+        self.assertGreater(moves, 0)
+        self.assertGreaterEqual(turns, moves / 4)
+
+    def test_politica_ilegal_falla(self):
+        import random
+
+        def tramposa(board, color, dice, rng):
+            return ((None, dice[0]),)  # Sale de la barra vacia
+
+        with self.assertRaisesRegex(ValueError, "tramposa"):
+            play_game(tramposa, random_policy, random.Random(0), dice=Dice(seed=1))
+
+    def test_reporte(self):
+        report = simulate(3, "greedy", "random", seed=1)
+        self.assertEqual(report["games"], 3)
+        self.assertEqual(sum(report["wins"].values()), 3)
+        self.assertEqual(set(report["phases"]), set(PHASES))
+        self.assertGreater(report["games_per_sec"], 0)
+        self.assertGreater(report["moves_per_sec"], 0)
+        json.dumps(report)
+        with self.assertRaises(ValueError):
+            simulate(1, "nadie")
+
+    def test_partida_reproducible_desde_su_semilla(self):
+        import random
+        s = game_seed(9, 2)
+        a = play_game(greedy_policy, random_policy, random.Random(s), dice=Dice(seed=s))
+        b = play_game(greedy_policy, random_policy, random.Random(s), dice=Dice(seed=s))
+        self.assertEqual(a, b)
+        self.assertEqual(simulate(3, "greedy", "random", seed=9)["wins"],
+                         simulate(3, "greedy", "random", seed=9)["wins"])
+
+    def test_search_policy_juega_secuencias_legales(self):
+        g = BackgammonGame(verbose=False)
+        with patch("core.Dice.random.randint", side_effect=[6, 4]):
+            g.roll()
+        seq = SearchPolicy()(g.board(), 'B', g.available_dice(), None)
+        for origen, dado in seq:
+            self.assertTrue(g.move(origen, dado))
+
+    def test_main_escribe_json(self):
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            main(["--games", "2", "--white", "random", "--black", "greedy"])
+        data = json.loads(salida.getvalue())
+        self.assertEqual(data["games"], 2)
+        self.assertEqual(data["black"], "greedy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from pygame_ui.TextCache import TextCache
+
+
+class TestTextCache(unittest.TestCase):
+    def test_fuentes_registradas_una_vez(self):
+        cache = TextCache(tamanos=(24, 36))
+        self.assertIs(cache.font(24), cache.font(24))
+        self.assertEqual(cache.stats()["fonts"], 2)
+        cache.font(40)
+        self.assertEqual(cache.stats()["fonts"], 3)
+
+    def test_hits_y_misses(self):
+        cache = TextCache()
+        primera = cache.render("Hola", 24, (0, 0, 0))
+        segunda = cache.render("Hola", 24, (0, 0, 0))
+        self.assertIs(primera, segunda)
+        self.assertEqual((cache.hits(), cache.misses()), (1, 1))
+        # Otro tamaño u otro color es otra entrada
+        cache.render("Hola", 36, (0, 0, 0))
+        cache.render("Hola", 24, [255, 0, 0])
+        self.assertEqual((cache.hits(), cache.misses()), (1, 3))
+        self.assertEqual(cache.stats()["entries"], 3)
+
+    def test_desalojo_lru(self):
+        cache = TextCache(max_entradas=2)
+        cache.render("a", 24, (0, 0, 0))
+        cache.render("b", 24, (0, 0, 0))
+        cache.render("a", 24, (0, 0, 0))  # "a" pasa a ser la mas reciente
+        cache.render("c", 24, (0, 0, 0))  # desaloja "b"
+        self.assertEqual(cache.stats()["entries"], 2)
+        misses = cache.misses()
+        cache.render("a", 24, (0, 0, 0))
+        self.assertEqual(cache.misses(), misses)
+        cache.render("b", 24, (0, 0, 0))
+        self.assertEqual(cache.misses(), misses + 1)
+
+    def test_clear(self):
+        cache = TextCache()
+        cache.render("x", 24, (0, 0, 0))
+        cache.clear()
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.misses(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from core.Board import Board
+from core.SearchEngine import SearchEngine
+from core.TranspositionTable import (
+    TranspositionTable,
+    make_key,
+    EXACT,
+    LOWER,
+    UPPER,
+)
+from tests.helpers import carrera_final
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.tt = TranspositionTable(max_bytes=36 * 4)  # 4 cubetas, 8 entradas
+
+    def test_tope_de_memoria(self):
+        self.assertEqual(self.tt.capacity(), 8)
+        self.assertLessEqual(self.tt.memory_bytes(), 36 * 4)
+        grande = TranspositionTable(max_bytes=1 << 20)
+        self.assertLessEqual(grande.memory_bytes(), 1 << 20)
+        with self.assertRaises(ValueError):
+            TranspositionTable(max_bytes=10)
+
+    def test_store_probe_y_contadores(self):
+        self.assertIsNone(self.tt.probe(123))
+        self.tt.store(123, 0.5, 2, EXACT)
+        self.assertEqual(self.tt.probe(123), (0.5, 2, EXACT))
+        self.assertEqual(self.tt.stats(), {"hits": 1, "misses": 1, "stores": 1, "overwrites": 0})
+
+    def test_politica_dos_niveles(self):
+        # Tres claves que caen en la misma cubeta (mascara de 2 bits)
+        a, b, c = 1, 1 + 4, 1 + 8
+        self.tt.store(a, 0.1, 3, EXACT)
+        self.tt.store(b, 0.2, 1, LOWER)    # menos profunda -> reemplazo siempre
+        self.assertIsNotNone(self.tt.probe(a))
+        self.assertIsNotNone(self.tt.probe(b))
+        self.tt.store(c, 0.3, 2, UPPER)    # pisa a b, no a a
+        self.assertIsNotNone(self.tt.probe(a))
+        self.assertIsNone(self.tt.probe(b))
+        self.assertEqual(self.tt.probe(c), (0.3, 2, UPPER))
+        self.tt.store(b, 0.2, 5, EXACT)    # mas profunda -> reemplaza a a
+        self.assertIsNone(self.tt.probe(a))
+        self.assertEqual(self.tt.stats()["overwrites"], 2)
+
+    def test_clave_con_dados(self):
+        h = Board().zobrist_hash('B')
+        self.assertEqual(make_key(h), h)
+        self.assertEqual(make_key(h, (3, 1)), make_key(h, [1, 3]))
+        self.assertNotEqual(make_key(h, (3, 1)), make_key(h, (3, 2)))
+        self.assertNotEqual(make_key(h, (3, 3, 3, 3)), make_key(h, (3, 3, 3)))
+
+    def test_busqueda_con_tabla_da_el_mismo_valor(self):
+        b = carrera_final()
+        tt = TranspositionTable(max_bytes=1 << 16)
+        sin_tabla = SearchEngine().evaluate(b, 'B', 2)
+        con_tabla = SearchEngine(table=tt).evaluate(b, 'B', 2)
+        self.assertAlmostEqual(con_tabla, sin_tabla)
+        self.assertGreater(tt.stats()["stores"], 0)
+        # Segunda busqueda: la raiz sale directo de la tabla
+        hits = tt.stats()["hits"]
+        self.assertAlmostEqual(SearchEngine(table=tt).evaluate(b, 'B', 2), sin_tabla)
+        self.assertGreater(tt.stats()["hits"], hits)
+
+
+if __name__ == "__main__":
+    unittest.main()